@@ -0,0 +1,253 @@
+import argparse
+import gc
+import io
+import shutil
+import subprocess
+import sys
+import time
+import tracemalloc
+from dataclasses import dataclass
+from typing import Callable
+
+import numpy as np
+import soundfile as sf
+
+from benchmarks import baseline
+from bragi.audio.chunking import SentenceSegmenter, chunk_text
+from bragi.audio.decoding import SUPPORTED_FORMATS, TARGET_SAMPLE_RATE, _resample, decode_audio
+from bragi.audio.encoding import CONTENT_TYPES, StreamEncoder, encode_audio
+
+METRICS = {
+    "throughput": True,
+    "peak_bytes": False,
+}
+
+SOURCE_RATES = (8000, 22050, 24000, 44100, 48000)
+ENCODE_RATE = 24000
+
+_FFMPEG_ARGS = {
+    "mp4": ["-c:a", "aac", "-f", "mp4"],
+    "webm": ["-c:a", "libopus", "-f", "webm"],
+    "aac": ["-c:a", "aac", "-f", "adts"],
+}
+
+
+@dataclass
+class Case:
+    name: str
+    fn: Callable[[], object]
+    units: float
+    unit: str
+
+
+def _signal(seconds: float, sample_rate: int) -> np.ndarray:
+    rng = np.random.default_rng(0)
+    t = np.arange(int(seconds * sample_rate), dtype=np.float32) / sample_rate
+    audio = 0.3 * np.sin(2 * np.pi * 440.0 * t) + 0.01 * rng.standard_normal(len(t)).astype(np.float32)
+    return audio.astype(np.float32)
+
+
+def _text(chars: int) -> str:
+    sentences = [
+        "The quick brown fox jumps over the lazy dog.",
+        "Is this the real life, or is it just fantasy?",
+        "Caught in a landslide, no escape from reality!",
+        "A long sentence without much punctuation keeps going and going so that the splitter has to fall back to words",
+    ]
+    text = " ".join(sentences[i % len(sentences)] for i in range(chars // 40 + 1))
+    return text[:chars]
+
+
+def _source_file(fmt: str, audio: np.ndarray) -> bytes | None:
+    if fmt in ("wav", "flac", "ogg"):
+        buf = io.BytesIO()
+        sf.write(buf, audio, TARGET_SAMPLE_RATE, format=fmt.upper())
+        return buf.getvalue()
+    if fmt == "mp3":
+        return encode_audio(audio, TARGET_SAMPLE_RATE, "mp3")[0]
+    if fmt in _FFMPEG_ARGS and shutil.which("ffmpeg"):
+        wav = _source_file("wav", audio)
+        result = subprocess.run(
+            ["ffmpeg", "-hide_banner", "-loglevel", "error", "-i", "pipe:0", *_FFMPEG_ARGS[fmt], "pipe:1"],
+            input=wav, capture_output=True,
+        )
+        if result.returncode == 0 and result.stdout:
+            return result.stdout
+    return None
+
+
+def decode_cases(durations: list[float]) -> list[Case]:
+    formats = [fmt for fmt in sorted(SUPPORTED_FORMATS) if _source_file(fmt, _signal(0.1, TARGET_SAMPLE_RATE))]
+    for fmt in sorted(SUPPORTED_FORMATS - set(formats)):
+        print(f"skipping decode/{fmt}: cannot produce a {fmt} fixture here", file=sys.stderr)
+    cases = []
+    for seconds in durations:
+        audio = _signal(seconds, TARGET_SAMPLE_RATE)
+        for fmt in formats:
+            data = _source_file(fmt, audio)
+            cases.append(Case(
+                f"decode/{fmt}/{seconds:g}s",
+                lambda data=data, fmt=fmt: decode_audio(data, f"audio.{fmt}"),
+                seconds, "audio_s",
+            ))
+    return cases
+
+
+def _encodable(fmt: str) -> bool:
+    try:
+        encode_audio(_signal(0.1, ENCODE_RATE), ENCODE_RATE, fmt)
+    except ValueError:
+        print(f"skipping encode/{fmt}: not supported", file=sys.stderr)
+        return False
+    return True
+
+
+def encode_cases(durations: list[float]) -> list[Case]:
+    formats = [fmt for fmt in sorted(CONTENT_TYPES) if _encodable(fmt)]
+    cases = []
+    for seconds in durations:
+        audio = _signal(seconds, ENCODE_RATE)
+        for fmt in formats:
+            cases.append(Case(
+                f"encode/{fmt}/{seconds:g}s",
+                lambda audio=audio, fmt=fmt: encode_audio(audio, ENCODE_RATE, fmt),
+                seconds, "audio_s",
+            ))
+    return cases
+
+
+def _encode_stream(audio: np.ndarray, fmt: str, step: int = ENCODE_RATE // 2) -> bytes:
+    encoder = StreamEncoder(fmt)
+    pieces = [encoder.encode(audio[start:start + step], ENCODE_RATE) for start in range(0, len(audio), step)]
+    return b"".join(pieces) + encoder.flush()
+
+
+def encode_stream_cases(durations: list[float]) -> list[Case]:
+    cases = []
+    for seconds in durations:
+        audio = _signal(seconds, ENCODE_RATE)
+        for fmt in ("mp3", "pcm", "wav"):
+            cases.append(Case(
+                f"encode_stream/{fmt}/{seconds:g}s",
+                lambda audio=audio, fmt=fmt: _encode_stream(audio, fmt),
+                seconds, "audio_s",
+            ))
+    return cases
+
+
+def resample_cases(durations: list[float]) -> list[Case]:
+    cases = []
+    for seconds in durations:
+        for rate in SOURCE_RATES:
+            audio = _signal(seconds, rate)
+            cases.append(Case(
+                f"resample/{rate}/{seconds:g}s",
+                lambda audio=audio, rate=rate: _resample(audio, rate),
+                seconds, "audio_s",
+            ))
+    return cases
+
+
+def _segment(text: str, step: int = 20) -> list[str]:
+    segmenter = SentenceSegmenter()
+    chunks = []
+    for start in range(0, len(text), step):
+        chunks.extend(segmenter.push(text[start:start + step]))
+    return chunks + segmenter.flush()
+
+
+def chunking_cases(lengths: list[int]) -> list[Case]:
+    cases = []
+    for chars in lengths:
+        text = _text(chars)
+        cases.append(Case(f"chunk_text/{chars}", lambda text=text: chunk_text(text), chars, "chars"))
+        cases.append(Case(f"segmenter/{chars}", lambda text=text: _segment(text), chars, "chars"))
+    return cases
+
+
+def measure(case: Case, repeat: int, max_time: float) -> dict:
+    timings = []
+    deadline = time.perf_counter() + max_time
+    while len(timings) < repeat:
+        gc.collect()
+        started = time.perf_counter()
+        case.fn()
+        timings.append(time.perf_counter() - started)
+        if time.perf_counter() > deadline:
+            break
+
+    gc.collect()
+    tracemalloc.start()
+    try:
+        case.fn()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    best = min(timings)
+    return {
+        "runs": len(timings),
+        "seconds_p50": round(float(np.median(timings)), 6),
+        "seconds_min": round(best, 6),
+        "throughput": round(case.units / best, 3) if best > 0 else 0.0,
+        "unit": f"{case.unit}/s",
+        "peak_bytes": peak,
+    }
+
+
+def _float_list(value: str) -> list[float]:
+    return [float(v) for v in value.split(",") if v]
+
+
+def _int_list(value: str) -> list[int]:
+    return [int(v) for v in value.split(",") if v]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Microbenchmarks for audio decoding, encoding, resampling and chunking.")
+    parser.add_argument("--groups", type=lambda v: v.split(","), default=["decode", "encode", "encode_stream", "resample", "chunking"])
+    parser.add_argument("--durations", type=_float_list, default=[1, 10, 60, 600, 3600], help="audio seconds")
+    parser.add_argument("--text-lengths", type=_int_list, default=[1_000, 10_000, 100_000, 1_000_000])
+    parser.add_argument("--only", help="run only cases whose name contains this string")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--max-time", type=float, default=10.0, help="stop repeating a case after this many seconds")
+    parser.add_argument("--output", help="write results as JSON to this path")
+    parser.add_argument("--baseline", help="compare against a previous --output file")
+    parser.add_argument("--tolerance", type=float, default=0.15)
+    args = parser.parse_args()
+
+    builders = {
+        "decode": lambda: decode_cases(args.durations),
+        "encode": lambda: encode_cases(args.durations),
+        "encode_stream": lambda: encode_stream_cases(args.durations),
+        "resample": lambda: resample_cases(args.durations),
+        "chunking": lambda: chunking_cases(args.text_lengths),
+    }
+    unknown = set(args.groups) - set(builders)
+    if unknown:
+        raise SystemExit(f"Unknown groups: {', '.join(sorted(unknown))}")
+
+    results = {}
+    print(f"{'case':<28}{'runs':>5}{'p50 ms':>12}{'throughput':>16}{'peak MB':>10}")
+    for group in args.groups:
+        for case in builders[group]():
+            if args.only and args.only not in case.name:
+                continue
+            r = results[case.name] = measure(case, args.repeat, args.max_time)
+            print(
+                f"{case.name:<28}{r['runs']:>5}{r['seconds_p50'] * 1000:>12.2f}"
+                f"{r['throughput']:>12.1f} {case.unit:<3}{r['peak_bytes'] / 2 ** 20:>10.1f}"
+            )
+
+    if args.output:
+        baseline.save(args.output, results, {k: v for k, v in vars(args).items() if k not in ("output", "baseline")})
+    if args.baseline:
+        regressions = baseline.compare(results, baseline.load(args.baseline), METRICS, args.tolerance)
+        for line in regressions:
+            print(f"REGRESSION {line}")
+        if regressions:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,143 @@
+import time
+from typing import AsyncIterator
+
+import numpy as np
+
+from bragi.adapters.stt import Segment, STTAdapter, TranscriptResult
+from bragi.adapters.tts import TTSAdapter
+from bragi.audio.encoding import encode_audio
+
+FAKE_STT_REPO = "bench/fake-stt"
+FAKE_TTS_REPO = "bench/fake-tts"
+
+FAKE_VOICES = ["bench_a", "bench_b", "bench_c"]
+
+_SEGMENT_SECONDS = 5.0
+_SECONDS_PER_CHAR = 0.06
+
+
+def _spend(seconds: float, spin: bool) -> None:
+    if seconds <= 0:
+        return
+    if not spin:
+        time.sleep(seconds)
+        return
+    deadline = time.perf_counter() + seconds
+    while time.perf_counter() < deadline:
+        pass
+
+
+class FakeSTTAdapter(STTAdapter):
+    rtf = 0.05
+    spin = False
+
+    def __init__(self) -> None:
+        self._loaded = False
+
+    @staticmethod
+    def detect(config: dict) -> bool:
+        return config.get("repo", "") == FAKE_STT_REPO
+
+    def load(self, model_path: str, device: str, **kwargs) -> None:
+        self._loaded = True
+
+    def unload(self) -> None:
+        self._loaded = False
+
+    def _result(self, audio: np.ndarray) -> TranscriptResult:
+        duration = len(audio) / self.get_sample_rate()
+        _spend(duration * self.rtf, self.spin)
+        segments = []
+        start = 0.0
+        while start < duration:
+            end = min(start + _SEGMENT_SECONDS, duration)
+            segments.append(Segment(id=len(segments), start=start, end=end, text=f"segment {len(segments)}"))
+            start = end
+        return TranscriptResult(
+            text=" ".join(seg.text for seg in segments),
+            language="en",
+            duration=duration,
+            segments=segments,
+        )
+
+    def transcribe(
+        self,
+        audio: np.ndarray,
+        language: str | None,
+        temperature: float,
+        word_timestamps: bool,
+    ) -> TranscriptResult:
+        return self._result(audio)
+
+    def translate(self, audio: np.ndarray, temperature: float) -> TranscriptResult:
+        return self._result(audio)
+
+    def get_supported_languages(self) -> list[str]:
+        return ["en"]
+
+    def get_sample_rate(self) -> int:
+        return 16000
+
+    def supports_translation(self) -> bool:
+        return True
+
+    def supports_streaming(self) -> bool:
+        return True
+
+    def is_thread_safe(self) -> bool:
+        return True
+
+
+class FakeTTSAdapter(TTSAdapter):
+    rtf = 0.05
+    spin = False
+
+    def __init__(self) -> None:
+        self._loaded = False
+
+    @staticmethod
+    def detect(config: dict) -> bool:
+        return config.get("repo", "") == FAKE_TTS_REPO
+
+    def load(self, model_path: str, device: str, **kwargs) -> None:
+        self._loaded = True
+
+    def unload(self) -> None:
+        self._loaded = False
+
+    def synthesize_raw(self, text: str, voice: str, speed: float) -> tuple[np.ndarray, int]:
+        sample_rate = self.get_sample_rate()
+        duration = len(text) * _SECONDS_PER_CHAR / speed
+        _spend(duration * self.rtf, self.spin)
+        t = np.arange(int(duration * sample_rate), dtype=np.float32) / sample_rate
+        return (0.2 * np.sin(2 * np.pi * 220.0 * t)).astype(np.float32), sample_rate
+
+    def synthesize(self, text: str, voice: str, speed: float, response_format: str) -> bytes:
+        audio, sr = self.synthesize_raw(text, voice, speed)
+        encoded, _ = encode_audio(audio, sr, response_format)
+        return encoded
+
+    async def synthesize_stream(
+        self, text: str, voice: str, speed: float, response_format: str
+    ) -> AsyncIterator[bytes]:
+        yield self.synthesize(text, voice, speed, response_format)
+
+    def synthesize_with_reference(
+        self, text: str, reference_audio: np.ndarray, transcript: str, speed: float, response_format: str
+    ) -> bytes:
+        return self.synthesize(text, FAKE_VOICES[0], speed, response_format)
+
+    def get_available_voices(self) -> list[str]:
+        return FAKE_VOICES
+
+    def get_sample_rate(self) -> int:
+        return 24000
+
+    def supports_streaming(self) -> bool:
+        return False
+
+    def supports_voice_cloning(self) -> bool:
+        return False
+
+    def is_thread_safe(self) -> bool:
+        return True
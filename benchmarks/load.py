@@ -0,0 +1,369 @@
+import argparse
+import asyncio
+import io
+import json
+import os
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+import uuid
+from dataclasses import dataclass
+from pathlib import Path
+
+import numpy as np
+import soundfile as sf
+import yaml
+
+from benchmarks import baseline
+from benchmarks.fakes import FAKE_STT_REPO, FAKE_TTS_REPO, FAKE_VOICES
+from bragi.keys.store import KeyStore
+
+ROOT = Path(__file__).resolve().parent.parent
+
+STT_MODEL = "whisper-1"
+TTS_MODEL = "tts-1"
+
+METRICS = {
+    "throughput_rps": True,
+    "latency_p50_ms": False,
+    "latency_p95_ms": False,
+    "ttfb_p50_ms": False,
+}
+
+
+@dataclass
+class Scenario:
+    name: str
+    method: str
+    path: str
+    body: bytes = b""
+    content_type: str | None = None
+
+
+@dataclass
+class Sample:
+    status: int
+    latency: float
+    ttfb: float
+
+
+def _multipart(fields: dict[str, str], filename: str, data: bytes) -> tuple[bytes, str]:
+    boundary = uuid.uuid4().hex
+    parts = []
+    for name, value in fields.items():
+        parts.append(f'--{boundary}\r\nContent-Disposition: form-data; name="{name}"\r\n\r\n{value}\r\n'.encode())
+    parts.append(
+        f'--{boundary}\r\nContent-Disposition: form-data; name="file"; filename="{filename}"\r\n'
+        f"Content-Type: application/octet-stream\r\n\r\n".encode() + data + b"\r\n"
+    )
+    parts.append(f"--{boundary}--\r\n".encode())
+    return b"".join(parts), f"multipart/form-data; boundary={boundary}"
+
+
+def _audio_file(seconds: float, fmt: str) -> bytes:
+    rng = np.random.default_rng(0)
+    t = np.arange(int(seconds * 16000), dtype=np.float32) / 16000
+    audio = 0.3 * np.sin(2 * np.pi * 440.0 * t) + 0.01 * rng.standard_normal(len(t)).astype(np.float32)
+    buf = io.BytesIO()
+    sf.write(buf, audio, 16000, format=fmt.upper())
+    return buf.getvalue()
+
+
+def _text(chars: int) -> str:
+    sentence = "The quick brown fox jumps over the lazy dog. "
+    return (sentence * (chars // len(sentence) + 1))[:chars].strip()
+
+
+def build_scenarios(audio_seconds: float, audio_format: str, text_chars: int) -> dict[str, Scenario]:
+    audio = _audio_file(audio_seconds, audio_format)
+    upload, upload_type = _multipart({"model": STT_MODEL}, f"audio.{audio_format}", audio)
+    upload_stream, upload_stream_type = _multipart(
+        {"model": STT_MODEL, "stream": "true"}, f"audio.{audio_format}", audio
+    )
+    speech = {"model": TTS_MODEL, "input": _text(text_chars), "voice": FAKE_VOICES[0], "response_format": "mp3"}
+    return {
+        "transcriptions": Scenario("transcriptions", "POST", "/v1/audio/transcriptions", upload, upload_type),
+        "transcriptions_stream": Scenario(
+            "transcriptions_stream", "POST", "/v1/audio/transcriptions", upload_stream, upload_stream_type
+        ),
+        "speech": Scenario("speech", "POST", "/v1/audio/speech", json.dumps(speech).encode(), "application/json"),
+        "speech_stream": Scenario(
+            "speech_stream", "POST", "/v1/audio/speech",
+            json.dumps({**speech, "stream": True}).encode(), "application/json",
+        ),
+        "voices": Scenario("voices", "GET", "/v1/audio/voices"),
+    }
+
+
+def _request(scenario: Scenario, host: str, api_key: str | None) -> bytes:
+    lines = [f"{scenario.method} {scenario.path} HTTP/1.1", f"Host: {host}", "Connection: keep-alive"]
+    if api_key:
+        lines.append(f"Authorization: Bearer {api_key}")
+    if scenario.content_type:
+        lines.append(f"Content-Type: {scenario.content_type}")
+    if scenario.body or scenario.method != "GET":
+        lines.append(f"Content-Length: {len(scenario.body)}")
+    return ("\r\n".join(lines) + "\r\n\r\n").encode() + scenario.body
+
+
+class Connection:
+    def __init__(self, host: str, port: int) -> None:
+        self.host = host
+        self.port = port
+        self._reader: asyncio.StreamReader | None = None
+        self._writer: asyncio.StreamWriter | None = None
+
+    async def send(self, payload: bytes) -> Sample:
+        if self._writer is None:
+            self._reader, self._writer = await asyncio.open_connection(self.host, self.port)
+        started = time.perf_counter()
+        self._writer.write(payload)
+        await self._writer.drain()
+        status, first_byte, keep_alive = await self._read_response(started)
+        latency = time.perf_counter() - started
+        if not keep_alive:
+            self.close()
+        return Sample(status=status, latency=latency, ttfb=first_byte - started)
+
+    async def _read_response(self, started: float) -> tuple[int, float, bool]:
+        reader = self._reader
+        status_line = await reader.readline()
+        if not status_line:
+            raise ConnectionError("server closed the connection")
+        status = int(status_line.split()[1])
+        headers = {}
+        while (line := await reader.readline()) not in (b"\r\n", b""):
+            name, _, value = line.decode("latin-1").partition(":")
+            headers[name.strip().lower()] = value.strip()
+
+        first_byte = None
+        if headers.get("transfer-encoding", "").lower() == "chunked":
+            while True:
+                size = int((await reader.readline()).split(b";")[0], 16)
+                if size == 0:
+                    while (await reader.readline()) not in (b"\r\n", b""):
+                        pass
+                    break
+                await reader.readexactly(size + 2)
+                first_byte = first_byte or time.perf_counter()
+        else:
+            remaining = int(headers.get("content-length", "0"))
+            while remaining:
+                data = await reader.read(min(remaining, 65536))
+                if not data:
+                    raise ConnectionError("response body truncated")
+                first_byte = first_byte or time.perf_counter()
+                remaining -= len(data)
+
+        return status, first_byte or time.perf_counter(), headers.get("connection", "").lower() != "close"
+
+    def close(self) -> None:
+        if self._writer is not None:
+            self._writer.close()
+        self._reader = self._writer = None
+
+
+async def run_level(
+    host: str,
+    port: int,
+    scenario: Scenario,
+    api_key: str | None,
+    concurrency: int,
+    requests: int,
+    warmup: int,
+) -> dict:
+    payload = _request(scenario, f"{host}:{port}", api_key)
+    samples: list[Sample] = []
+    errors = 0
+
+    async def worker(count: int, record: bool) -> None:
+        nonlocal errors
+        connection = Connection(host, port)
+        try:
+            for _ in range(count):
+                try:
+                    sample = await connection.send(payload)
+                except (ConnectionError, OSError, asyncio.IncompleteReadError):
+                    connection.close()
+                    if record:
+                        errors += 1
+                    continue
+                if record:
+                    samples.append(sample)
+        finally:
+            connection.close()
+
+    def split(total: int) -> list[int]:
+        return [total // concurrency + (i < total % concurrency) for i in range(concurrency)]
+
+    await asyncio.gather(*(worker(n, False) for n in split(warmup)))
+    started = time.perf_counter()
+    await asyncio.gather(*(worker(n, True) for n in split(requests)))
+    elapsed = time.perf_counter() - started
+
+    ok = [s for s in samples if 200 <= s.status < 300]
+    errors += len(samples) - len(ok)
+    latencies = [s.latency * 1000 for s in ok]
+    ttfbs = [s.ttfb * 1000 for s in ok]
+    return {
+        "scenario": scenario.name,
+        "concurrency": concurrency,
+        "requests": requests,
+        "errors": errors,
+        "elapsed_s": round(elapsed, 4),
+        "throughput_rps": round(len(ok) / elapsed, 3) if elapsed > 0 else 0.0,
+        **{f"latency_p{q}_ms": round(baseline.percentile(latencies, q), 3) for q in (50, 95, 99)},
+        **{f"ttfb_p{q}_ms": round(baseline.percentile(ttfbs, q), 3) for q in (50, 95, 99)},
+    }
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def _write_config(workdir: Path, args: argparse.Namespace) -> Path:
+    model = {"device": "cpu", "concurrency": args.model_concurrency, "batch_size": args.batch_size}
+    config = {
+        "device": "cpu",
+        "models": {
+            STT_MODEL: {"repo": FAKE_STT_REPO, **model},
+            TTS_MODEL: {"repo": FAKE_TTS_REPO, **model},
+        },
+        "model_cache_dir": str(workdir),
+        "speech_cache": {"enabled": args.speech_cache},
+        "server": {"decode_workers": args.decode_workers, "log_level": "warning"},
+    }
+    path = workdir / "config.yaml"
+    path.write_text(yaml.safe_dump(config))
+    return path
+
+
+async def _create_key(workdir: Path) -> str:
+    key_store = KeyStore(db_path=workdir / "keys" / "keys.db")
+    await key_store.initialize()
+    try:
+        _, raw_key = await key_store.create("benchmark")
+    finally:
+        await key_store.close()
+    return raw_key
+
+
+async def _wait_ready(host: str, port: int, server: subprocess.Popen, timeout: float = 60.0) -> None:
+    probe = Scenario("ready", "GET", "/ready")
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if server.poll() is not None:
+            raise RuntimeError(f"benchmark server exited with code {server.returncode}")
+        connection = Connection(host, port)
+        try:
+            if (await connection.send(_request(probe, f"{host}:{port}", None))).status == 200:
+                return
+        except OSError:
+            pass
+        finally:
+            connection.close()
+        await asyncio.sleep(0.2)
+    raise RuntimeError("benchmark server did not become ready")
+
+
+def _start_server(workdir: Path, host: str, port: int, args: argparse.Namespace) -> subprocess.Popen:
+    env = {
+        **os.environ,
+        "BRAGI_CONFIG": str(_write_config(workdir, args)),
+        "BRAGI_KEY_STORE_DIR": str(workdir / "keys"),
+        "BRAGI_VOICE_STORE_DIR": str(workdir / "voices"),
+        "PYTHONPATH": os.pathsep.join(filter(None, [str(ROOT), os.environ.get("PYTHONPATH")])),
+    }
+    command = [
+        sys.executable, "-m", "benchmarks.serve",
+        "--host", host, "--port", str(port),
+        "--stt-rtf", str(args.stt_rtf), "--tts-rtf", str(args.tts_rtf),
+    ]
+    if args.spin:
+        command.append("--spin")
+    return subprocess.Popen(command, env=env, cwd=ROOT)
+
+
+def _print_table(results: list[dict]) -> None:
+    header = f"{'scenario':<22}{'conc':>5}{'rps':>10}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}{'ttfb p50':>10}{'errors':>8}"
+    print(header)
+    for r in results:
+        print(
+            f"{r['scenario']:<22}{r['concurrency']:>5}{r['throughput_rps']:>10.1f}"
+            f"{r['latency_p50_ms']:>10.1f}{r['latency_p95_ms']:>10.1f}{r['latency_p99_ms']:>10.1f}"
+            f"{r['ttfb_p50_ms']:>10.1f}{r['errors']:>8}"
+        )
+
+
+async def run(args: argparse.Namespace) -> dict[str, dict]:
+    scenarios = build_scenarios(args.audio_seconds, args.audio_format, args.text_chars)
+    unknown = set(args.scenarios) - set(scenarios)
+    if unknown:
+        raise SystemExit(f"Unknown scenarios: {', '.join(sorted(unknown))}")
+
+    host, port = "127.0.0.1", _free_port()
+    with tempfile.TemporaryDirectory(prefix="bragi-bench-") as tmp:
+        workdir = Path(tmp)
+        api_key = await _create_key(workdir)
+        server = _start_server(workdir, host, port, args)
+        try:
+            await _wait_ready(host, port, server)
+            results = []
+            for name in args.scenarios:
+                for concurrency in args.concurrency:
+                    results.append(await run_level(
+                        host, port, scenarios[name], api_key,
+                        concurrency, args.requests, args.warmup or concurrency,
+                    ))
+        finally:
+            server.terminate()
+            server.wait()
+
+    _print_table(results)
+    return {f"{r['scenario']}@{r['concurrency']}": r for r in results}
+
+
+def _int_list(value: str) -> list[int]:
+    return [int(v) for v in value.split(",") if v]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="End-to-end HTTP load test against Bragi with fake adapters.")
+    parser.add_argument("--scenarios", type=lambda v: v.split(","),
+                        default=["transcriptions", "transcriptions_stream", "speech", "speech_stream", "voices"])
+    parser.add_argument("--concurrency", type=_int_list, default=[1, 8, 32])
+    parser.add_argument("--requests", type=int, default=200, help="measured requests per scenario and level")
+    parser.add_argument("--warmup", type=int, default=0, help="unmeasured requests first (default: concurrency)")
+    parser.add_argument("--audio-seconds", type=float, default=10.0)
+    parser.add_argument("--audio-format", choices=["wav", "flac", "ogg"], default="wav")
+    parser.add_argument("--text-chars", type=int, default=400)
+    parser.add_argument("--stt-rtf", type=float, default=0.05, help="fake STT compute seconds per audio second")
+    parser.add_argument("--tts-rtf", type=float, default=0.05, help="fake TTS compute seconds per audio second")
+    parser.add_argument("--spin", action="store_true", help="fake compute holds the GIL instead of sleeping")
+    parser.add_argument("--model-concurrency", type=int, default=4)
+    parser.add_argument("--batch-size", type=int, default=1)
+    parser.add_argument("--decode-workers", type=int, default=4)
+    parser.add_argument("--speech-cache", action="store_true", help="leave the speech cache enabled")
+    parser.add_argument("--output", help="write results as JSON to this path")
+    parser.add_argument("--baseline", help="compare against a previous --output file")
+    parser.add_argument("--tolerance", type=float, default=0.15)
+    args = parser.parse_args()
+
+    results = asyncio.run(run(args))
+    options = {k: v for k, v in vars(args).items() if k not in ("output", "baseline")}
+    if args.output:
+        baseline.save(args.output, results, options)
+    if args.baseline:
+        regressions = baseline.compare(results, baseline.load(args.baseline), METRICS, args.tolerance)
+        for line in regressions:
+            print(f"REGRESSION {line}")
+        if regressions:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,28 @@
+import argparse
+
+import uvicorn
+
+from benchmarks.fakes import FakeSTTAdapter, FakeTTSAdapter
+from bragi import bootstrap
+from bragi.main import create_app
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Run Bragi with fake adapters for benchmarking.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument("--stt-rtf", type=float, default=FakeSTTAdapter.rtf)
+    parser.add_argument("--tts-rtf", type=float, default=FakeTTSAdapter.rtf)
+    parser.add_argument("--spin", action="store_true", help="burn CPU holding the GIL instead of sleeping")
+    args = parser.parse_args()
+
+    FakeSTTAdapter.rtf = args.stt_rtf
+    FakeTTSAdapter.rtf = args.tts_rtf
+    FakeSTTAdapter.spin = FakeTTSAdapter.spin = args.spin
+    bootstrap._optional_adapters[:0] = [FakeSTTAdapter, FakeTTSAdapter]
+
+    uvicorn.run(create_app(), host=args.host, port=args.port, log_level="warning")
+
+
+if __name__ == "__main__":
+    main()
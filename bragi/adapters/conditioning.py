@@ -0,0 +1,104 @@
+from __future__ import annotations
+
+import os
+import tempfile
+import threading
+from collections import OrderedDict
+from concurrent.futures import Future
+from typing import Callable, Generic, TypeVar
+
+import numpy as np
+import soundfile as sf
+
+T = TypeVar("T")
+
+_Key = tuple[str, str]
+
+
+def write_reference(reference_audio: np.ndarray, sample_rate: int) -> str:
+    with tempfile.NamedTemporaryFile(suffix=".wav", delete=False) as tmp:
+        sf.write(tmp, reference_audio, sample_rate, format="WAV", subtype="PCM_16")
+        return tmp.name
+
+
+def remove_file(path: str) -> None:
+    try:
+        os.unlink(path)
+    except FileNotFoundError:
+        pass
+
+
+class ConditioningCache(Generic[T]):
+    def __init__(
+        self,
+        max_entries: int = 32,
+        on_evict: Callable[[T], None] | None = None,
+    ) -> None:
+        self.max_entries = max_entries
+        self._on_evict = on_evict
+        self._entries: OrderedDict[_Key, T] = OrderedDict()
+        self._pending: dict[_Key, Future] = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get_or_compute(
+        self,
+        voice_id: str | None,
+        revision: str,
+        compute: Callable[[], T],
+    ) -> T:
+        if voice_id is None:
+            return compute()
+        key = (voice_id, revision)
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return self._entries[key]
+            pending = self._pending.get(key)
+            if pending is None:
+                self.misses += 1
+                self._pending[key] = future = Future()
+            else:
+                self.hits += 1
+        if pending is not None:
+            return pending.result()
+
+        try:
+            value = compute()
+        except BaseException as e:
+            with self._lock:
+                self._pending.pop(key, None)
+            future.set_exception(e)
+            raise
+
+        evicted: list[T] = []
+        with self._lock:
+            self._pending.pop(key, None)
+            stale = [k for k in self._entries if k[0] == voice_id]
+            evicted.extend(self._entries.pop(k) for k in stale)
+            self._entries[key] = value
+            while len(self._entries) > self.max_entries:
+                evicted.append(self._entries.popitem(last=False)[1])
+        future.set_result(value)
+        self._dispose(evicted)
+        return value
+
+    def forget(self, voice_id: str) -> None:
+        with self._lock:
+            stale = [key for key in self._entries if key[0] == voice_id]
+            evicted = [self._entries.pop(key) for key in stale]
+        self._dispose(evicted)
+
+    def clear(self) -> None:
+        with self._lock:
+            evicted = list(self._entries.values())
+            self._entries.clear()
+        self._dispose(evicted)
+
+    def _dispose(self, values: list[T]) -> None:
+        if self._on_evict is None:
+            return
+        for value in values:
+            self._on_evict(value)
@@ -1,18 +1,26 @@
 import gc
-import tempfile
+import threading
 from typing import AsyncIterator
 
 import numpy as np
 import soundfile as sf
+from bragi.adapters.conditioning import ConditioningCache, remove_file, write_reference
 from bragi.adapters.tts import TTSAdapter
 from bragi.audio.encoding import encode_audio
 
+_LANGUAGE = "en"
+
 
 class CoquiXTTSAdapter(TTSAdapter):
 
     def __init__(self) -> None:
-        self._tts = None
+        self._instances: list = []
+        self._pool_size = 1
+        self._model_path: str | None = None
+        self._device = "cpu"
         self._speakers: list[str] = []
+        self._conditioning: ConditioningCache = ConditioningCache()
+        self._lock = threading.Lock()
 
     @staticmethod
     def detect(config: dict) -> bool:
@@ -20,20 +28,44 @@ class CoquiXTTSAdapter(TTSAdapter):
         return "xtts" in repo or "coqui" in repo
 
     def load(self, model_path: str, device: str, **kwargs) -> None:
-        from TTS.api import TTS
-
-        self._tts = TTS(model_name=model_path)
-        self._tts.to(device)
-        self._speakers = self._tts.speakers or []
+        self._model_path = model_path
+        self._device = device
+        self._pool_size = max(1, kwargs.get("concurrency") or 1)
+        self._instances = [self._new_instance() for _ in range(self._pool_size)]
+        self._speakers = self._instances[0].speakers or []
 
     def unload(self) -> None:
-        del self._tts
-        self._tts = None
+        self._conditioning.clear()
+        with self._lock:
+            self._model_path = None
+            self._instances = []
         self._speakers = []
         gc.collect()
 
+    def _new_instance(self):
+        from TTS.api import TTS
+
+        tts = TTS(model_name=self._model_path)
+        tts.to(self._device)
+        return tts
+
+    def _acquire(self):
+        with self._lock:
+            if self._instances:
+                return self._instances.pop()
+        return self._new_instance()
+
+    def _release(self, tts) -> None:
+        with self._lock:
+            if self._model_path is not None and len(self._instances) < self._pool_size:
+                self._instances.append(tts)
+
     def synthesize_raw(self, text: str, voice: str, speed: float) -> tuple[np.ndarray, int]:
-        wav = self._tts.tts(text=text, speaker=voice, language="en")
+        tts = self._acquire()
+        try:
+            wav = tts.tts(text=text, speaker=voice, language=_LANGUAGE)
+        finally:
+            self._release(tts)
         return np.array(wav, dtype=np.float32), 24000
 
     def synthesize(self, text: str, voice: str, speed: float, response_format: str) -> bytes:
@@ -59,24 +91,80 @@ class CoquiXTTSAdapter(TTSAdapter):
     def supports_voice_cloning(self) -> bool:
         return True
 
+    def is_thread_safe(self) -> bool:
+        return True
+
+    def forget_voice(self, voice_id: str) -> None:
+        self._conditioning.forget(voice_id)
+
+    def _compute_latents(self, model, reference_audio: np.ndarray):
+        config = model.config
+        tmp_path = write_reference(reference_audio, self.get_sample_rate())
+        try:
+            return model.get_conditioning_latents(
+                audio_path=[tmp_path],
+                max_ref_length=config.max_ref_len,
+                gpt_cond_len=config.gpt_cond_len,
+                gpt_cond_chunk_len=config.gpt_cond_chunk_len,
+                sound_norm_refs=config.sound_norm_refs,
+            )
+        finally:
+            remove_file(tmp_path)
+
     def synthesize_raw_with_reference(
-        self, text: str, reference_audio: bytes, transcript: str, speed: float
+        self,
+        text: str,
+        reference_audio: np.ndarray,
+        transcript: str,
+        speed: float,
+        voice_id: str | None = None,
+        reference_revision: str = "",
     ) -> tuple[np.ndarray, int]:
-        tmp_path = None
+        tts = self._acquire()
         try:
-            with tempfile.NamedTemporaryFile(suffix=".wav", delete=False) as tmp:
-                tmp_path = tmp.name
-                tmp.write(reference_audio)
-
-            wav = self._tts.tts(text=text, speaker_wav=tmp_path, language="en")
-            return np.array(wav, dtype=np.float32), 24000
+            return self._synthesize_with_reference(tts, text, reference_audio, voice_id, reference_revision)
         finally:
-            if tmp_path:
-                import os
-                os.unlink(tmp_path)
+            self._release(tts)
+
+    def _synthesize_with_reference(
+        self,
+        tts,
+        text: str,
+        reference_audio: np.ndarray,
+        voice_id: str | None,
+        reference_revision: str,
+    ) -> tuple[np.ndarray, int]:
+        model = tts.synthesizer.tts_model
+        if not hasattr(model, "get_conditioning_latents"):
+            tmp_path = write_reference(reference_audio, self.get_sample_rate())
+            try:
+                wav = tts.tts(text=text, speaker_wav=tmp_path, language=_LANGUAGE)
+            finally:
+                remove_file(tmp_path)
+            return np.array(wav, dtype=np.float32), 24000
+
+        gpt_cond_latent, speaker_embedding = self._conditioning.get_or_compute(
+            voice_id, reference_revision, lambda: self._compute_latents(model, reference_audio)
+        )
+        config = model.config
+        out = model.inference(
+            text,
+            _LANGUAGE,
+            gpt_cond_latent,
+            speaker_embedding,
+            temperature=config.temperature,
+            length_penalty=config.length_penalty,
+            repetition_penalty=config.repetition_penalty,
+            top_k=config.top_k,
+            top_p=config.top_p,
+        )
+        wav = out["wav"]
+        if hasattr(wav, "cpu"):
+            wav = wav.cpu().numpy()
+        return np.asarray(wav, dtype=np.float32).squeeze(), 24000
 
     def synthesize_with_reference(
-        self, text: str, reference_audio: bytes, transcript: str, speed: float, response_format: str
+        self, text: str, reference_audio: np.ndarray, transcript: str, speed: float, response_format: str
     ) -> bytes:
         audio, sr = self.synthesize_raw_with_reference(text, reference_audio, transcript, speed)
         encoded, _ = encode_audio(audio, sr, response_format)
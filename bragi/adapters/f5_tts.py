@@ -1,17 +1,37 @@
 import gc
-import tempfile
-from typing import AsyncIterator
+from dataclasses import dataclass
+from typing import Any, AsyncIterator
 
 import numpy as np
 import soundfile as sf
+from bragi.adapters.conditioning import ConditioningCache, remove_file, write_reference
 from bragi.adapters.tts import TTSAdapter
 from bragi.audio.encoding import encode_audio
 
 
+@dataclass
+class _Reference:
+    path: str
+    text: str
+    mel: Any = None
+
+
+class _ReferenceModel:
+    def __init__(self, model, reference: _Reference) -> None:
+        self._model = model
+        self._reference = reference
+
+    def sample(self, cond, **kwargs):
+        if self._reference.mel is None:
+            self._reference.mel = self._model.mel_spec(cond).permute(0, 2, 1)
+        return self._model.sample(cond=self._reference.mel, **kwargs)
+
+
 class F5TTSAdapter(TTSAdapter):
 
     def __init__(self) -> None:
         self._tts = None
+        self._conditioning: ConditioningCache[_Reference] = ConditioningCache()
 
     @staticmethod
     def detect(config: dict) -> bool:
@@ -24,6 +44,7 @@ class F5TTSAdapter(TTSAdapter):
         self._tts = F5TTS(model_type="F5-TTS")
 
     def unload(self) -> None:
+        self._conditioning.clear()
         del self._tts
         self._tts = None
         gc.collect()
@@ -49,33 +70,54 @@ class F5TTSAdapter(TTSAdapter):
     def supports_voice_cloning(self) -> bool:
         return True
 
-    def synthesize_raw_with_reference(
-        self, text: str, reference_audio: bytes, transcript: str, speed: float
-    ) -> tuple[np.ndarray, int]:
-        tmp_path = None
-        try:
-            with tempfile.NamedTemporaryFile(suffix=".wav", delete=False) as tmp:
-                tmp_path = tmp.name
-                tmp.write(reference_audio)
-
-            wav, sr, _ = self._tts.infer(ref_file=tmp_path, ref_text=transcript, gen_text=text)
+    def forget_voice(self, voice_id: str) -> None:
+        self._conditioning.forget(voice_id)
 
-            audio = np.array(wav, dtype=np.float32)
-            if audio.ndim > 1:
-                audio = audio.squeeze()
+    def _prepare_reference(self, reference_audio: np.ndarray, transcript: str) -> _Reference:
+        from f5_tts.infer.utils_infer import preprocess_ref_audio_text
 
-            if sr != 24000:
-                import soxr
-                audio = soxr.resample(audio, sr, 24000)
-
-            return audio, 24000
+        tmp_path = write_reference(reference_audio, self.get_sample_rate())
+        try:
+            return _Reference(*preprocess_ref_audio_text(tmp_path, transcript))
         finally:
-            if tmp_path:
-                import os
-                os.unlink(tmp_path)
+            remove_file(tmp_path)
+
+    def synthesize_raw_with_reference(
+        self,
+        text: str,
+        reference_audio: np.ndarray,
+        transcript: str,
+        speed: float,
+        voice_id: str | None = None,
+        reference_revision: str = "",
+    ) -> tuple[np.ndarray, int]:
+        from f5_tts.infer.utils_infer import infer_process
+
+        reference = self._conditioning.get_or_compute(
+            voice_id, reference_revision, lambda: self._prepare_reference(reference_audio, transcript)
+        )
+        wav, sr, _ = infer_process(
+            reference.path,
+            reference.text,
+            text,
+            _ReferenceModel(self._tts.ema_model, reference),
+            self._tts.vocoder,
+            mel_spec_type=self._tts.mel_spec_type,
+            device=self._tts.device,
+        )
+
+        audio = np.array(wav, dtype=np.float32)
+        if audio.ndim > 1:
+            audio = audio.squeeze()
+
+        if sr != 24000:
+            import soxr
+            audio = soxr.resample(audio, sr, 24000)
+
+        return audio, 24000
 
     def synthesize_with_reference(
-        self, text: str, reference_audio: bytes, transcript: str, speed: float, response_format: str
+        self, text: str, reference_audio: np.ndarray, transcript: str, speed: float, response_format: str
     ) -> bytes:
         audio, sr = self.synthesize_raw_with_reference(text, reference_audio, transcript, speed)
         encoded, _ = encode_audio(audio, sr, response_format)
@@ -1,4 +1,5 @@
 import gc
+from typing import Iterator
 
 import numpy as np
 from faster_whisper import WhisperModel
@@ -24,6 +25,30 @@ WHISPER_LANGUAGES = [
     "yi", "yo", "yue", "zh",
 ]
 
+_BATCH_MAX_SAMPLES = 30 * 16000
+_COMPRESSION_RATIO_THRESHOLD = 2.4
+_LOG_PROB_THRESHOLD = -1.0
+_NO_SPEECH_THRESHOLD = 0.6
+
+
+def _to_segment(s, word_timestamps: bool) -> Segment:
+    words = None
+    if word_timestamps and s.words:
+        words = [Word(word=w.word, start=w.start, end=w.end) for w in s.words]
+
+    return Segment(
+        id=s.id,
+        start=s.start,
+        end=s.end,
+        text=s.text,
+        tokens=list(s.tokens) if s.tokens else None,
+        temperature=s.temperature,
+        avg_logprob=s.avg_logprob,
+        compression_ratio=s.compression_ratio,
+        no_speech_prob=s.no_speech_prob,
+        words=words,
+    )
+
 
 class FasterWhisperAdapter(STTAdapter):
 
@@ -41,7 +66,12 @@ class FasterWhisperAdapter(STTAdapter):
             device = "cuda" if torch.cuda.is_available() else "cpu"
 
         compute_type = kwargs.get("compute_type") or "default"
-        self._model = WhisperModel(model_path, device=device, compute_type=compute_type)
+        self._model = WhisperModel(
+            model_path,
+            device=device,
+            compute_type=compute_type,
+            num_workers=kwargs.get("concurrency") or 1,
+        )
 
     def unload(self) -> None:
         del self._model
@@ -60,6 +90,34 @@ class FasterWhisperAdapter(STTAdapter):
     def translate(self, audio: np.ndarray, temperature: float) -> TranscriptResult:
         return self._run(audio, language=None, temperature=temperature, word_timestamps=False, task="translate")
 
+    def transcribe_stream(
+        self,
+        audio: np.ndarray,
+        language: str | None,
+        temperature: float,
+        word_timestamps: bool,
+    ) -> Iterator[Segment]:
+        segments_gen, _info = self._model.transcribe(
+            audio,
+            language=language,
+            temperature=temperature,
+            word_timestamps=word_timestamps,
+            task="transcribe",
+        )
+        for s in segments_gen:
+            yield _to_segment(s, word_timestamps)
+
+    def translate_stream(self, audio: np.ndarray, temperature: float) -> Iterator[Segment]:
+        segments_gen, _info = self._model.transcribe(
+            audio,
+            language=None,
+            temperature=temperature,
+            word_timestamps=False,
+            task="translate",
+        )
+        for s in segments_gen:
+            yield _to_segment(s, False)
+
     def _run(
         self,
         audio: np.ndarray,
@@ -77,32 +135,13 @@ class FasterWhisperAdapter(STTAdapter):
             task=task,
         )
 
-        raw_segments = list(segments_gen)
-
-        segments = [
-            Segment(
-                id=s.id,
-                start=s.start,
-                end=s.end,
-                text=s.text,
-                tokens=list(s.tokens) if s.tokens else None,
-                temperature=s.temperature,
-                avg_logprob=s.avg_logprob,
-                compression_ratio=s.compression_ratio,
-                no_speech_prob=s.no_speech_prob,
-            )
-            for s in raw_segments
-        ]
+        segments = [_to_segment(s, word_timestamps) for s in segments_gen]
 
         words = None
         if word_timestamps:
-            words = []
-            for s in raw_segments:
-                if s.words:
-                    for w in s.words:
-                        words.append(Word(word=w.word, start=w.start, end=w.end))
+            words = [w for seg in segments if seg.words for w in seg.words]
 
-        text = " ".join(s.text.strip() for s in raw_segments)
+        text = " ".join(seg.text.strip() for seg in segments)
 
         return TranscriptResult(
             text=text,
@@ -112,6 +151,112 @@ class FasterWhisperAdapter(STTAdapter):
             words=words,
         )
 
+    def transcribe_batch(
+        self,
+        audios: list[np.ndarray],
+        language: str | None,
+        temperature: float,
+        word_timestamps: bool,
+    ) -> list[TranscriptResult]:
+        results: list[TranscriptResult | None] = [None] * len(audios)
+        batched: list[int] = []
+
+        for idx, audio in enumerate(audios):
+            if self.can_batch(audio, word_timestamps, timestamps=False):
+                batched.append(idx)
+            else:
+                results[idx] = self.transcribe(audio, language, temperature, word_timestamps)
+
+        if batched:
+            batch_results = self._run_batch([audios[i] for i in batched], language, temperature)
+            for idx, result in zip(batched, batch_results):
+                results[idx] = result or self.transcribe(audios[idx], language, temperature, word_timestamps)
+
+        return results
+
+    def _run_batch(
+        self,
+        audios: list[np.ndarray],
+        language: str | None,
+        temperature: float,
+    ) -> list[TranscriptResult | None]:
+        from faster_whisper.audio import pad_or_trim
+        from faster_whisper.tokenizer import Tokenizer
+        from faster_whisper.transcribe import get_compression_ratio, get_suppressed_tokens
+
+        model = self._model
+        multilingual = model.model.is_multilingual
+
+        features = np.stack([pad_or_trim(model.feature_extractor(audio)) for audio in audios])
+        encoder_output = model.encode(features)
+
+        if language is None and multilingual:
+            languages = [
+                candidates[0][0][2:-2]
+                for candidates in model.model.detect_language(encoder_output)
+            ]
+        else:
+            languages = [language or "en"] * len(audios)
+
+        tokenizers = [
+            Tokenizer(model.hf_tokenizer, multilingual, task="transcribe", language=lang)
+            for lang in languages
+        ]
+        prompts = [list(t.sot_sequence) + [t.no_timestamps] for t in tokenizers]
+
+        if temperature > 0:
+            decode_options = {"beam_size": 1, "sampling_topk": 0, "sampling_temperature": temperature}
+        else:
+            decode_options = {"beam_size": 5}
+
+        outputs = model.model.generate(
+            encoder_output,
+            prompts,
+            max_length=448,
+            return_scores=True,
+            return_no_speech_prob=True,
+            suppress_blank=True,
+            suppress_tokens=list(get_suppressed_tokens(tokenizers[0], [-1])),
+            **decode_options,
+        )
+
+        results: list[TranscriptResult | None] = []
+        for audio, lang, tokenizer, output in zip(audios, languages, tokenizers, outputs):
+            tokens = output.sequences_ids[0]
+            text = tokenizer.decode(tokens).strip()
+            duration = len(audio) / 16000
+            avg_logprob = output.scores[0] * len(tokens) / (len(tokens) + 1)
+            compression_ratio = get_compression_ratio(text)
+
+            if output.no_speech_prob > _NO_SPEECH_THRESHOLD and avg_logprob < _LOG_PROB_THRESHOLD:
+                text = ""
+            elif compression_ratio > _COMPRESSION_RATIO_THRESHOLD or avg_logprob < _LOG_PROB_THRESHOLD:
+                results.append(None)
+                continue
+
+            segment = Segment(
+                id=0,
+                start=0.0,
+                end=duration,
+                text=text,
+                tokens=list(tokens),
+                temperature=temperature,
+                avg_logprob=avg_logprob,
+                compression_ratio=compression_ratio,
+                no_speech_prob=output.no_speech_prob,
+            )
+
+            results.append(
+                TranscriptResult(
+                    text=text,
+                    language=lang,
+                    duration=duration,
+                    segments=[segment] if text else [],
+                )
+            )
+
+        return results
+
     def get_supported_languages(self) -> list[str]:
         return WHISPER_LANGUAGES
 
@@ -123,3 +268,12 @@ class FasterWhisperAdapter(STTAdapter):
 
     def supports_streaming(self) -> bool:
         return False
+
+    def is_thread_safe(self) -> bool:
+        return True
+
+    def supports_batching(self) -> bool:
+        return True
+
+    def can_batch(self, audio: np.ndarray, word_timestamps: bool, timestamps: bool) -> bool:
+        return not word_timestamps and not timestamps and len(audio) <= _BATCH_MAX_SAMPLES
@@ -1,8 +1,8 @@
 import gc
-import tempfile
 from typing import AsyncIterator
 
 import numpy as np
+from bragi.adapters.conditioning import ConditioningCache, remove_file, write_reference
 from bragi.adapters.tts import TTSAdapter
 from bragi.audio.encoding import encode_audio
 
@@ -12,6 +12,7 @@ class FishSpeechAdapter(TTSAdapter):
     def __init__(self) -> None:
         self._model = None
         self._device: str = "cpu"
+        self._conditioning: ConditioningCache[str] = ConditioningCache(on_evict=remove_file)
 
     @staticmethod
     def detect(config: dict) -> bool:
@@ -25,6 +26,7 @@ class FishSpeechAdapter(TTSAdapter):
         self._model = load_model(model_path, device=device)
 
     def unload(self) -> None:
+        self._conditioning.clear()
         del self._model
         self._model = None
         gc.collect()
@@ -69,23 +71,25 @@ class FishSpeechAdapter(TTSAdapter):
     def supports_voice_cloning(self) -> bool:
         return True
 
+    def forget_voice(self, voice_id: str) -> None:
+        self._conditioning.forget(voice_id)
+
     def synthesize_raw_with_reference(
-        self, text: str, reference_audio: bytes, transcript: str, speed: float
+        self,
+        text: str,
+        reference_audio: np.ndarray,
+        transcript: str,
+        speed: float,
+        voice_id: str | None = None,
+        reference_revision: str = "",
     ) -> tuple[np.ndarray, int]:
-        tmp_path = None
-        try:
-            with tempfile.NamedTemporaryFile(suffix=".wav", delete=False) as tmp:
-                tmp_path = tmp.name
-                tmp.write(reference_audio)
-
-            return self._infer(text, reference_path=tmp_path), 44100
-        finally:
-            if tmp_path:
-                import os
-                os.unlink(tmp_path)
+        reference_path = self._conditioning.get_or_compute(
+            voice_id, reference_revision, lambda: write_reference(reference_audio, self.get_sample_rate())
+        )
+        return self._infer(text, reference_path=reference_path), 44100
 
     def synthesize_with_reference(
-        self, text: str, reference_audio: bytes, transcript: str, speed: float, response_format: str
+        self, text: str, reference_audio: np.ndarray, transcript: str, speed: float, response_format: str
     ) -> bytes:
         audio, sr = self.synthesize_raw_with_reference(text, reference_audio, transcript, speed)
         encoded, _ = encode_audio(audio, sr, response_format)
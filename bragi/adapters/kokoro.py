@@ -1,11 +1,12 @@
 import gc
-from typing import AsyncIterator
+import threading
+from typing import AsyncIterator, Iterator
 
 import numpy as np
 from kokoro import KPipeline
 
 from bragi.adapters.tts import TTSAdapter
-from bragi.audio.encoding import encode_audio
+from bragi.audio.encoding import StreamEncoder, encode_audio
 
 KOKORO_VOICES = [
     "af_heart", "af_alloy", "af_aoede", "af_bella", "af_jessica", "af_kore",
@@ -33,31 +34,60 @@ KOKORO_VOICES = [
 class KokoroAdapter(TTSAdapter):
 
     def __init__(self) -> None:
-        self._pipeline: KPipeline | None = None
+        self._pipelines: list[KPipeline] = []
+        self._pool_size = 1
+        self._loaded = False
+        self._lock = threading.Lock()
 
     @staticmethod
     def detect(config: dict) -> bool:
         return "kokoro" in config.get("repo", "").lower()
 
     def load(self, model_path: str, device: str, **kwargs) -> None:
-        self._pipeline = KPipeline(lang_code="a")
+        self._pool_size = max(1, kwargs.get("concurrency") or 1)
+        self._pipelines = [KPipeline(lang_code="a") for _ in range(self._pool_size)]
+        self._loaded = True
 
     def unload(self) -> None:
-        del self._pipeline
-        self._pipeline = None
+        with self._lock:
+            self._loaded = False
+            self._pipelines = []
         gc.collect()
 
+    def _acquire(self) -> KPipeline:
+        with self._lock:
+            if self._pipelines:
+                return self._pipelines.pop()
+        return KPipeline(lang_code="a")
+
+    def _release(self, pipeline: KPipeline) -> None:
+        with self._lock:
+            if self._loaded and len(self._pipelines) < self._pool_size:
+                self._pipelines.append(pipeline)
+
+    def _generate(self, text: str, voice: str, speed: float) -> Iterator[np.ndarray]:
+        pipeline = self._acquire()
+        try:
+            for _graphemes, _phonemes, audio_np in pipeline(text, voice=voice, speed=speed):
+                if audio_np is not None:
+                    yield np.asarray(audio_np, dtype=np.float32)
+        finally:
+            self._release(pipeline)
+
     def synthesize_raw(self, text: str, voice: str, speed: float) -> tuple[np.ndarray, int]:
-        chunks = []
-        for _graphemes, _phonemes, audio_np in self._pipeline(text, voice=voice, speed=speed):
-            if audio_np is not None:
-                chunks.append(audio_np)
+        chunks = list(self._generate(text, voice, speed))
 
         if not chunks:
             return np.array([], dtype=np.float32), 24000
 
         return np.concatenate(chunks), 24000
 
+    def synthesize_raw_stream(
+        self, text: str, voice: str, speed: float
+    ) -> Iterator[tuple[np.ndarray, int]]:
+        for audio in self._generate(text, voice, speed):
+            yield audio, 24000
+
     def synthesize(self, text: str, voice: str, speed: float, response_format: str) -> bytes:
         audio, sr = self.synthesize_raw(text, voice, speed)
         encoded, _ = encode_audio(audio, sr, response_format)
@@ -66,10 +96,14 @@ class KokoroAdapter(TTSAdapter):
     async def synthesize_stream(
         self, text: str, voice: str, speed: float, response_format: str
     ) -> AsyncIterator[bytes]:
-        for _graphemes, _phonemes, audio_np in self._pipeline(text, voice=voice, speed=speed):
-            if audio_np is not None:
-                chunk, _content_type = encode_audio(audio_np, 24000, response_format)
+        encoder = StreamEncoder(response_format)
+        for audio in self._generate(text, voice, speed):
+            chunk = encoder.encode(audio, 24000)
+            if chunk:
                 yield chunk
+        tail = encoder.flush()
+        if tail:
+            yield tail
 
     def get_available_voices(self) -> list[str]:
         return KOKORO_VOICES
@@ -83,7 +117,10 @@ class KokoroAdapter(TTSAdapter):
     def supports_voice_cloning(self) -> bool:
         return False
 
+    def is_thread_safe(self) -> bool:
+        return True
+
     def synthesize_with_reference(
-        self, text: str, reference_audio: bytes, transcript: str, speed: float, response_format: str
+        self, text: str, reference_audio: np.ndarray, transcript: str, speed: float, response_format: str
     ) -> bytes:
         raise NotImplementedError("Kokoro does not support voice cloning with reference audio")
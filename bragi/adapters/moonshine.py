@@ -53,5 +53,8 @@ class MoonshineAdapter(STTAdapter):
     def supports_translation(self) -> bool:
         return False
 
+    def max_window_seconds(self) -> float | None:
+        return 20.0
+
     def supports_streaming(self) -> bool:
         return False
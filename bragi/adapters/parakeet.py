@@ -1,8 +1,6 @@
 import gc
-import tempfile
 
 import numpy as np
-import soundfile as sf
 from bragi.adapters.stt import STTAdapter, Segment, TranscriptResult, Word
 
 
@@ -35,39 +33,55 @@ class ParakeetAdapter(STTAdapter):
         temperature: float,
         word_timestamps: bool,
     ) -> TranscriptResult:
-        tmp_path = None
-        try:
-            with tempfile.NamedTemporaryFile(suffix=".wav", delete=False) as tmp:
-                tmp_path = tmp.name
-                sf.write(tmp_path, audio, 16000, format="WAV", subtype="PCM_16")
-
-            hypotheses = self._model.transcribe([tmp_path])
-
-            if isinstance(hypotheses, list) and len(hypotheses) > 0:
-                hyp = hypotheses[0]
-                text = hyp.text if hasattr(hyp, "text") else str(hyp)
-            else:
-                text = str(hypotheses)
-
-            words = None
-            if word_timestamps and hasattr(hyp, "timestep") and hyp.timestep:
-                words = [
-                    Word(word=w.word, start=w.start, end=w.end)
-                    for w in hyp.timestep
-                    if hasattr(w, "word")
+        return self.transcribe_batch([audio], language, temperature, word_timestamps)[0]
+
+    def transcribe_batch(
+        self,
+        audios: list[np.ndarray],
+        language: str | None,
+        temperature: float,
+        word_timestamps: bool,
+    ) -> list[TranscriptResult]:
+        hypotheses = self._model.transcribe(
+            [np.ascontiguousarray(audio, dtype=np.float32) for audio in audios],
+            batch_size=len(audios),
+            timestamps=word_timestamps,
+            verbose=False,
+        )
+        if isinstance(hypotheses, tuple):
+            hypotheses = hypotheses[0]
+
+        return [
+            self._to_result(hyp, audio, language, word_timestamps)
+            for hyp, audio in zip(hypotheses, audios)
+        ]
+
+    @staticmethod
+    def _to_result(hyp, audio: np.ndarray, language: str | None, word_timestamps: bool) -> TranscriptResult:
+        text = hyp.text if hasattr(hyp, "text") else str(hyp)
+        duration = len(audio) / 16000
+
+        words = None
+        segments = [Segment(id=0, start=0.0, end=duration, text=text)] if text else None
+        timestamp = getattr(hyp, "timestamp", None)
+        if word_timestamps and isinstance(timestamp, dict):
+            words = [
+                Word(word=w["word"], start=w["start"], end=w["end"])
+                for w in timestamp.get("word", [])
+            ]
+            if timestamp.get("segment"):
+                segments = [
+                    Segment(id=idx, start=seg["start"], end=seg["end"], text=seg["segment"])
+                    for idx, seg in enumerate(timestamp["segment"])
                 ]
 
-            return TranscriptResult(
-                text=text,
-                language=language,
-                duration=len(audio) / 16000,
-                segments=[Segment(id=0, start=0.0, end=len(audio) / 16000, text=text)] if text else None,
-                words=words if words else None,
-            )
-        finally:
-            if tmp_path:
-                import os
-                os.unlink(tmp_path)
+        return TranscriptResult(
+            text=text,
+            language=language,
+            duration=duration,
+            segments=segments,
+            words=words or None,
+        )
 
     def translate(self, audio: np.ndarray, temperature: float) -> TranscriptResult:
         raise NotImplementedError("Parakeet does not support translation")
@@ -85,5 +99,11 @@ class ParakeetAdapter(STTAdapter):
     def supports_translation(self) -> bool:
         return False
 
+    def max_window_seconds(self) -> float | None:
+        return 60.0
+
     def supports_streaming(self) -> bool:
         return False
+
+    def supports_batching(self) -> bool:
+        return True
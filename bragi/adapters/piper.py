@@ -1,12 +1,12 @@
 import gc
 import io
 import wave
-from typing import AsyncIterator
+from typing import AsyncIterator, Iterator
 
 import numpy as np
 import soundfile as sf
 from bragi.adapters.tts import TTSAdapter
-from bragi.audio.encoding import encode_audio
+from bragi.audio.encoding import StreamEncoder, encode_audio
 
 
 class PiperAdapter(TTSAdapter):
@@ -42,6 +42,13 @@ class PiperAdapter(TTSAdapter):
         audio, sr = sf.read(buf, dtype="float32")
         return audio, sr
 
+    def synthesize_raw_stream(
+        self, text: str, voice: str, speed: float
+    ) -> Iterator[tuple[np.ndarray, int]]:
+        for chunk in self._voice.synthesize_stream_raw(text, length_scale=1.0 / speed):
+            audio = np.frombuffer(chunk, dtype=np.int16).astype(np.float32) / 32767.0
+            yield audio, self._sample_rate
+
     def synthesize(self, text: str, voice: str, speed: float, response_format: str) -> bytes:
         audio, sr = self.synthesize_raw(text, voice, speed)
         encoded, _ = encode_audio(audio, sr, response_format)
@@ -50,10 +57,15 @@ class PiperAdapter(TTSAdapter):
     async def synthesize_stream(
         self, text: str, voice: str, speed: float, response_format: str
     ) -> AsyncIterator[bytes]:
+        encoder = StreamEncoder(response_format)
         for chunk in self._voice.synthesize_stream_raw(text, length_scale=1.0 / speed):
             audio = np.frombuffer(chunk, dtype=np.int16).astype(np.float32) / 32767.0
-            encoded, _ = encode_audio(audio, self._sample_rate, response_format)
-            yield encoded
+            encoded = encoder.encode(audio, self._sample_rate)
+            if encoded:
+                yield encoded
+        tail = encoder.flush()
+        if tail:
+            yield tail
 
     def get_available_voices(self) -> list[str]:
         return ["default"]
@@ -67,7 +79,10 @@ class PiperAdapter(TTSAdapter):
     def supports_voice_cloning(self) -> bool:
         return False
 
+    def is_thread_safe(self) -> bool:
+        return True
+
     def synthesize_with_reference(
-        self, text: str, reference_audio: bytes, transcript: str, speed: float, response_format: str
+        self, text: str, reference_audio: np.ndarray, transcript: str, speed: float, response_format: str
     ) -> bytes:
         raise NotImplementedError("Piper does not support voice cloning with reference audio")
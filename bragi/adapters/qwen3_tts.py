@@ -1,8 +1,8 @@
 import gc
-import tempfile
 from typing import AsyncIterator
 
 import numpy as np
+from bragi.adapters.conditioning import ConditioningCache
 from bragi.adapters.tts import TTSAdapter
 from bragi.audio.encoding import encode_audio
 
@@ -28,6 +28,7 @@ class Qwen3TTSAdapter(TTSAdapter):
 
     def __init__(self) -> None:
         self._model = None
+        self._conditioning: ConditioningCache = ConditioningCache()
 
     @staticmethod
     def detect(config: dict) -> bool:
@@ -40,6 +41,7 @@ class Qwen3TTSAdapter(TTSAdapter):
         self._model = Qwen3TTSModel.from_pretrained(model_path)
 
     def unload(self) -> None:
+        self._conditioning.clear()
         del self._model
         self._model = None
         gc.collect()
@@ -80,30 +82,37 @@ class Qwen3TTSAdapter(TTSAdapter):
     def supports_voice_cloning(self) -> bool:
         return True
 
+    def forget_voice(self, voice_id: str) -> None:
+        self._conditioning.forget(voice_id)
+
+    def _create_prompt(self, reference_audio: np.ndarray, transcript: str):
+        return self._model.create_voice_clone_prompt(
+            ref_audio=(np.asarray(reference_audio), self.get_sample_rate()),
+            ref_text=transcript,
+        )
+
     def synthesize_raw_with_reference(
-        self, text: str, reference_audio: bytes, transcript: str, speed: float
+        self,
+        text: str,
+        reference_audio: np.ndarray,
+        transcript: str,
+        speed: float,
+        voice_id: str | None = None,
+        reference_revision: str = "",
     ) -> tuple[np.ndarray, int]:
-        tmp_path = None
-        try:
-            with tempfile.NamedTemporaryFile(suffix=".wav", delete=False) as tmp:
-                tmp_path = tmp.name
-                tmp.write(reference_audio)
-
-            wavs, sr = self._model.generate_voice_clone(
-                text=text,
-                language="Auto",
-                ref_audio=tmp_path,
-                ref_text=transcript,
-            )
-
-            return wavs.squeeze().cpu().numpy().astype(np.float32), 24000
-        finally:
-            if tmp_path:
-                import os
-                os.unlink(tmp_path)
+        prompt = self._conditioning.get_or_compute(
+            voice_id, reference_revision, lambda: self._create_prompt(reference_audio, transcript)
+        )
+        wavs, sr = self._model.generate_voice_clone(
+            text=text,
+            language="Auto",
+            voice_clone_prompt=prompt,
+        )
+
+        return wavs.squeeze().cpu().numpy().astype(np.float32), 24000
 
     def synthesize_with_reference(
-        self, text: str, reference_audio: bytes, transcript: str, speed: float, response_format: str
+        self, text: str, reference_audio: np.ndarray, transcript: str, speed: float, response_format: str
     ) -> bytes:
         audio, sr = self.synthesize_raw_with_reference(text, reference_audio, transcript, speed)
         encoded, _ = encode_audio(audio, sr, response_format)
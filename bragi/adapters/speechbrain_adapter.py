@@ -58,5 +58,8 @@ class SpeechBrainAdapter(STTAdapter):
     def supports_translation(self) -> bool:
         return False
 
+    def max_window_seconds(self) -> float | None:
+        return 30.0
+
     def supports_streaming(self) -> bool:
         return False
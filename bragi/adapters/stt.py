@@ -1,8 +1,10 @@
 from abc import ABC, abstractmethod
-from dataclasses import dataclass, field
-from typing import AsyncIterator
+from dataclasses import dataclass, field, replace
+from typing import AsyncIterator, Iterator
 import numpy as np
 
+from bragi.schemas.errors import UnsupportedFeatureError
+
 
 @dataclass
 class Word:
@@ -22,6 +24,7 @@ class Segment:
     avg_logprob: float = 0.0
     compression_ratio: float = 0.0
     no_speech_prob: float = 0.0
+    words: list[Word] | None = None
 
 
 @dataclass
@@ -33,6 +36,46 @@ class TranscriptResult:
     words: list[Word] | None = None
 
 
+@dataclass
+class RealtimeUpdate:
+    text: str
+    final: bool
+    words: list[Word] | None = None
+
+
+class RealtimeSession(ABC):
+    @abstractmethod
+    def accept(self, pcm: bytes) -> RealtimeUpdate | None: ...
+
+    @abstractmethod
+    def finish(self) -> RealtimeUpdate: ...
+
+    @abstractmethod
+    def close(self) -> None: ...
+
+
+def result_segments(result: TranscriptResult) -> list[Segment]:
+    segments = result.segments
+    if not segments:
+        if not result.text:
+            return []
+        segments = [Segment(id=0, start=0.0, end=result.duration, text=result.text)]
+
+    if not result.words or any(seg.words for seg in segments):
+        return list(segments)
+
+    remaining = list(result.words)
+    assigned = []
+    for idx, seg in enumerate(segments):
+        if idx == len(segments) - 1:
+            words, remaining = remaining, []
+        else:
+            words = [w for w in remaining if w.start < seg.end]
+            remaining = remaining[len(words):]
+        assigned.append(replace(seg, words=words or None))
+    return assigned
+
+
 class STTAdapter(ABC):
     @abstractmethod
     def load(self, model_path: str, device: str, **kwargs) -> None: ...
@@ -52,6 +95,39 @@ class STTAdapter(ABC):
     @abstractmethod
     def translate(self, audio: np.ndarray, temperature: float) -> TranscriptResult: ...
 
+    def transcribe_request(
+        self,
+        audio: np.ndarray,
+        language: str | None,
+        temperature: float,
+        word_timestamps: bool,
+        timestamps: bool,
+    ) -> TranscriptResult:
+        return self.transcribe(
+            audio=audio,
+            language=language,
+            temperature=temperature,
+            word_timestamps=word_timestamps,
+        )
+
+    def transcribe_stream(
+        self,
+        audio: np.ndarray,
+        language: str | None,
+        temperature: float,
+        word_timestamps: bool,
+    ) -> Iterator[Segment]:
+        result = self.transcribe(
+            audio=audio,
+            language=language,
+            temperature=temperature,
+            word_timestamps=word_timestamps,
+        )
+        yield from result_segments(result)
+
+    def translate_stream(self, audio: np.ndarray, temperature: float) -> Iterator[Segment]:
+        yield from result_segments(self.translate(audio=audio, temperature=temperature))
+
     @abstractmethod
     def get_supported_languages(self) -> list[str]: ...
 
@@ -64,6 +140,41 @@ class STTAdapter(ABC):
     @abstractmethod
     def supports_streaming(self) -> bool: ...
 
+    def is_thread_safe(self) -> bool:
+        return False
+
+    def supports_batching(self) -> bool:
+        return False
+
+    def can_batch(self, audio: np.ndarray, word_timestamps: bool, timestamps: bool) -> bool:
+        return True
+
+    def max_window_seconds(self) -> float | None:
+        return None
+
+    def supports_realtime(self) -> bool:
+        return False
+
+    def open_realtime(self, language: str | None, word_timestamps: bool) -> RealtimeSession:
+        raise UnsupportedFeatureError("realtime transcription", type(self).__name__)
+
+    def transcribe_batch(
+        self,
+        audios: list[np.ndarray],
+        language: str | None,
+        temperature: float,
+        word_timestamps: bool,
+    ) -> list[TranscriptResult]:
+        return [
+            self.transcribe(
+                audio=audio,
+                language=language,
+                temperature=temperature,
+                word_timestamps=word_timestamps,
+            )
+            for audio in audios
+        ]
+
     @staticmethod
     @abstractmethod
     def detect(config: dict) -> bool: ...
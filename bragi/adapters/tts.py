@@ -1,5 +1,5 @@
 from abc import ABC, abstractmethod
-from typing import AsyncIterator
+from typing import AsyncIterator, Iterator
 
 import numpy as np
 
@@ -31,9 +31,15 @@ class TTSAdapter(ABC):
     @abstractmethod
     def supports_voice_cloning(self) -> bool: ...
 
+    def is_thread_safe(self) -> bool:
+        return False
+
+    def forget_voice(self, voice_id: str) -> None:
+        pass
+
     @abstractmethod
     def synthesize_with_reference(
-        self, text: str, reference_audio: bytes, transcript: str, speed: float, response_format: str
+        self, text: str, reference_audio: np.ndarray, transcript: str, speed: float, response_format: str
     ) -> bytes: ...
 
     @staticmethod
@@ -45,8 +51,19 @@ class TTSAdapter(ABC):
         audio = np.frombuffer(pcm_bytes, dtype=np.int16).astype(np.float32) / 32767.0
         return audio, self.get_sample_rate()
 
+    def synthesize_raw_stream(
+        self, text: str, voice: str, speed: float
+    ) -> Iterator[tuple[np.ndarray, int]]:
+        yield self.synthesize_raw(text, voice, speed)
+
     def synthesize_raw_with_reference(
-        self, text: str, reference_audio: bytes, transcript: str, speed: float
+        self,
+        text: str,
+        reference_audio: np.ndarray,
+        transcript: str,
+        speed: float,
+        voice_id: str | None = None,
+        reference_revision: str = "",
     ) -> tuple[np.ndarray, int]:
         pcm_bytes = self.synthesize_with_reference(text, reference_audio, transcript, speed, "pcm")
         audio = np.frombuffer(pcm_bytes, dtype=np.int16).astype(np.float32) / 32767.0
@@ -1,14 +1,63 @@
 import gc
 import json
+import threading
 
 import numpy as np
-from bragi.adapters.stt import STTAdapter, Segment, TranscriptResult, Word
+from bragi.adapters.stt import (
+    RealtimeSession,
+    RealtimeUpdate,
+    STTAdapter,
+    Segment,
+    TranscriptResult,
+    Word,
+)
+
+
+def _words(result: dict) -> list[Word] | None:
+    if "result" not in result:
+        return None
+    return [Word(word=w["word"], start=w["start"], end=w["end"]) for w in result["result"]]
+
+
+class _VoskSession(RealtimeSession):
+
+    def __init__(self, adapter: "VoskAdapter", recognizer, word_timestamps: bool) -> None:
+        self._adapter = adapter
+        self._recognizer = recognizer
+        self._word_timestamps = word_timestamps
+        self._partial = ""
+
+    def accept(self, pcm: bytes) -> RealtimeUpdate | None:
+        if self._recognizer.AcceptWaveform(pcm):
+            self._partial = ""
+            return self._final(json.loads(self._recognizer.Result()))
+
+        partial = json.loads(self._recognizer.PartialResult()).get("partial", "")
+        if partial == self._partial:
+            return None
+        self._partial = partial
+        return RealtimeUpdate(text=partial, final=False)
+
+    def finish(self) -> RealtimeUpdate:
+        return self._final(json.loads(self._recognizer.FinalResult()))
+
+    def _final(self, result: dict) -> RealtimeUpdate:
+        words = _words(result) if self._word_timestamps else None
+        return RealtimeUpdate(text=result.get("text", ""), final=True, words=words)
+
+    def close(self) -> None:
+        if self._recognizer is not None:
+            self._adapter._release(self._recognizer)
+            self._recognizer = None
 
 
 class VoskAdapter(STTAdapter):
 
     def __init__(self) -> None:
         self._model = None
+        self._recognizers: list = []
+        self._pool_size = 1
+        self._lock = threading.Lock()
 
     @staticmethod
     def detect(config: dict) -> bool:
@@ -19,8 +68,12 @@ class VoskAdapter(STTAdapter):
 
         SetLogLevel(-1)
         self._model = Model(model_path=model_path)
+        self._pool_size = max(1, kwargs.get("concurrency") or 1) + max(0, kwargs.get("realtime_sessions") or 0)
+        self._recognizers = [self._new_recognizer() for _ in range(self._pool_size)]
 
     def unload(self) -> None:
+        with self._lock:
+            self._recognizers = []
         del self._model
         self._model = None
         gc.collect()
@@ -32,26 +85,18 @@ class VoskAdapter(STTAdapter):
         temperature: float,
         word_timestamps: bool,
     ) -> TranscriptResult:
-        from vosk import KaldiRecognizer
-
-        rec = KaldiRecognizer(self._model, 16000)
-        if word_timestamps:
-            rec.SetWords(True)
-
-        int16_data = (audio * 32767).clip(-32768, 32767).astype(np.int16).tobytes()
-        rec.AcceptWaveform(int16_data)
-        result = json.loads(rec.FinalResult())
+        rec = self._acquire(word_timestamps)
+        try:
+            int16_data = (audio * 32767).clip(-32768, 32767).astype(np.int16).tobytes()
+            rec.AcceptWaveform(int16_data)
+            result = json.loads(rec.FinalResult())
+        finally:
+            self._release(rec)
 
         text = result.get("text", "")
-        words = None
+        words = _words(result) if word_timestamps else None
         segments = None
 
-        if word_timestamps and "result" in result:
-            words = [
-                Word(word=w["word"], start=w["start"], end=w["end"])
-                for w in result["result"]
-            ]
-
         if text:
             duration = len(audio) / 16000
             segments = [Segment(id=0, start=0.0, end=duration, text=text)]
@@ -64,6 +109,28 @@ class VoskAdapter(STTAdapter):
             words=words,
         )
 
+    def open_realtime(self, language: str | None, word_timestamps: bool) -> RealtimeSession:
+        return _VoskSession(self, self._acquire(word_timestamps), word_timestamps)
+
+    def _new_recognizer(self):
+        from vosk import KaldiRecognizer
+
+        return KaldiRecognizer(self._model, 16000)
+
+    def _acquire(self, word_timestamps: bool):
+        with self._lock:
+            rec = self._recognizers.pop() if self._recognizers else None
+        if rec is None:
+            rec = self._new_recognizer()
+        rec.SetWords(word_timestamps)
+        return rec
+
+    def _release(self, rec) -> None:
+        rec.Reset()
+        with self._lock:
+            if self._model is not None and len(self._recognizers) < self._pool_size:
+                self._recognizers.append(rec)
+
     def translate(self, audio: np.ndarray, temperature: float) -> TranscriptResult:
         raise NotImplementedError("Vosk does not support translation")
 
@@ -79,5 +146,14 @@ class VoskAdapter(STTAdapter):
     def supports_translation(self) -> bool:
         return False
 
+    def max_window_seconds(self) -> float | None:
+        return 60.0
+
     def supports_streaming(self) -> bool:
         return True
+
+    def supports_realtime(self) -> bool:
+        return True
+
+    def is_thread_safe(self) -> bool:
+        return True
@@ -0,0 +1,184 @@
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import json
+import logging
+import shutil
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+
+import numpy as np
+
+logger = logging.getLogger("bragi.cache")
+
+_RESCAN_SECONDS = 30.0
+
+
+def _voice_dir(voice_key: str) -> str:
+    return hashlib.sha256(voice_key.encode()).hexdigest()[:16]
+
+
+def pack_audio(audio: np.ndarray, sample_rate: int) -> bytes:
+    return sample_rate.to_bytes(4, "little") + np.ascontiguousarray(audio, dtype=np.float32).tobytes()
+
+
+def unpack_audio(data: bytes) -> tuple[np.ndarray, int]:
+    return np.frombuffer(data, dtype=np.float32, offset=4), int.from_bytes(data[:4], "little")
+
+
+class SpeechCache:
+    def __init__(
+        self,
+        max_memory_bytes: int,
+        disk_dir: Path | None = None,
+        max_disk_bytes: int = 0,
+    ) -> None:
+        self._max_memory_bytes = max_memory_bytes
+        self._disk_dir = disk_dir if max_disk_bytes > 0 else None
+        self._max_disk_bytes = max_disk_bytes
+        self._memory: OrderedDict[str, tuple[str, bytes]] = OrderedDict()
+        self._memory_bytes = 0
+        self._disk: OrderedDict[Path, int] = OrderedDict()
+        self._disk_bytes = 0
+        self._scanned_at = 0.0
+        self._lock = threading.Lock()
+        self.memory_hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def make_key(alias: str, voice_key: str, text: str, speed: float) -> str:
+        payload = json.dumps([alias, voice_key, text, speed])
+        return hashlib.sha256(payload.encode()).hexdigest()
+
+    async def initialize(self) -> None:
+        if self._disk_dir is not None:
+            await asyncio.to_thread(self._scan_disk)
+
+    def _scan_disk(self) -> None:
+        self._disk_dir.mkdir(parents=True, exist_ok=True)
+        entries = []
+        for path in self._disk_dir.glob("*/*.bin"):
+            try:
+                stat = path.stat()
+            except FileNotFoundError:
+                continue
+            entries.append((stat.st_mtime, path, stat.st_size))
+        with self._lock:
+            self._disk = OrderedDict((path, size) for _, path, size in sorted(entries))
+            self._disk_bytes = sum(self._disk.values())
+            self._scanned_at = time.monotonic()
+            self._evict_disk()
+
+    def _disk_path(self, key: str, voice_key: str) -> Path:
+        return self._disk_dir / _voice_dir(voice_key) / f"{key}.bin"
+
+    async def get(self, key: str, voice_key: str) -> bytes | None:
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is not None:
+                self._memory.move_to_end(key)
+                self.memory_hits += 1
+                return entry[1]
+
+        if self._disk_dir is not None:
+            data = await asyncio.to_thread(self._read_disk, self._disk_path(key, voice_key))
+            if data is not None:
+                self.disk_hits += 1
+                self._put_memory(key, voice_key, data)
+                return data
+
+        self.misses += 1
+        return None
+
+    def _read_disk(self, path: Path) -> bytes | None:
+        try:
+            data = path.read_bytes()
+            path.touch()
+        except OSError:
+            with self._lock:
+                self._disk_bytes -= self._disk.pop(path, 0)
+            return None
+        with self._lock:
+            if path in self._disk:
+                self._disk.move_to_end(path)
+            else:
+                self._disk[path] = len(data)
+                self._disk_bytes += len(data)
+        return data
+
+    async def put(self, key: str, voice_key: str, data: bytes) -> None:
+        self._put_memory(key, voice_key, data)
+        if self._disk_dir is not None and len(data) <= self._max_disk_bytes:
+            await asyncio.to_thread(self._write_disk, self._disk_path(key, voice_key), data)
+
+    def _put_memory(self, key: str, voice_key: str, data: bytes) -> None:
+        if len(data) > self._max_memory_bytes:
+            return
+        with self._lock:
+            previous = self._memory.pop(key, None)
+            if previous is not None:
+                self._memory_bytes -= len(previous[1])
+            self._memory[key] = (voice_key, data)
+            self._memory_bytes += len(data)
+            while self._memory_bytes > self._max_memory_bytes:
+                _, (_, evicted) = self._memory.popitem(last=False)
+                self._memory_bytes -= len(evicted)
+
+    def _write_disk(self, path: Path, data: bytes) -> None:
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            tmp = path.with_suffix(".tmp")
+            tmp.write_bytes(data)
+            tmp.replace(path)
+        except OSError:
+            logger.warning("Failed to write speech cache entry %s", path, exc_info=True)
+            return
+        with self._lock:
+            self._disk_bytes -= self._disk.pop(path, 0)
+            self._disk[path] = len(data)
+            self._disk_bytes += len(data)
+            stale = (
+                self._disk_bytes > self._max_disk_bytes
+                or time.monotonic() - self._scanned_at > _RESCAN_SECONDS
+            )
+        if stale:
+            self._scan_disk()
+
+    def _evict_disk(self) -> None:
+        while self._disk_bytes > self._max_disk_bytes and self._disk:
+            path, size = self._disk.popitem(last=False)
+            self._disk_bytes -= size
+            path.unlink(missing_ok=True)
+
+    async def invalidate_voice(self, voice_key: str) -> None:
+        with self._lock:
+            stale = [k for k, (vk, _) in self._memory.items() if vk == voice_key]
+            for k in stale:
+                _, data = self._memory.pop(k)
+                self._memory_bytes -= len(data)
+
+        if self._disk_dir is not None:
+            await asyncio.to_thread(self._invalidate_disk, self._disk_dir / _voice_dir(voice_key))
+
+    def _invalidate_disk(self, voice_dir: Path) -> None:
+        with self._lock:
+            stale = [p for p in self._disk if p.parent == voice_dir]
+            for p in stale:
+                self._disk_bytes -= self._disk.pop(p)
+        shutil.rmtree(voice_dir, ignore_errors=True)
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "memory_hits": self.memory_hits,
+                "disk_hits": self.disk_hits,
+                "misses": self.misses,
+                "memory_entries": len(self._memory),
+                "memory_bytes": self._memory_bytes,
+                "disk_entries": len(self._disk),
+                "disk_bytes": self._disk_bytes,
+            }
@@ -42,3 +42,33 @@ def chunk_text(text: str, max_chars: int = MAX_CHUNK_CHARS) -> list[str]:
         chunks.append(current)
 
     return chunks if chunks else [text]
+
+
+class SentenceSegmenter:
+    def __init__(self, max_chars: int = MAX_CHUNK_CHARS) -> None:
+        self.max_chars = max_chars
+        self._buffer = ""
+
+    def push(self, text: str) -> list[str]:
+        self._buffer += text
+        chunks: list[str] = []
+
+        while True:
+            match = _SENTENCE_PATTERN.search(self._buffer)
+            if match is not None and match.start() <= self.max_chars:
+                sentence, self._buffer = self._buffer[: match.start()], self._buffer[match.end():]
+            elif len(self._buffer) > self.max_chars:
+                cut = self._buffer.rfind(" ", 0, self.max_chars + 1)
+                if cut <= 0:
+                    cut = self.max_chars
+                sentence, self._buffer = self._buffer[:cut], self._buffer[cut:].lstrip()
+            else:
+                break
+            if sentence.strip():
+                chunks.append(sentence.strip())
+
+        return chunks
+
+    def flush(self) -> list[str]:
+        text, self._buffer = self._buffer.strip(), ""
+        return chunk_text(text, self.max_chars) if text else []
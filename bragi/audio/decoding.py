@@ -1,6 +1,10 @@
+import asyncio
 import io
 import subprocess
 import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
 
 import numpy as np
 import soundfile as sf
@@ -8,8 +12,9 @@ import soxr
 
 TARGET_SAMPLE_RATE = 16000
 
-SOUNDFILE_FORMATS = {"wav", "flac", "ogg"}
-FFMPEG_FORMATS = {"mp3", "mp4", "m4a", "webm", "mpeg", "mpga"}
+SOUNDFILE_FORMATS = {"wav", "flac", "ogg", "mp3"}
+FFMPEG_FORMATS = {"mp4", "webm", "aac"}
+SEEKABLE_FORMATS = {"mp4"}
 SUPPORTED_FORMATS = SOUNDFILE_FORMATS | FFMPEG_FORMATS
 
 EXTENSION_MAP = {
@@ -18,12 +23,16 @@ EXTENSION_MAP = {
     "mp4": "mp4",
     "mpeg": "mp3",
     "mpga": "mp3",
-    "m4a": "m4a",
+    "m4a": "mp4",
     "ogg": "ogg",
     "wav": "wav",
     "webm": "webm",
 }
 
+_PROBE_SIZE = 64
+_MAX_MP4_PROBE_SIZE = 1024 * 1024
+_READ_SIZE = 64 * 1024
+
 
 def _get_format(filename: str | None) -> str | None:
     if not filename:
@@ -32,33 +41,81 @@ def _get_format(filename: str | None) -> str | None:
     return EXTENSION_MAP.get(ext)
 
 
+def sniff_format(head: bytes | bytearray) -> str | None:
+    if head[:4] == b"RIFF" and head[8:12] == b"WAVE":
+        return "wav"
+    if head[:4] == b"fLaC":
+        return "flac"
+    if head[:4] == b"OggS":
+        return "ogg"
+    if head[:3] == b"ID3":
+        return "mp3"
+    if head[4:8] == b"ftyp":
+        return "mp4"
+    if head[:4] == b"\x1a\x45\xdf\xa3":
+        return "webm"
+    if len(head) >= 2 and head[0] == 0xFF and head[1] & 0xE0 == 0xE0:
+        return "mp3" if head[1] & 0x06 else "aac"
+    return None
+
+
+def resolve_format(head: bytes | bytearray, filename: str | None = None) -> str | None:
+    return sniff_format(head) or _get_format(filename)
+
+
+def _ffmpeg_command(source: str, sample_rate: int = TARGET_SAMPLE_RATE) -> list[str]:
+    return [
+        "ffmpeg", "-hide_banner", "-loglevel", "error",
+        "-i", source,
+        "-f", "s16le",
+        "-acodec", "pcm_s16le",
+        "-ac", "1",
+        "-ar", str(sample_rate),
+        "pipe:1",
+    ]
+
+
+def _pcm_to_float(data: bytes) -> np.ndarray:
+    return np.frombuffer(data, dtype="<i2").astype(np.float32) / 32768.0
+
+
+def _mp4_streamable(data: bytes | bytearray) -> bool | None:
+    offset = 0
+    while offset + 8 <= len(data):
+        size = int.from_bytes(data[offset:offset + 4], "big")
+        box = bytes(data[offset + 4:offset + 8])
+        if box in (b"moov", b"moof"):
+            return True
+        if box == b"mdat":
+            return False
+        if size == 1:
+            if offset + 16 > len(data):
+                return None
+            size = int.from_bytes(data[offset + 8:offset + 16], "big")
+        if size < 8:
+            return False
+        offset += size
+    return None
+
+
 def _decode_soundfile(data: bytes) -> tuple[np.ndarray, int]:
     audio, sr = sf.read(io.BytesIO(data), dtype="float32")
     return audio, sr
 
 
-def _decode_ffmpeg(data: bytes, fmt: str) -> tuple[np.ndarray, int]:
-    with tempfile.NamedTemporaryFile(suffix=f".{fmt}", delete=True) as tmp:
-        tmp.write(data)
-        tmp.flush()
-
-        result = subprocess.run(
-            [
-                "ffmpeg", "-i", tmp.name,
-                "-f", "wav",
-                "-acodec", "pcm_s16le",
-                "-ac", "1",
-                "-ar", str(TARGET_SAMPLE_RATE),
-                "-y", "pipe:1",
-            ],
-            capture_output=True,
-        )
+def _decode_ffmpeg(data: bytes, fmt: str | None, sample_rate: int) -> tuple[np.ndarray, int]:
+    if fmt in SEEKABLE_FORMATS and not _mp4_streamable(data):
+        with tempfile.NamedTemporaryFile(suffix=f".{fmt}", delete=True) as tmp:
+            tmp.write(data)
+            tmp.flush()
+            result = subprocess.run(_ffmpeg_command(tmp.name, sample_rate), capture_output=True)
+    else:
+        result = subprocess.run(_ffmpeg_command("pipe:0", sample_rate), input=data, capture_output=True)
 
-        if result.returncode != 0:
-            raise RuntimeError(result.stderr.decode(errors="replace"))
+    if result.returncode != 0:
+        raise RuntimeError(result.stderr.decode(errors="replace"))
 
-        audio, sr = sf.read(io.BytesIO(result.stdout), dtype="float32")
-        return audio, sr
+    return _pcm_to_float(result.stdout), sample_rate
 
 
 def _to_mono(audio: np.ndarray) -> np.ndarray:
@@ -67,38 +124,275 @@ def _to_mono(audio: np.ndarray) -> np.ndarray:
     return audio
 
 
-def _resample(audio: np.ndarray, sr: int) -> np.ndarray:
-    if sr == TARGET_SAMPLE_RATE:
+def _resample(audio: np.ndarray, sr: int, target: int = TARGET_SAMPLE_RATE) -> np.ndarray:
+    if sr == target:
         return audio
-    return soxr.resample(audio, sr, TARGET_SAMPLE_RATE)
-
+    return soxr.resample(audio, sr, target)
 
-def decode_audio(data: bytes, filename: str | None = None) -> np.ndarray:
-    fmt = _get_format(filename)
-
-    if fmt and fmt not in SUPPORTED_FORMATS and fmt not in EXTENSION_MAP.values():
-        raise ValueError(
-            f"Unsupported audio format: {fmt}. "
-            f"Supported formats: {', '.join(sorted(SUPPORTED_FORMATS))}"
-        )
 
+def _decode(data: bytes, fmt: str | None, sample_rate: int = TARGET_SAMPLE_RATE) -> np.ndarray:
     audio = None
     sr = None
 
-    if fmt is None or fmt in SOUNDFILE_FORMATS:
+    if fmt in SOUNDFILE_FORMATS:
         try:
             audio, sr = _decode_soundfile(data)
         except Exception:
-            if fmt in SOUNDFILE_FORMATS:
-                raise
+            if fmt != "mp3":
+                raise ValueError(f"Failed to decode {fmt} audio")
 
     if audio is None:
-        ffmpeg_fmt = fmt or "mp3"
         try:
-            audio, sr = _decode_ffmpeg(data, ffmpeg_fmt)
+            audio, sr = _decode_ffmpeg(data, fmt, sample_rate)
         except Exception as e:
             raise ValueError(f"Failed to decode audio: {e}") from e
 
     audio = _to_mono(audio)
-    audio = _resample(audio, sr)
+    audio = _resample(audio, sr, sample_rate)
     return audio.astype(np.float32)
+
+
+def decode_audio(
+    data: bytes, filename: str | None = None, sample_rate: int = TARGET_SAMPLE_RATE
+) -> np.ndarray:
+    return _decode(data, resolve_format(data[:_PROBE_SIZE], filename), sample_rate)
+
+
+class _FormatStats:
+    def __init__(self) -> None:
+        self.count = 0
+        self.errors = 0
+        self.seconds = 0.0
+        self.audio_seconds = 0.0
+        self.bytes = 0
+
+
+class DecoderPool:
+    def __init__(self, max_workers: int = 4, stall_timeout: float = 10.0) -> None:
+        self.max_workers = max(1, max_workers)
+        self.stall_timeout = stall_timeout
+        self._pool = ThreadPoolExecutor(
+            max_workers=self.max_workers,
+            thread_name_prefix="bragi-decode",
+        )
+        self._processes = asyncio.Semaphore(self.max_workers)
+        self._stats: dict[str, _FormatStats] = {}
+        self._lock = threading.Lock()
+
+    def decoder(self, filename: str | None = None) -> "StreamingDecoder":
+        return StreamingDecoder(self, filename)
+
+    async def try_acquire(self) -> bool:
+        if self._processes.locked():
+            return False
+        await self._processes.acquire()
+        return True
+
+    async def acquire(self) -> None:
+        await self._processes.acquire()
+
+    def release(self) -> None:
+        self._processes.release()
+
+    async def run(self, fn, *args):
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._pool, fn, *args)
+
+    def record(self, fmt: str | None, seconds: float, size: int, audio: np.ndarray | None) -> None:
+        with self._lock:
+            stats = self._stats.setdefault(fmt or "unknown", _FormatStats())
+            stats.count += 1
+            stats.seconds += seconds
+            stats.bytes += size
+            if audio is None:
+                stats.errors += 1
+            else:
+                stats.audio_seconds += len(audio) / TARGET_SAMPLE_RATE
+
+    def stats(self) -> dict[str, dict]:
+        with self._lock:
+            return {
+                fmt: {
+                    "count": s.count,
+                    "errors": s.errors,
+                    "bytes": s.bytes,
+                    "decode_seconds": round(s.seconds, 3),
+                    "avg_decode_ms": round(s.seconds / s.count * 1000, 2) if s.count else 0.0,
+                    "audio_seconds": round(s.audio_seconds, 3),
+                }
+                for fmt, s in self._stats.items()
+            }
+
+    def shutdown(self) -> None:
+        self._pool.shutdown(wait=False, cancel_futures=True)
+
+
+class StreamingDecoder:
+    def __init__(self, pool: DecoderPool, filename: str | None = None) -> None:
+        self.filename = filename
+        self.format: str | None = None
+        self.bytes_received = 0
+        self.decode_seconds = 0.0
+        self._pool = pool
+        self._mode: str | None = None
+        self._head = bytearray()
+        self._buffer = bytearray()
+        self._spool = None
+        self._process: asyncio.subprocess.Process | None = None
+        self._holds_slot = False
+        self._reader: asyncio.Task | None = None
+        self._stderr: asyncio.Task | None = None
+        self._blocks: list[np.ndarray] = []
+
+    @property
+    def holds_slot(self) -> bool:
+        return self._holds_slot
+
+    @property
+    def decoded_samples(self) -> int:
+        return sum(len(block) for block in self._blocks)
+
+    def _choose_mode(self, final: bool) -> str | None:
+        if len(self._head) < _PROBE_SIZE and not final:
+            return None
+        fmt = self.format = resolve_format(self._head, self.filename)
+
+        if fmt in SOUNDFILE_FORMATS or (fmt is None and final):
+            return "buffer"
+
+        if fmt in SEEKABLE_FORMATS:
+            streamable = _mp4_streamable(self._head)
+            if streamable is None and not final and len(self._head) < _MAX_MP4_PROBE_SIZE:
+                return None
+            return "pipe" if streamable else "spool"
+
+        return "pipe"
+
+    async def feed(self, data: bytes) -> None:
+        self.bytes_received += len(data)
+        if self._mode is None:
+            self._head += data
+            mode = self._choose_mode(final=False)
+            if mode is None:
+                return
+            await self._start(mode)
+            data, self._head = bytes(self._head), bytearray()
+        await self._write(data)
+
+    async def _start(self, mode: str) -> None:
+        self._mode = mode
+        if mode == "pipe":
+            await self._try_spawn()
+        elif mode == "spool":
+            self._spool = tempfile.NamedTemporaryFile(suffix=f".{self.format or 'mp4'}")
+
+    async def _try_spawn(self) -> None:
+        if await self._pool.try_acquire():
+            self._holds_slot = True
+            await self._spawn("pipe:0")
+
+    async def _spawn(self, source: str) -> None:
+        if not self._holds_slot:
+            await self._pool.acquire()
+            self._holds_slot = True
+        self._process = await asyncio.create_subprocess_exec(
+            *_ffmpeg_command(source),
+            stdin=asyncio.subprocess.PIPE if source == "pipe:0" else asyncio.subprocess.DEVNULL,
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.PIPE,
+        )
+        self._reader = asyncio.create_task(self._read_pcm(self._process.stdout))
+        self._stderr = asyncio.create_task(self._process.stderr.read())
+
+    async def _read_pcm(self, stdout: asyncio.StreamReader) -> None:
+        remainder = b""
+        while chunk := await stdout.read(_READ_SIZE):
+            chunk = remainder + chunk
+            usable = len(chunk) - len(chunk) % 2
+            if usable:
+                self._blocks.append(_pcm_to_float(chunk[:usable]))
+            remainder = chunk[usable:]
+
+    async def _write(self, data: bytes) -> None:
+        if not data:
+            return
+        if self._mode == "buffer":
+            self._buffer += data
+        elif self._mode == "spool":
+            await asyncio.to_thread(self._spool.write, data)
+        else:
+            if self._process is None:
+                self._buffer += data
+                await self._try_spawn()
+                if self._process is None:
+                    return
+                data, self._buffer = bytes(self._buffer), bytearray()
+            try:
+                self._process.stdin.write(data)
+                await self._process.stdin.drain()
+            except (BrokenPipeError, ConnectionResetError):
+                raise await self._failure()
+
+    async def _failure(self) -> ValueError:
+        await self._process.wait()
+        stderr = (await self._stderr).decode(errors="replace").strip()
+        return ValueError(f"Failed to decode audio: {stderr or 'ffmpeg exited early'}")
+
+    async def finish(self) -> np.ndarray:
+        if self._mode is None:
+            if not self._head:
+                raise ValueError("Failed to decode audio: empty file")
+            await self._start(self._choose_mode(final=True))
+            data, self._head = bytes(self._head), bytearray()
+            await self._write(data)
+
+        started = time.perf_counter()
+        audio = None
+        try:
+            audio = await self._finish()
+            return audio
+        finally:
+            self.decode_seconds = time.perf_counter() - started
+            self._pool.record(self.format, self.decode_seconds, self.bytes_received, audio)
+            self.close()
+
+    async def _finish(self) -> np.ndarray:
+        if self._mode == "buffer":
+            return await self._pool.run(_decode, self._buffer, self.format)
+
+        if self._mode == "spool":
+            await asyncio.to_thread(self._spool.flush)
+            await self._spawn(self._spool.name)
+        else:
+            if self._process is None:
+                await self._spawn("pipe:0")
+                data, self._buffer = bytes(self._buffer), bytearray()
+                await self._write(data)
+            self._process.stdin.close()
+            try:
+                await self._process.stdin.wait_closed()
+            except (BrokenPipeError, ConnectionResetError):
+                pass
+
+        await self._reader
+        if await self._process.wait() != 0:
+            raise await self._failure()
+
+        if not self._blocks:
+            return np.zeros(0, dtype=np.float32)
+        return np.concatenate(self._blocks)
+
+    def close(self) -> None:
+        if self._process is not None and self._process.returncode is None:
+            self._process.kill()
+        for task in (self._reader, self._stderr):
+            if task is not None and not task.done():
+                task.cancel()
+        if self._holds_slot:
+            self._pool.release()
+            self._holds_slot = False
+        if self._spool is not None:
+            self._spool.close()
+            self._spool = None
+        self._buffer = bytearray()
+        self._blocks = []
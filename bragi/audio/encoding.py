@@ -1,4 +1,5 @@
 import io
+import struct
 
 import numpy as np
 import soundfile as sf
@@ -13,16 +14,27 @@ CONTENT_TYPES = {
 }
 
 
-def _encode_mp3(audio: np.ndarray, sample_rate: int) -> bytes:
+_STREAMING_SIZE = 0xFFFFFFFF
+
+
+def _to_int16(audio: np.ndarray) -> np.ndarray:
+    return (audio * 32767).clip(-32768, 32767).astype(np.int16)
+
+
+def _mp3_encoder(sample_rate: int):
     import lameenc
 
-    int16_audio = (audio * 32767).clip(-32768, 32767).astype(np.int16)
     encoder = lameenc.Encoder()
     encoder.set_bit_rate(128)
     encoder.set_in_sample_rate(sample_rate)
     encoder.set_channels(1)
     encoder.set_quality(2)
-    return bytes(encoder.encode(int16_audio.tobytes()) + encoder.flush())
+    return encoder
+
+
+def _encode_mp3(audio: np.ndarray, sample_rate: int) -> bytes:
+    encoder = _mp3_encoder(sample_rate)
+    return bytes(encoder.encode(_to_int16(audio).tobytes()) + encoder.flush())
 
 
 def _encode_wav(audio: np.ndarray, sample_rate: int) -> bytes:
@@ -32,8 +44,7 @@ def _encode_wav(audio: np.ndarray, sample_rate: int) -> bytes:
 
 
 def _encode_pcm(audio: np.ndarray, sample_rate: int) -> bytes:
-    int16_audio = (audio * 32767).clip(-32768, 32767).astype(np.int16)
-    return int16_audio.tobytes()
+    return _to_int16(audio).tobytes()
 
 
 def _encode_flac(audio: np.ndarray, sample_rate: int) -> bytes:
@@ -68,3 +79,119 @@ def encode_audio(
         )
     content_type = CONTENT_TYPES[format]
     return encoder(audio, sample_rate), content_type
+
+
+def wav_header(sample_rate: int, data_size: int | None = None) -> bytes:
+    riff_size = _STREAMING_SIZE if data_size is None else data_size + 36
+    return (
+        b"RIFF" + struct.pack("<I", riff_size) + b"WAVE"
+        + b"fmt " + struct.pack("<IHHIIHH", 16, 1, 1, sample_rate, sample_rate * 2, 2, 16)
+        + b"data" + struct.pack("<I", _STREAMING_SIZE if data_size is None else data_size)
+    )
+
+
+class _PcmStream:
+    def __init__(self, sample_rate: int) -> None:
+        self.sample_rate = sample_rate
+
+    def encode(self, audio: np.ndarray) -> bytes:
+        return _encode_pcm(audio, self.sample_rate)
+
+    def flush(self) -> bytes:
+        return b""
+
+
+class _WavStream(_PcmStream):
+    def __init__(self, sample_rate: int) -> None:
+        super().__init__(sample_rate)
+        self._header = wav_header(sample_rate)
+
+    def encode(self, audio: np.ndarray) -> bytes:
+        header, self._header = self._header, b""
+        return header + _encode_pcm(audio, self.sample_rate)
+
+    def flush(self) -> bytes:
+        header, self._header = self._header, b""
+        return header
+
+
+class _Mp3Stream:
+    def __init__(self, sample_rate: int) -> None:
+        self._encoder = _mp3_encoder(sample_rate)
+
+    def encode(self, audio: np.ndarray) -> bytes:
+        return bytes(self._encoder.encode(_to_int16(audio).tobytes()))
+
+    def flush(self) -> bytes:
+        return bytes(self._encoder.flush())
+
+
+_STREAM_ENCODERS = {
+    "mp3": _Mp3Stream,
+    "wav": _WavStream,
+    "pcm": _PcmStream,
+}
+
+
+class StreamEncoder:
+    def __init__(self, format: str) -> None:
+        if format not in _STREAM_ENCODERS:
+            raise ValueError(
+                f"Unsupported streaming output format: {format}. "
+                f"Supported formats: {', '.join(sorted(_STREAM_ENCODERS.keys()))}"
+            )
+        self.format = format
+        self.content_type = CONTENT_TYPES[format]
+        self.sample_rate: int | None = None
+        self._stream = None
+
+    def encode(self, audio: np.ndarray, sample_rate: int) -> bytes:
+        if self._stream is None:
+            self.sample_rate = sample_rate
+            self._stream = _STREAM_ENCODERS[self.format](sample_rate)
+        elif sample_rate != self.sample_rate:
+            raise ValueError(f"Sample rate changed mid-stream: {self.sample_rate} -> {sample_rate}")
+        return self._stream.encode(audio)
+
+    def flush(self) -> bytes:
+        if self._stream is None:
+            return b""
+        stream, self._stream = self._stream, None
+        return stream.flush()
+
+
+class ChunkEncoder:
+    def __init__(self, format: str) -> None:
+        if format not in _ENCODERS:
+            raise ValueError(
+                f"Unsupported output format: {format}. "
+                f"Supported formats: {', '.join(sorted(_ENCODERS.keys()))}"
+            )
+        self.format = format
+        self.content_type = CONTENT_TYPES[format]
+        self.sample_rate: int | None = None
+        self._stream = None
+        if format in _STREAM_ENCODERS:
+            self._stream = StreamEncoder("pcm" if format == "wav" else format)
+        self._parts: list[bytes] = []
+        self._audio: list[np.ndarray] = []
+
+    def add(self, audio: np.ndarray, sample_rate: int) -> None:
+        if self._stream is not None:
+            self._parts.append(self._stream.encode(audio, sample_rate))
+        elif self.sample_rate is not None and sample_rate != self.sample_rate:
+            raise ValueError(f"Sample rate changed mid-stream: {self.sample_rate} -> {sample_rate}")
+        else:
+            self._audio.append(audio)
+        self.sample_rate = sample_rate
+
+    def finish(self) -> bytes:
+        if self.sample_rate is None:
+            raise ValueError("No audio to encode")
+        if self._stream is None:
+            return _ENCODERS[self.format](np.concatenate(self._audio), self.sample_rate)
+        self._parts.append(self._stream.flush())
+        data = b"".join(self._parts)
+        if self.format == "wav":
+            return wav_header(self.sample_rate, len(data)) + data
+        return data
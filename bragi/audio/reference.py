@@ -0,0 +1,35 @@
+import numpy as np
+
+from bragi.audio.decoding import decode_audio
+
+DEFAULT_REFERENCE_SAMPLE_RATE = 24000
+
+_FRAME_SECONDS = 0.01
+_PAD_SECONDS = 0.05
+_SILENCE_DB = -40.0
+
+
+def trim_silence(audio: np.ndarray, sample_rate: int, threshold_db: float = _SILENCE_DB) -> np.ndarray:
+    frame = max(1, int(sample_rate * _FRAME_SECONDS))
+    frames = len(audio) // frame
+    if frames == 0:
+        return audio
+
+    rms = np.sqrt(np.mean(audio[: frames * frame].reshape(frames, frame) ** 2, axis=1))
+    peak = rms.max()
+    if peak <= 0:
+        raise ValueError("Reference audio is silent")
+
+    voiced = np.flatnonzero(rms >= peak * 10 ** (threshold_db / 20))
+    pad = int(sample_rate * _PAD_SECONDS)
+    start = max(0, voiced[0] * frame - pad)
+    end = min(len(audio), (voiced[-1] + 1) * frame + pad)
+    return audio[start:end]
+
+
+def prepare_reference(data: bytes, filename: str | None, sample_rate: int) -> np.ndarray:
+    audio = decode_audio(data, filename, sample_rate=sample_rate)
+    if len(audio) == 0:
+        raise ValueError("Reference audio is empty")
+    audio = trim_silence(audio, sample_rate)
+    return np.ascontiguousarray(audio, dtype=np.float32)
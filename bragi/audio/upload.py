@@ -0,0 +1,234 @@
+from __future__ import annotations
+
+import asyncio
+from dataclasses import dataclass, field
+from typing import Callable
+
+import numpy as np
+from fastapi import Request
+from python_multipart.exceptions import FormParserError
+from python_multipart.multipart import MultipartParser, parse_options_header
+
+from bragi.audio.decoding import TARGET_SAMPLE_RATE, DecoderPool, StreamingDecoder
+from bragi.config import parse_file_size
+from bragi.metrics import request_timings
+from bragi.schemas.errors import FileTooLargeError, InvalidFileFormatError, InvalidRequestError, UploadStalledError
+
+_MAX_FIELD_SIZE = 64 * 1024
+_MAX_FIELDS_SIZE = 1024 * 1024
+_TRUE_VALUES = {"1", "true", "yes", "on"}
+_FALSE_VALUES = {"0", "false", "no", "off"}
+
+
+@dataclass
+class AudioUpload:
+    audio: np.ndarray
+    filename: str | None
+    fields: dict[str, list[str]] = field(default_factory=dict)
+
+    def get(self, name: str, default: str | None = None) -> str | None:
+        values = self.fields.get(name)
+        return values[-1] if values else default
+
+    def require(self, name: str) -> str:
+        value = self.get(name)
+        if not value:
+            raise InvalidRequestError(f"Missing required parameter: '{name}'.", param=name)
+        return value
+
+    def get_list(self, name: str) -> list[str]:
+        return self.fields.get(name, [])
+
+    def get_float(self, name: str, default: float) -> float:
+        value = self.get(name)
+        if value is None or value == "":
+            return default
+        try:
+            return float(value)
+        except ValueError:
+            raise InvalidRequestError(f"Invalid value for '{name}': expected a number.", param=name)
+
+    def get_bool(self, name: str, default: bool) -> bool:
+        value = self.get(name)
+        if value is None or value == "":
+            return default
+        if value.lower() in _TRUE_VALUES:
+            return True
+        if value.lower() in _FALSE_VALUES:
+            return False
+        raise InvalidRequestError(f"Invalid value for '{name}': expected a boolean.", param=name)
+
+
+@dataclass
+class _Part:
+    name: str = ""
+    filename: str | None = None
+    disposition: bytes = b""
+    data: bytearray = field(default_factory=bytearray)
+
+
+class _UploadParser:
+    def __init__(self, boundary: bytes, file_field: str, decoder_pool: DecoderPool) -> None:
+        self.file_field = file_field
+        self.decoder_pool = decoder_pool
+        self.fields: dict[str, list[str]] = {}
+        self.decoder: StreamingDecoder | None = None
+        self.file_chunks: list[bytes] = []
+        self.fields_size = 0
+        self._part = _Part()
+        self._header_name = b""
+        self._header_value = b""
+        self._parser = MultipartParser(
+            boundary,
+            {
+                "on_part_begin": self._on_part_begin,
+                "on_part_data": self._on_part_data,
+                "on_part_end": self._on_part_end,
+                "on_header_field": self._on_header_field,
+                "on_header_value": self._on_header_value,
+                "on_header_end": self._on_header_end,
+                "on_headers_finished": self._on_headers_finished,
+            },
+        )
+
+    def write(self, chunk: bytes) -> None:
+        self._parser.write(chunk)
+
+    def finalize(self) -> None:
+        self._parser.finalize()
+
+    def _is_file(self) -> bool:
+        return self._part.name == self.file_field
+
+    def _on_part_begin(self) -> None:
+        self._part = _Part()
+
+    def _on_header_field(self, data: bytes, start: int, end: int) -> None:
+        self._header_name += data[start:end]
+
+    def _on_header_value(self, data: bytes, start: int, end: int) -> None:
+        self._header_value += data[start:end]
+
+    def _on_header_end(self) -> None:
+        if self._header_name.lower() == b"content-disposition":
+            self._part.disposition = self._header_value
+        self._header_name = b""
+        self._header_value = b""
+
+    def _on_headers_finished(self) -> None:
+        _, options = parse_options_header(self._part.disposition)
+        self._part.name = options.get(b"name", b"").decode(errors="replace")
+        if b"filename" in options:
+            self._part.filename = options[b"filename"].decode(errors="replace")
+        if self._is_file():
+            if self.decoder is not None:
+                raise InvalidRequestError(f"Only one '{self.file_field}' may be uploaded.", param=self.file_field)
+            self.decoder = self.decoder_pool.decoder(self._part.filename)
+
+    def _on_part_data(self, data: bytes, start: int, end: int) -> None:
+        if self._is_file():
+            self.file_chunks.append(data[start:end])
+            return
+        if self._part.filename is not None:
+            return
+
+        size = end - start
+        self.fields_size += size
+        if len(self._part.data) + size > _MAX_FIELD_SIZE or self.fields_size > _MAX_FIELDS_SIZE:
+            raise InvalidRequestError(f"Form field '{self._part.name}' is too large.", param=self._part.name)
+        self._part.data += data[start:end]
+
+    def _on_part_end(self) -> None:
+        if self._is_file() or self._part.filename is not None:
+            return
+        self.fields.setdefault(self._part.name, []).append(self._part.data.decode(errors="replace"))
+
+
+async def receive_audio_upload(
+    request: Request,
+    max_file_size: str,
+    decoder_pool: DecoderPool,
+    file_field: str = "file",
+    validate: Callable[[AudioUpload], None] | None = None,
+) -> AudioUpload:
+    content_type, params = parse_options_header(request.headers.get("content-type", ""))
+    boundary = params.get(b"boundary")
+    if content_type != b"multipart/form-data" or not boundary:
+        raise InvalidRequestError("Expected a multipart/form-data request body.")
+
+    max_size = parse_file_size(max_file_size)
+    content_length = request.headers.get("content-length")
+    if content_length and content_length.isdigit() and int(content_length) > max_size + _MAX_FIELDS_SIZE:
+        raise FileTooLargeError(max_file_size)
+
+    parser = _UploadParser(boundary, file_field, decoder_pool)
+    try:
+        stream = request.stream()
+        while True:
+            holding = parser.decoder is not None and parser.decoder.holds_slot
+            timeout = decoder_pool.stall_timeout if holding else None
+            try:
+                chunk = await asyncio.wait_for(anext(stream), timeout)
+            except StopAsyncIteration:
+                break
+            except asyncio.TimeoutError:
+                raise UploadStalledError(decoder_pool.stall_timeout)
+            parser.write(chunk)
+            await _feed(parser, max_size, max_file_size)
+        parser.finalize()
+        await _feed(parser, max_size, max_file_size)
+
+        if parser.decoder is None or parser.decoder.bytes_received == 0:
+            raise InvalidRequestError(f"Missing required parameter: '{file_field}'.", param=file_field)
+
+        upload = AudioUpload(
+            audio=np.zeros(0, dtype=np.float32), filename=parser.decoder.filename, fields=parser.fields
+        )
+        if validate is not None:
+            validate(upload)
+
+        timings = request_timings(request)
+        try:
+            upload.audio = await parser.decoder.finish()
+        except ValueError:
+            raise InvalidFileFormatError()
+        finally:
+            timings.add("decode", parser.decoder.decode_seconds)
+        timings.audio_seconds = len(upload.audio) / TARGET_SAMPLE_RATE
+    except FormParserError:
+        raise InvalidRequestError("Invalid multipart request body.")
+    finally:
+        if parser.decoder is not None:
+            parser.decoder.close()
+
+    return upload
+
+
+async def _feed(parser: _UploadParser, max_size: int, max_file_size: str) -> None:
+    if not parser.file_chunks:
+        return
+    chunks, parser.file_chunks = parser.file_chunks, []
+    for chunk in chunks:
+        if parser.decoder.bytes_received + len(chunk) > max_size:
+            raise FileTooLargeError(max_file_size)
+        try:
+            await parser.decoder.feed(chunk)
+        except ValueError:
+            raise InvalidFileFormatError()
+
+
+def multipart_openapi(properties: dict[str, dict], required: list[str]) -> dict:
+    return {
+        "requestBody": {
+            "required": True,
+            "content": {
+                "multipart/form-data": {
+                    "schema": {
+                        "type": "object",
+                        "properties": properties,
+                        "required": required,
+                    }
+                }
+            },
+        }
+    }
@@ -0,0 +1,129 @@
+from __future__ import annotations
+
+import asyncio
+from dataclasses import dataclass
+from typing import Callable
+
+import numpy as np
+
+from bragi.adapters.stt import STTAdapter, TranscriptResult
+from bragi.executor import ModelExecutor, inference_recorder, record_inference
+
+_BatchKey = tuple[str | None, float, bool]
+
+
+@dataclass
+class _PendingTranscription:
+    audio: np.ndarray
+    future: asyncio.Future
+    record: Callable[[float], None] | None = None
+
+
+class BatchScheduler:
+    def __init__(
+        self,
+        adapter: STTAdapter,
+        executor: ModelExecutor,
+        max_batch_size: int = 1,
+        max_wait_ms: float = 0.0,
+    ) -> None:
+        self._adapter = adapter
+        self._executor = executor
+        self.max_batch_size = max_batch_size if adapter.supports_batching() else 1
+        self.max_wait = max(0.0, max_wait_ms) / 1000.0
+        self._slots = asyncio.Semaphore(executor.max_workers)
+        self._queues: dict[_BatchKey, list[_PendingTranscription]] = {}
+        self._timers: dict[_BatchKey, asyncio.TimerHandle] = {}
+        self._dispatching: set[_BatchKey] = set()
+        self._tasks: set[asyncio.Task] = set()
+
+    @property
+    def batching(self) -> bool:
+        return self.max_batch_size > 1
+
+    def queued(self) -> int:
+        return sum(len(queue) for queue in self._queues.values())
+
+    async def transcribe(
+        self,
+        audio: np.ndarray,
+        language: str | None,
+        temperature: float,
+        word_timestamps: bool,
+        timestamps: bool = True,
+    ) -> TranscriptResult:
+        if not self.batching or not self._adapter.can_batch(audio, word_timestamps, timestamps):
+            return await self._executor.run(
+                self._adapter.transcribe_request,
+                audio=audio,
+                language=language,
+                temperature=temperature,
+                word_timestamps=word_timestamps,
+                timestamps=timestamps,
+            )
+
+        loop = asyncio.get_running_loop()
+        key: _BatchKey = (language, temperature, word_timestamps)
+        pending = _PendingTranscription(audio=audio, future=loop.create_future(), record=inference_recorder())
+        queue = self._queues.setdefault(key, [])
+        queue.append(pending)
+
+        if len(queue) >= self.max_batch_size:
+            self._schedule(key)
+        elif key not in self._timers:
+            self._timers[key] = loop.call_later(self.max_wait, self._schedule, key)
+
+        return await pending.future
+
+    def _schedule(self, key: _BatchKey) -> None:
+        timer = self._timers.pop(key, None)
+        if timer is not None:
+            timer.cancel()
+        if key in self._dispatching:
+            return
+
+        self._dispatching.add(key)
+        task = asyncio.get_running_loop().create_task(self._dispatch(key))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _dispatch(self, key: _BatchKey) -> None:
+        async with self._slots:
+            self._dispatching.discard(key)
+
+            queue = self._queues.get(key, [])
+            batch = [p for p in queue[: self.max_batch_size] if not p.future.done()]
+            del queue[: self.max_batch_size]
+            if queue:
+                self._schedule(key)
+            else:
+                self._queues.pop(key, None)
+
+            if batch:
+                await self._run(key, batch)
+
+    async def _run(self, key: _BatchKey, batch: list[_PendingTranscription]) -> None:
+        language, temperature, word_timestamps = key
+        spent: list[float] = []
+        try:
+            with record_inference(spent.append):
+                results = await self._executor.run(
+                    self._adapter.transcribe_batch,
+                    audios=[p.audio for p in batch],
+                    language=language,
+                    temperature=temperature,
+                    word_timestamps=word_timestamps,
+                )
+        except Exception as e:
+            for p in batch:
+                if not p.future.done():
+                    p.future.set_exception(e)
+            return
+        finally:
+            for p in batch:
+                if p.record is not None and spent:
+                    p.record(sum(spent))
+
+        for p, result in zip(batch, results):
+            if not p.future.done():
+                p.future.set_result(result)
@@ -0,0 +1,121 @@
+import logging
+
+from bragi.adapters.faster_whisper import FasterWhisperAdapter
+from bragi.adapters.kokoro import KokoroAdapter
+from bragi.adapters.stt import STTAdapter
+from bragi.config import BragiConfig, parse_file_size
+from bragi.registry import ModelInfo, ModelRegistry
+
+_optional_adapters: list[type] = []
+
+try:
+    from bragi.adapters.vosk_adapter import VoskAdapter
+    _optional_adapters.append(VoskAdapter)
+except ImportError:
+    pass
+
+try:
+    from bragi.adapters.paraformer import ParaformerAdapter
+    _optional_adapters.append(ParaformerAdapter)
+except ImportError:
+    pass
+
+try:
+    from bragi.adapters.moonshine import MoonshineAdapter
+    _optional_adapters.append(MoonshineAdapter)
+except ImportError:
+    pass
+
+try:
+    from bragi.adapters.speechbrain_adapter import SpeechBrainAdapter
+    _optional_adapters.append(SpeechBrainAdapter)
+except ImportError:
+    pass
+
+try:
+    from bragi.adapters.parakeet import ParakeetAdapter
+    _optional_adapters.append(ParakeetAdapter)
+except ImportError:
+    pass
+
+try:
+    from bragi.adapters.piper import PiperAdapter
+    _optional_adapters.append(PiperAdapter)
+except ImportError:
+    pass
+
+try:
+    from bragi.adapters.coqui_xtts import CoquiXTTSAdapter
+    _optional_adapters.append(CoquiXTTSAdapter)
+except ImportError:
+    pass
+
+try:
+    from bragi.adapters.f5_tts import F5TTSAdapter
+    _optional_adapters.append(F5TTSAdapter)
+except ImportError:
+    pass
+
+try:
+    from bragi.adapters.fish_speech import FishSpeechAdapter
+    _optional_adapters.append(FishSpeechAdapter)
+except ImportError:
+    pass
+
+try:
+    from bragi.adapters.qwen3_tts import Qwen3TTSAdapter
+    _optional_adapters.append(Qwen3TTSAdapter)
+except ImportError:
+    pass
+
+logger = logging.getLogger("bragi")
+
+
+def build_registry(config: BragiConfig) -> ModelRegistry:
+    registry = ModelRegistry(
+        model_ttl=config.model_ttl,
+        memory_budget=parse_file_size(config.model_memory_budget) if config.model_memory_budget else 0,
+        max_loaded_models=config.max_loaded_models,
+    )
+
+    adapter_classes: list[type] = [FasterWhisperAdapter, KokoroAdapter] + _optional_adapters
+
+    for alias, model_config in config.models.items():
+        cfg = {"repo": model_config.repo}
+
+        matched = None
+        for cls in adapter_classes:
+            if cls.detect(cfg):
+                matched = cls
+                break
+
+        if matched is None:
+            logger.warning("No adapter for model '%s' (repo: %s)", alias, model_config.repo)
+            continue
+
+        adapter = matched()
+        device = model_config.device if model_config.device != "auto" else config.device
+
+        info = ModelInfo(
+            alias=alias,
+            model_type="stt" if isinstance(adapter, STTAdapter) else "tts",
+            repo=model_config.repo,
+            device=device,
+            status="unloaded",
+        )
+
+        if isinstance(adapter, STTAdapter):
+            registry.register_stt(alias, adapter, info, model_config)
+        else:
+            registry.register_tts(alias, adapter, info, model_config)
+
+    return registry
+
+
+async def start_registry(registry: ModelRegistry, config: BragiConfig) -> None:
+    if config.background_loading:
+        registry.start_loading(config.load_concurrency)
+    else:
+        await registry.load_models(config.load_concurrency)
+
+    registry.start_reaper()
@@ -3,7 +3,7 @@ from __future__ import annotations
 import os
 import re
 from pathlib import Path
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, Callable
 
 import yaml
 from pydantic import BaseModel
@@ -18,12 +18,29 @@ class ServerConfig(BaseModel):
     log_level: str = "info"
     max_file_size: str = "25MB"
     workers: int = 1
+    decode_workers: int = 4
+    decode_stall_timeout: float = 10.0
+    model_server: str | None = None
+    model_server_key: str | None = None
 
 
 class ModelConfig(BaseModel):
     repo: str
     device: str = "auto"
     compute_type: str | None = None
+    concurrency: int = 1
+    batch_size: int = 1
+    batch_wait_ms: int = 10
+    realtime_sessions: int = 4
+    memory: str | None = None
+    window_seconds: float | None = None
+
+
+class SpeechCacheConfig(BaseModel):
+    enabled: bool = False
+    memory_size: str = "64MB"
+    disk_size: str | None = None
+    dir: str | None = None
 
 
 class BragiConfig(BaseModel):
@@ -33,8 +50,13 @@ class BragiConfig(BaseModel):
     models: dict[str, ModelConfig] = {}
     model_cache_dir: str = "/models"
     model_ttl: int = 0
+    model_memory_budget: str | None = None
+    max_loaded_models: int = 0
+    load_concurrency: int = 2
+    background_loading: bool = False
     voice_store_dir: str | None = None
     key_store_dir: str | None = None
+    speech_cache: SpeechCacheConfig = SpeechCacheConfig()
 
 
 _SIZE_UNITS: dict[str, int] = {
@@ -57,6 +79,10 @@ def parse_file_size(size_str: str) -> int:
     return int(value * _SIZE_UNITS[unit])
 
 
+def _parse_bool(value: str) -> bool:
+    return value.strip().lower() in ("1", "true", "yes", "on")
+
+
 def load_config() -> BragiConfig:
     config_path = Path(os.environ.get("BRAGI_CONFIG", "/etc/bragi/config.yaml"))
 
@@ -65,7 +91,7 @@ def load_config() -> BragiConfig:
         with open(config_path) as f:
             data = yaml.safe_load(f) or {}
 
-    env_overrides: dict[str, tuple[list[str], type]] = {
+    env_overrides: dict[str, tuple[list[str], Callable[[str], object]]] = {
         "HF_TOKEN": (["hf_token"], str),
         "BRAGI_HOST": (["server", "host"], str),
         "BRAGI_PORT": (["server", "port"], int),
@@ -74,9 +100,20 @@ def load_config() -> BragiConfig:
         "BRAGI_LOG_LEVEL": (["server", "log_level"], str),
         "BRAGI_MAX_FILE_SIZE": (["server", "max_file_size"], str),
         "BRAGI_WORKERS": (["server", "workers"], int),
+        "BRAGI_DECODE_WORKERS": (["server", "decode_workers"], int),
+        "BRAGI_DECODE_STALL_TIMEOUT": (["server", "decode_stall_timeout"], float),
+        "BRAGI_MODEL_SERVER": (["server", "model_server"], str),
+        "BRAGI_MODEL_SERVER_KEY": (["server", "model_server_key"], str),
         "BRAGI_MODEL_TTL": (["model_ttl"], int),
+        "BRAGI_MODEL_MEMORY_BUDGET": (["model_memory_budget"], str),
+        "BRAGI_MAX_LOADED_MODELS": (["max_loaded_models"], int),
+        "BRAGI_LOAD_CONCURRENCY": (["load_concurrency"], int),
+        "BRAGI_BACKGROUND_LOADING": (["background_loading"], _parse_bool),
         "BRAGI_VOICE_STORE_DIR": (["voice_store_dir"], str),
         "BRAGI_KEY_STORE_DIR": (["key_store_dir"], str),
+        "BRAGI_SPEECH_CACHE": (["speech_cache", "enabled"], _parse_bool),
+        "BRAGI_SPEECH_CACHE_MEMORY": (["speech_cache", "memory_size"], str),
+        "BRAGI_SPEECH_CACHE_DISK": (["speech_cache", "disk_size"], str),
     }
 
     for env_var, (key_path, cast) in env_overrides.items():
@@ -0,0 +1,83 @@
+from __future__ import annotations
+
+import asyncio
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, AsyncIterator, Callable, Iterable, Iterator, TypeVar
+
+T = TypeVar("T")
+
+_DONE = object()
+
+_recorder: ContextVar[Callable[[float], None] | None] = ContextVar("bragi_inference_recorder", default=None)
+
+
+def inference_recorder() -> Callable[[float], None] | None:
+    return _recorder.get()
+
+
+@contextmanager
+def record_inference(callback: Callable[[float], None] | None) -> Iterator[None]:
+    token = _recorder.set(callback)
+    try:
+        yield
+    finally:
+        _recorder.reset(token)
+
+
+class ModelExecutor:
+    def __init__(self, alias: str, max_workers: int = 1) -> None:
+        self.alias = alias
+        self.max_workers = max(1, max_workers)
+        self._submitted = 0
+        self._pool = ThreadPoolExecutor(
+            max_workers=self.max_workers,
+            thread_name_prefix=f"bragi-{alias}",
+        )
+
+    async def run(self, fn: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+        loop = asyncio.get_running_loop()
+        record = _recorder.get()
+        elapsed = 0.0
+
+        def call() -> T:
+            nonlocal elapsed
+            started = time.perf_counter()
+            try:
+                return fn(*args, **kwargs)
+            finally:
+                elapsed = time.perf_counter() - started
+
+        self._submitted += 1
+        try:
+            return await loop.run_in_executor(self._pool, call)
+        finally:
+            self._submitted -= 1
+            if record is not None and elapsed:
+                record(elapsed)
+
+    def queued(self) -> int:
+        return max(0, self._submitted - self.max_workers)
+
+    async def iterate(
+        self, fn: Callable[..., Iterable[T]], *args: Any, **kwargs: Any
+    ) -> AsyncIterator[T]:
+        iterator = await self.run(lambda: iter(fn(*args, **kwargs)))
+        try:
+            while True:
+                item = await self.run(next, iterator, _DONE)
+                if item is _DONE:
+                    break
+                yield item
+        finally:
+            close = getattr(iterator, "close", None)
+            if close is not None:
+                try:
+                    self._pool.submit(close)
+                except RuntimeError:
+                    pass
+
+    def shutdown(self, wait: bool = True) -> None:
+        self._pool.shutdown(wait=wait, cancel_futures=True)
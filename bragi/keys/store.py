@@ -1,7 +1,10 @@
 from __future__ import annotations
 
+import asyncio
 import hashlib
+import logging
 import secrets
+import time
 import uuid
 from dataclasses import dataclass
 from datetime import datetime, timezone
@@ -13,6 +16,8 @@ _KEY_PREFIX = "br-"
 _TOKEN_BYTES = 32
 _DISPLAY_PREFIX_LEN = 8
 
+logger = logging.getLogger("bragi.keys")
+
 
 def _generate_raw_key() -> str:
     return _KEY_PREFIX + secrets.token_hex(_TOKEN_BYTES)
@@ -33,10 +38,30 @@ class StoredKey:
     is_active: bool
 
 
+def _row_to_key(row: aiosqlite.Row) -> StoredKey:
+    r = dict(row)
+    r["is_active"] = bool(r["is_active"])
+    return StoredKey(**r)
+
+
 class KeyStore:
-    def __init__(self, db_path: Path) -> None:
+    def __init__(
+        self,
+        db_path: Path,
+        cache_ttl: float = 60.0,
+        flush_interval: float = 5.0,
+        revocation_interval: float = 1.0,
+    ) -> None:
         self._db_path = db_path
         self._db: aiosqlite.Connection | None = None
+        self._cache_ttl = cache_ttl
+        self._flush_interval = flush_interval
+        self._revocation_interval = revocation_interval
+        self._cache: dict[str, tuple[StoredKey, float]] = {}
+        self._data_version: int | None = None
+        self._checked_at = 0.0
+        self._last_used: dict[str, str] = {}
+        self._flusher: asyncio.Task | None = None
 
     async def initialize(self) -> None:
         self._db_path.parent.mkdir(parents=True, exist_ok=True)
@@ -54,11 +79,17 @@ class KeyStore:
             )"""
         )
         await self._db.commit()
+        self._flusher = asyncio.get_running_loop().create_task(self._flush_periodically())
 
     async def close(self) -> None:
+        if self._flusher is not None:
+            self._flusher.cancel()
+            self._flusher = None
         if self._db:
+            await self.flush()
             await self._db.close()
             self._db = None
+        self._cache.clear()
 
     async def create(self, name: str) -> tuple[StoredKey, str]:
         raw_key = _generate_raw_key()
@@ -86,8 +117,30 @@ class KeyStore:
         )
         return stored, raw_key
 
+    async def _sync_revocations(self) -> None:
+        now = time.monotonic()
+        if now - self._checked_at < self._revocation_interval:
+            return
+        self._checked_at = now
+
+        assert self._db is not None
+        async with self._db.execute("PRAGMA data_version") as cursor:
+            (version,) = await cursor.fetchone()
+        if version != self._data_version:
+            self._data_version = version
+            self._cache.clear()
+
     async def validate(self, raw_key: str) -> StoredKey | None:
         key_hash = _hash_key(raw_key)
+        if self._cache:
+            await self._sync_revocations()
+        cached = self._cache.get(key_hash)
+        if cached is not None:
+            stored, expires = cached
+            if time.monotonic() < expires:
+                return stored
+            del self._cache[key_hash]
+
         assert self._db is not None
         async with self._db.execute(
             "SELECT * FROM keys WHERE key_hash = ? AND is_active = 1", (key_hash,)
@@ -95,9 +148,10 @@ class KeyStore:
             row = await cursor.fetchone()
             if row is None:
                 return None
-            r = dict(row)
-            r["is_active"] = bool(r["is_active"])
-            return StoredKey(**r)
+            stored = _row_to_key(row)
+
+        self._cache[key_hash] = (stored, time.monotonic() + self._cache_ttl)
+        return stored
 
     async def get_by_id(self, key_id: str) -> StoredKey | None:
         assert self._db is not None
@@ -105,20 +159,13 @@ class KeyStore:
             row = await cursor.fetchone()
             if row is None:
                 return None
-            r = dict(row)
-            r["is_active"] = bool(r["is_active"])
-            return StoredKey(**r)
+            return self._with_pending(_row_to_key(row))
 
     async def list_all(self) -> list[StoredKey]:
         assert self._db is not None
         async with self._db.execute("SELECT * FROM keys ORDER BY created_at") as cursor:
             rows = await cursor.fetchall()
-            result = []
-            for row in rows:
-                r = dict(row)
-                r["is_active"] = bool(r["is_active"])
-                result.append(StoredKey(**r))
-            return result
+            return [self._with_pending(_row_to_key(row)) for row in rows]
 
     async def delete(self, key_id: str) -> bool:
         existing = await self.get_by_id(key_id)
@@ -126,17 +173,43 @@ class KeyStore:
             return False
 
         assert self._db is not None
+        self._cache.pop(existing.key_hash, None)
+        self._last_used.pop(key_id, None)
         await self._db.execute("DELETE FROM keys WHERE id = ?", (key_id,))
         await self._db.commit()
         return True
 
-    async def update_last_used(self, key_id: str) -> None:
-        assert self._db is not None
-        now = datetime.now(timezone.utc).isoformat()
-        await self._db.execute(
-            "UPDATE keys SET last_used_at = ? WHERE id = ?", (now, key_id)
-        )
-        await self._db.commit()
+    def touch(self, key_id: str) -> None:
+        self._last_used[key_id] = datetime.now(timezone.utc).isoformat()
+
+    def _with_pending(self, stored: StoredKey) -> StoredKey:
+        pending = self._last_used.get(stored.id)
+        if pending is not None:
+            stored.last_used_at = pending
+        return stored
+
+    async def flush(self) -> None:
+        if not self._last_used or self._db is None:
+            return
+        pending, self._last_used = self._last_used, {}
+        try:
+            await self._db.executemany(
+                "UPDATE keys SET last_used_at = ? WHERE id = ?",
+                [(used_at, key_id) for key_id, used_at in pending.items()],
+            )
+            await self._db.commit()
+        except Exception:
+            for key_id, used_at in pending.items():
+                self._last_used.setdefault(key_id, used_at)
+            raise
+
+    async def _flush_periodically(self) -> None:
+        while True:
+            await asyncio.sleep(self._flush_interval)
+            try:
+                await self.flush()
+            except Exception:
+                logger.exception("Failed to flush API key usage")
 
     async def is_empty(self) -> bool:
         assert self._db is not None
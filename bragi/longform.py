@@ -0,0 +1,137 @@
+from __future__ import annotations
+
+import asyncio
+from dataclasses import replace
+from typing import AsyncIterator, Awaitable, Callable
+
+import numpy as np
+
+from bragi.adapters.stt import Segment, TranscriptResult, Word, result_segments
+
+_FRAME_SECONDS = 0.02
+_SMOOTH_FRAMES = 10
+_SILENCE_MARGIN_DB = 6.0
+_SILENCE_FLOOR_DB = -60.0
+_SILENCE_CEILING_DB = -40.0
+
+WindowRunner = Callable[[np.ndarray], Awaitable[TranscriptResult]]
+
+
+def _frame_energy(audio: np.ndarray, frame: int) -> np.ndarray:
+    frames = len(audio) // frame
+    power = np.mean(audio[: frames * frame].reshape(frames, frame) ** 2, axis=1)
+    return 10 * np.log10(power + 1e-10)
+
+
+def plan_windows(audio: np.ndarray, sample_rate: int, max_seconds: float) -> list[tuple[int, int]]:
+    max_len = int(max_seconds * sample_rate)
+    if len(audio) <= max_len:
+        return [(0, len(audio))]
+
+    frame = int(_FRAME_SECONDS * sample_rate)
+    energy = _frame_energy(audio, frame)
+    smoothed = np.convolve(energy, np.ones(_SMOOTH_FRAMES) / _SMOOTH_FRAMES, mode="same")
+    threshold = min(
+        max(float(np.percentile(energy, 10)) + _SILENCE_MARGIN_DB, _SILENCE_FLOOR_DB),
+        _SILENCE_CEILING_DB,
+    )
+
+    max_frames = max(2, max_len // frame)
+    min_frames = max(1, max_frames // 2)
+    windows: list[tuple[int, int]] = []
+    start = 0
+    while len(energy) - start > max_frames:
+        lo, hi = start + min_frames, start + max_frames
+        cut = lo + int(np.argmin(smoothed[lo:hi]))
+        windows.append((start, cut))
+        start = cut
+    windows.append((start, len(energy)))
+
+    bounds = []
+    for first, last in windows:
+        if energy[first:last].max() < threshold:
+            continue
+        end = len(audio) if last == len(energy) else last * frame
+        bounds.append((first * frame, end))
+    return bounds
+
+
+def _shift(result: TranscriptResult, offset: float, first_id: int) -> list[Segment]:
+    return [
+        replace(
+            seg,
+            id=first_id + idx,
+            start=seg.start + offset,
+            end=seg.end + offset,
+            words=[Word(w.word, w.start + offset, w.end + offset) for w in seg.words] if seg.words else None,
+        )
+        for idx, seg in enumerate(result_segments(result))
+    ]
+
+
+async def iterate_windows(
+    audio: np.ndarray,
+    sample_rate: int,
+    max_seconds: float,
+    run: WindowRunner,
+    concurrency: int,
+) -> AsyncIterator[tuple[float, TranscriptResult]]:
+    pending = iter(plan_windows(audio, sample_rate, max_seconds))
+    in_flight: list[tuple[float, asyncio.Task]] = []
+
+    def start_next() -> None:
+        window = next(pending, None)
+        if window is None:
+            return
+        start, end = window
+        in_flight.append((start / sample_rate, asyncio.ensure_future(run(audio[start:end]))))
+
+    for _ in range(max(1, concurrency)):
+        start_next()
+
+    try:
+        while in_flight:
+            offset, task = in_flight.pop(0)
+            result = await task
+            start_next()
+            yield offset, result
+    finally:
+        for _, task in in_flight:
+            task.cancel()
+
+
+async def stream_long(
+    audio: np.ndarray,
+    sample_rate: int,
+    max_seconds: float,
+    run: WindowRunner,
+    concurrency: int,
+) -> AsyncIterator[Segment]:
+    next_id = 0
+    async for offset, result in iterate_windows(audio, sample_rate, max_seconds, run, concurrency):
+        for seg in _shift(result, offset, next_id):
+            next_id += 1
+            yield seg
+
+
+async def transcribe_long(
+    audio: np.ndarray,
+    sample_rate: int,
+    max_seconds: float,
+    run: WindowRunner,
+    concurrency: int,
+) -> TranscriptResult:
+    segments: list[Segment] = []
+    language = None
+    async for offset, result in iterate_windows(audio, sample_rate, max_seconds, run, concurrency):
+        language = language or result.language
+        segments.extend(_shift(result, offset, len(segments)))
+
+    words = [w for seg in segments for w in seg.words or []]
+    return TranscriptResult(
+        text=" ".join(seg.text.strip() for seg in segments if seg.text.strip()),
+        language=language,
+        duration=len(audio) / sample_rate,
+        segments=segments or None,
+        words=words or None,
+    )
@@ -1,82 +1,24 @@
 import logging
+import time
 from contextlib import asynccontextmanager
 from pathlib import Path
 
 from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
-
-from bragi.adapters.faster_whisper import FasterWhisperAdapter
-from bragi.adapters.kokoro import KokoroAdapter
-from bragi.adapters.stt import STTAdapter
-
-_optional_adapters: list[type] = []
-
-try:
-    from bragi.adapters.vosk_adapter import VoskAdapter
-    _optional_adapters.append(VoskAdapter)
-except ImportError:
-    pass
-
-try:
-    from bragi.adapters.paraformer import ParaformerAdapter
-    _optional_adapters.append(ParaformerAdapter)
-except ImportError:
-    pass
-
-try:
-    from bragi.adapters.moonshine import MoonshineAdapter
-    _optional_adapters.append(MoonshineAdapter)
-except ImportError:
-    pass
-
-try:
-    from bragi.adapters.speechbrain_adapter import SpeechBrainAdapter
-    _optional_adapters.append(SpeechBrainAdapter)
-except ImportError:
-    pass
-
-try:
-    from bragi.adapters.parakeet import ParakeetAdapter
-    _optional_adapters.append(ParakeetAdapter)
-except ImportError:
-    pass
-
-try:
-    from bragi.adapters.piper import PiperAdapter
-    _optional_adapters.append(PiperAdapter)
-except ImportError:
-    pass
-
-try:
-    from bragi.adapters.coqui_xtts import CoquiXTTSAdapter
-    _optional_adapters.append(CoquiXTTSAdapter)
-except ImportError:
-    pass
-
-try:
-    from bragi.adapters.f5_tts import F5TTSAdapter
-    _optional_adapters.append(F5TTSAdapter)
-except ImportError:
-    pass
-
-try:
-    from bragi.adapters.fish_speech import FishSpeechAdapter
-    _optional_adapters.append(FishSpeechAdapter)
-except ImportError:
-    pass
-
-try:
-    from bragi.adapters.qwen3_tts import Qwen3TTSAdapter
-    _optional_adapters.append(Qwen3TTSAdapter)
-except ImportError:
-    pass
-
-from bragi.config import load_config
+from fastapi.responses import JSONResponse, PlainTextResponse
+
+from bragi.audio.cache import SpeechCache
+from bragi.bootstrap import build_registry, start_registry
+from bragi.audio.decoding import DecoderPool
+from bragi.config import load_config, parse_file_size
 from bragi.keys.store import KeyStore
+from bragi.metrics import CONTENT_TYPE, Metrics, MetricsMiddleware
 from bragi.middleware.auth import AuthMiddleware
-from bragi.registry import ModelInfo, ModelRegistry
-from bragi.routes import keys, models, speech, transcriptions, translations, voices
+from bragi.profiling import Profiler, ProfilingMiddleware
+from bragi.registry import ModelRegistry
+from bragi.remote.client import ModelServerClient
+from bragi.remote.registry import RemoteRegistry
+from bragi.routes import keys, models, profiling, speech, transcriptions, translations, voices
 from bragi.schemas.errors import BragiError
 from bragi.voices.store import VoiceStore
 
@@ -92,8 +34,6 @@ async def lifespan(app: FastAPI):
         format="%(asctime)s %(levelname)s %(name)s: %(message)s",
     )
 
-    registry = ModelRegistry()
-
     voice_base = Path(config.voice_store_dir) if config.voice_store_dir else Path(config.model_cache_dir) / "voices"
     voice_store = VoiceStore(
         db_path=voice_base / "voices.db",
@@ -105,43 +45,26 @@ async def lifespan(app: FastAPI):
     key_store = KeyStore(db_path=key_base / "keys.db")
     await key_store.initialize()
 
+    speech_cache = None
+    if config.speech_cache.enabled:
+        cache_config = config.speech_cache
+        speech_cache = SpeechCache(
+            max_memory_bytes=parse_file_size(cache_config.memory_size),
+            disk_dir=Path(cache_config.dir) if cache_config.dir else Path(config.model_cache_dir) / "speech_cache",
+            max_disk_bytes=parse_file_size(cache_config.disk_size) if cache_config.disk_size else 0,
+        )
+        await speech_cache.initialize()
+
     if await key_store.is_empty():
         stored, raw_key = await key_store.create("default")
         logger.info("Generated API key: %s", raw_key)
 
-    adapter_classes: list[type] = [FasterWhisperAdapter, KokoroAdapter] + _optional_adapters
-
-    for alias, model_config in config.models.items():
-        cfg = {"repo": model_config.repo}
-
-        matched = None
-        for cls in adapter_classes:
-            if cls.detect(cfg):
-                matched = cls
-                break
-
-        if matched is None:
-            logger.warning("No adapter for model '%s' (repo: %s)", alias, model_config.repo)
-            continue
-
-        adapter = matched()
-        device = model_config.device if model_config.device != "auto" else config.device
-        adapter.load(model_config.repo, device, compute_type=model_config.compute_type)
-
-        info = ModelInfo(
-            alias=alias,
-            model_type="stt" if isinstance(adapter, STTAdapter) else "tts",
-            repo=model_config.repo,
-            device=device,
-            status="loaded",
-        )
-
-        if isinstance(adapter, STTAdapter):
-            registry.register_stt(alias, adapter, info)
-        else:
-            registry.register_tts(alias, adapter, info)
-
-        logger.info("Loaded model '%s' (%s) on %s", alias, model_config.repo, device)
+    if config.server.model_server:
+        registry = RemoteRegistry(ModelServerClient(config.server.model_server, config.server.model_server_key))
+        await registry.attach(config)
+    else:
+        registry = build_registry(config)
+        await start_registry(registry, config)
 
     for cv in await voice_store.list_all():
         if cv.adapter_alias:
@@ -151,6 +74,10 @@ async def lifespan(app: FastAPI):
     app.state.registry = registry
     app.state.voice_store = voice_store
     app.state.key_store = key_store
+    app.state.speech_cache = speech_cache
+    app.state.decoder_pool = DecoderPool(config.server.decode_workers, config.server.decode_stall_timeout)
+    app.state.metrics = Metrics()
+    app.state.profiler = Profiler()
 
     logger.info("Bragi started on %s:%d", config.server.host, config.server.port)
 
@@ -159,12 +86,32 @@ async def lifespan(app: FastAPI):
     await key_store.close()
     await voice_store.close()
     registry.unload_all()
+    app.state.decoder_pool.shutdown()
     logger.info("Bragi shutdown complete")
 
 
+def _model_status(registry: ModelRegistry) -> dict[str, dict]:
+    now = time.monotonic()
+    model_status = {}
+    for info in registry.list_models():
+        entry = {
+            "status": info.status,
+            "device": info.device,
+            "load_time": round(info.load_time, 3) if info.load_time is not None else None,
+        }
+        if info.status == "loading" and info.load_started is not None:
+            entry["loading_for"] = round(now - info.load_started, 3)
+        if info.error:
+            entry["error"] = info.error
+        model_status[info.alias] = entry
+    return model_status
+
+
 def create_app() -> FastAPI:
     application = FastAPI(title="Bragi", version="0.1.0", lifespan=lifespan)
 
+    application.add_middleware(ProfilingMiddleware)
+
     application.add_middleware(AuthMiddleware)
 
     application.add_middleware(
@@ -175,12 +122,15 @@ def create_app() -> FastAPI:
         allow_headers=["*"],
     )
 
+    application.add_middleware(MetricsMiddleware)
+
     application.include_router(transcriptions.router, prefix="/v1")
     application.include_router(speech.router, prefix="/v1")
     application.include_router(translations.router, prefix="/v1")
     application.include_router(models.router, prefix="/v1")
     application.include_router(voices.router, prefix="/v1")
     application.include_router(keys.router, prefix="/v1")
+    application.include_router(profiling.router, prefix="/v1")
 
     @application.exception_handler(BragiError)
     async def bragi_error_handler(request: Request, exc: BragiError):
@@ -192,17 +142,28 @@ def create_app() -> FastAPI:
     @application.get("/health")
     async def health(request: Request):
         registry: ModelRegistry = request.app.state.registry
-        model_status = {}
-        for info in registry.list_models():
-            model_status[info.alias] = {
-                "status": info.status,
-                "device": info.device,
-            }
-        return {"status": "ok", "models": model_status}
+        response = {"status": "ok", "models": _model_status(registry)}
+        speech_cache: SpeechCache | None = request.app.state.speech_cache
+        if speech_cache is not None:
+            response["speech_cache"] = speech_cache.stats()
+        response["decoding"] = request.app.state.decoder_pool.stats()
+        return response
+
+    @application.get("/metrics")
+    async def metrics(request: Request):
+        return PlainTextResponse(
+            request.app.state.metrics.render(request.app.state.registry),
+            media_type=CONTENT_TYPE,
+        )
 
     @application.get("/ready")
     async def ready(request: Request):
-        return {"status": "ok"}
+        registry: ModelRegistry = request.app.state.registry
+        ready = registry.is_ready()
+        return JSONResponse(
+            status_code=200 if ready else 503,
+            content={"status": "ok" if ready else "loading", "models": _model_status(registry)},
+        )
 
     return application
 
@@ -212,10 +173,20 @@ app = create_app()
 if __name__ == "__main__":
     import uvicorn
 
+    from bragi.remote.server import spawn_model_server
+
     config = load_config()
-    uvicorn.run(
-        "bragi.main:app",
-        host=config.server.host,
-        port=config.server.port,
-        workers=config.server.workers,
-    )
+    model_server = None
+    if config.server.workers > 1 and not config.server.model_server:
+        model_server = spawn_model_server()
+    try:
+        uvicorn.run(
+            "bragi.main:app",
+            host=config.server.host,
+            port=config.server.port,
+            workers=config.server.workers,
+        )
+    finally:
+        if model_server is not None:
+            model_server.terminate()
+            model_server.join()
@@ -0,0 +1,215 @@
+from __future__ import annotations
+
+import math
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from typing import Iterator
+
+from starlette.requests import HTTPConnection
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from bragi.executor import record_inference
+from bragi.registry import ModelRegistry
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0)
+RTF_BUCKETS = (0.01, 0.02, 0.05, 0.1, 0.2, 0.3, 0.5, 0.75, 1.0, 1.5, 2.0, 5.0)
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+_STAGES = ("decode", "inference", "encode")
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _labels(names: tuple[str, ...], values: tuple[str, ...], extra: str = "") -> str:
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _number(value: float) -> str:
+    if math.isinf(value):
+        return "+Inf"
+    return repr(float(value)) if not float(value).is_integer() else str(int(value))
+
+
+class Counter:
+    def __init__(self, name: str, help: str, labelnames: tuple[str, ...] = ()) -> None:
+        self.name = name
+        self.help = help
+        self.labelnames = labelnames
+        self._values: dict[tuple[str, ...], float] = {}
+
+    def inc(self, amount: float = 1.0, **labels: str) -> None:
+        key = tuple(labels[name] for name in self.labelnames)
+        self._values[key] = self._values.get(key, 0.0) + amount
+
+    def render(self) -> list[str]:
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} counter"]
+        for key, value in self._values.items():
+            lines.append(f"{self.name}{_labels(self.labelnames, key)} {_number(value)}")
+        return lines
+
+
+class Histogram:
+    def __init__(
+        self,
+        name: str,
+        help: str,
+        labelnames: tuple[str, ...] = (),
+        buckets: tuple[float, ...] = LATENCY_BUCKETS,
+    ) -> None:
+        self.name = name
+        self.help = help
+        self.labelnames = labelnames
+        self.buckets = tuple(sorted(buckets)) + (math.inf,)
+        self._series: dict[tuple[str, ...], list[float]] = {}
+
+    def observe(self, value: float, **labels: str) -> None:
+        key = tuple(labels[name] for name in self.labelnames)
+        series = self._series.get(key)
+        if series is None:
+            series = self._series[key] = [0.0] * (len(self.buckets) + 1)
+        for idx, bound in enumerate(self.buckets):
+            if value <= bound:
+                series[idx] += 1
+                break
+        series[-1] += value
+
+    def render(self) -> list[str]:
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} histogram"]
+        for key, series in self._series.items():
+            cumulative = 0.0
+            for bound, count in zip(self.buckets, series):
+                cumulative += count
+                le = f'le="{_number(bound)}"'
+                lines.append(f"{self.name}_bucket{_labels(self.labelnames, key, le)} {_number(cumulative)}")
+            labels = _labels(self.labelnames, key)
+            lines.append(f"{self.name}_sum{labels} {_number(series[-1])}")
+            lines.append(f"{self.name}_count{labels} {_number(cumulative)}")
+        return lines
+
+
+@dataclass
+class RequestTimings:
+    model: str | None = None
+    audio_seconds: float = 0.0
+    stages: dict[str, float] = field(default_factory=dict)
+
+    def add(self, stage: str, seconds: float) -> None:
+        self.stages[stage] = self.stages.get(stage, 0.0) + seconds
+
+    @contextmanager
+    def measure(self, stage: str) -> Iterator[None]:
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.add(stage, time.perf_counter() - started)
+
+
+def request_timings(connection: HTTPConnection) -> RequestTimings:
+    state = connection.scope.setdefault("state", {})
+    timings = state.get("timings")
+    if timings is None:
+        timings = state["timings"] = RequestTimings()
+    return timings
+
+
+class Metrics:
+    def __init__(self) -> None:
+        labels = ("route", "model")
+        self.requests = Counter("bragi_requests_total", "HTTP requests handled.", labels + ("status",))
+        self.latency = Histogram("bragi_request_duration_seconds", "End-to-end request latency.", labels)
+        self.stages = {
+            stage: Histogram(f"bragi_{stage}_duration_seconds", f"Time spent in {stage} per request.", labels)
+            for stage in _STAGES
+        }
+        self.rtf = Histogram(
+            "bragi_real_time_factor", "Inference seconds per second of audio.", labels, buckets=RTF_BUCKETS
+        )
+        self.bytes_in = Counter("bragi_request_bytes_total", "Request body bytes received.", labels)
+        self.bytes_out = Counter("bragi_response_bytes_total", "Response body bytes sent.", labels)
+
+    def record(
+        self,
+        route: str,
+        status: int,
+        seconds: float,
+        timings: RequestTimings,
+        bytes_in: int,
+        bytes_out: int,
+    ) -> None:
+        labels = {"route": route, "model": timings.model or ""}
+        self.requests.inc(status=str(status), **labels)
+        self.latency.observe(seconds, **labels)
+        for stage, histogram in self.stages.items():
+            if stage in timings.stages:
+                histogram.observe(timings.stages[stage], **labels)
+        inference = timings.stages.get("inference")
+        if inference and timings.audio_seconds > 0:
+            self.rtf.observe(inference / timings.audio_seconds, **labels)
+        self.bytes_in.inc(bytes_in, **labels)
+        self.bytes_out.inc(bytes_out, **labels)
+
+    def render(self, registry: ModelRegistry | None = None) -> str:
+        lines: list[str] = []
+        for metric in (self.requests, self.latency, *self.stages.values(), self.rtf, self.bytes_in, self.bytes_out):
+            lines.extend(metric.render())
+        if registry is not None:
+            lines.extend(_model_gauges(registry))
+        return "\n".join(lines) + "\n"
+
+
+def _model_gauges(registry: ModelRegistry) -> list[str]:
+    in_flight = ["# HELP bragi_in_flight_requests Requests holding a model lease.", "# TYPE bragi_in_flight_requests gauge"]
+    queued = ["# HELP bragi_queued_requests Requests waiting for a model worker or batch.", "# TYPE bragi_queued_requests gauge"]
+    for info in registry.list_models():
+        labels = _labels(("model",), (info.alias,))
+        in_flight.append(f"bragi_in_flight_requests{labels} {registry.in_use(info.alias)}")
+        queued.append(f"bragi_queued_requests{labels} {registry.queued(info.alias)}")
+    return in_flight + queued
+
+
+class MetricsMiddleware:
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        metrics = getattr(scope["app"].state, "metrics", None) if scope["type"] == "http" else None
+        if metrics is None:
+            await self.app(scope, receive, send)
+            return
+
+        started = time.perf_counter()
+        timings = RequestTimings()
+        scope.setdefault("state", {})["timings"] = timings
+        status = 500
+        bytes_in = 0
+        bytes_out = 0
+
+        async def counting_receive() -> Message:
+            nonlocal bytes_in
+            message = await receive()
+            if message["type"] == "http.request":
+                bytes_in += len(message.get("body", b""))
+            return message
+
+        async def counting_send(message: Message) -> None:
+            nonlocal status, bytes_out
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            elif message["type"] == "http.response.body":
+                bytes_out += len(message.get("body", b""))
+            await send(message)
+
+        try:
+            with record_inference(lambda seconds: timings.add("inference", seconds)):
+                await self.app(scope, counting_receive, counting_send)
+        finally:
+            route = getattr(scope.get("route"), "path", None) or "unmatched"
+            metrics.record(route, status, time.perf_counter() - started, timings, bytes_in, bytes_out)
@@ -1,41 +1,57 @@
-import asyncio
-
-from starlette.middleware.base import BaseHTTPMiddleware
-from starlette.requests import Request
 from starlette.responses import JSONResponse
+from starlette.types import ASGIApp, Receive, Scope, Send
 
 from bragi.schemas.errors import AuthenticationError
 
+_PUBLIC_PATHS = ("/health", "/ready")
 
-class AuthMiddleware(BaseHTTPMiddleware):
-    async def dispatch(self, request: Request, call_next):
-        if request.url.path in ("/health", "/ready"):
-            return await call_next(request)
 
-        if not request.url.path.startswith("/v1"):
-            return await call_next(request)
+def _bearer_token(scope: Scope) -> str | None:
+    for name, value in scope["headers"]:
+        if name == b"authorization":
+            header = value.decode("latin-1")
+            if header.startswith("Bearer "):
+                return header[7:]
+            return None
+    return None
 
-        key_store = getattr(request.app.state, "key_store", None)
-        if key_store is None:
-            return await call_next(request)
-
-        auth_header = request.headers.get("authorization", "")
-        if not auth_header.startswith("Bearer "):
-            error = AuthenticationError()
-            return JSONResponse(
-                status_code=error.status_code,
-                content=error.to_response().model_dump(),
-            )
-
-        token = auth_header[7:]
-        stored_key = await key_store.validate(token)
-        if stored_key is None:
-            error = AuthenticationError()
-            return JSONResponse(
-                status_code=error.status_code,
-                content=error.to_response().model_dump(),
-            )
 
-        asyncio.create_task(key_store.update_last_used(stored_key.id))
+class AuthMiddleware:
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] not in ("http", "websocket"):
+            await self.app(scope, receive, send)
+            return
 
-        return await call_next(request)
+        path = scope["path"]
+        if path in _PUBLIC_PATHS or not path.startswith("/v1"):
+            await self.app(scope, receive, send)
+            return
+
+        key_store = getattr(scope["app"].state, "key_store", None)
+        if key_store is None:
+            await self.app(scope, receive, send)
+            return
+
+        token = _bearer_token(scope)
+        stored_key = await key_store.validate(token) if token else None
+        if stored_key is None:
+            await self._reject(scope, receive, send)
+            return
+
+        key_store.touch(stored_key.id)
+        await self.app(scope, receive, send)
+
+    async def _reject(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] == "websocket":
+            await send({"type": "websocket.close", "code": 1008, "reason": "Invalid or missing API key."})
+            return
+
+        error = AuthenticationError()
+        response = JSONResponse(
+            status_code=error.status_code,
+            content=error.to_response().model_dump(),
+        )
+        await response(scope, receive, send)
@@ -0,0 +1,241 @@
+from __future__ import annotations
+
+import asyncio
+import collections
+import os
+import sys
+import threading
+import time
+import tracemalloc
+import uuid
+from dataclasses import dataclass
+
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from bragi.schemas.errors import ProfilerBusyError
+
+PROFILE_HEADER = b"x-bragi-profile"
+PROFILE_ID_HEADER = "X-Bragi-Profile-Id"
+
+_MODES = {"cpu": (True, False), "memory": (False, True), "all": (True, True)}
+_IDLE_FILES = {"threading.py", "selectors.py", "queue.py", "thread.py", "connection.py"}
+_TRACE_FRAMES = 16
+
+
+def _frame_label(frame) -> str:
+    code = frame.f_code
+    name = getattr(code, "co_qualname", code.co_name)
+    label = f"{name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})"
+    return label.replace(";", ":")
+
+
+class StackSampler:
+    def __init__(self, interval: float = 0.01, include_idle: bool = False) -> None:
+        self.interval = interval
+        self.include_idle = include_idle
+        self.samples = 0
+        self._stacks: collections.Counter[str] = collections.Counter()
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+
+    def start(self) -> None:
+        self._thread = threading.Thread(target=self._run, name="bragi-profiler", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> str:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+        return self.collapsed()
+
+    def _run(self) -> None:
+        own = threading.get_ident()
+        while not self._stop.wait(self.interval):
+            names = {thread.ident: thread.name for thread in threading.enumerate()}
+            for ident, frame in sys._current_frames().items():
+                if ident == own or frame.f_code.co_filename == __file__:
+                    continue
+                if not self.include_idle and os.path.basename(frame.f_code.co_filename) in _IDLE_FILES:
+                    continue
+                stack = []
+                while frame is not None:
+                    stack.append(_frame_label(frame))
+                    frame = frame.f_back
+                stack.append(names.get(ident, f"thread-{ident}").replace(";", ":").replace(" ", "_"))
+                self._stacks[";".join(reversed(stack))] += 1
+            self.samples += 1
+
+    def collapsed(self) -> str:
+        return "".join(f"{stack} {count}\n" for stack, count in self._stacks.most_common())
+
+
+def sample_stacks(seconds: float, interval: float = 0.01, include_idle: bool = False) -> str:
+    sampler = StackSampler(interval, include_idle)
+    sampler.start()
+    time.sleep(seconds)
+    return sampler.stop()
+
+
+class AllocationTracker:
+    def __init__(self, frames: int = _TRACE_FRAMES) -> None:
+        self.frames = frames
+        self._owned = False
+        self._before: tracemalloc.Snapshot | None = None
+
+    def start(self) -> None:
+        self._owned = not tracemalloc.is_tracing()
+        if self._owned:
+            tracemalloc.start(self.frames)
+        tracemalloc.reset_peak()
+        self._before = tracemalloc.take_snapshot()
+
+    def stop(self, limit: int = 25) -> dict:
+        after = tracemalloc.take_snapshot()
+        current, peak = tracemalloc.get_traced_memory()
+        if self._owned:
+            tracemalloc.stop()
+        filters = (
+            tracemalloc.Filter(False, tracemalloc.__file__),
+            tracemalloc.Filter(False, __file__),
+            tracemalloc.Filter(False, "<frozen importlib._bootstrap>"),
+            tracemalloc.Filter(False, "<frozen importlib._bootstrap_external>"),
+        )
+        stats = after.filter_traces(filters).compare_to(self._before.filter_traces(filters), "lineno")
+        self._before = None
+        return {
+            "traced_bytes": current,
+            "peak_bytes": peak,
+            "allocations": [
+                {
+                    "file": stat.traceback[0].filename,
+                    "line": stat.traceback[0].lineno,
+                    "size": stat.size,
+                    "size_diff": stat.size_diff,
+                    "count": stat.count,
+                    "count_diff": stat.count_diff,
+                }
+                for stat in stats[:limit]
+                if stat.size_diff or stat.count_diff
+            ],
+        }
+
+
+@dataclass
+class RequestProfile:
+    id: str
+    method: str
+    path: str
+    created_at: int
+    duration: float = 0.0
+    status: int | None = None
+    samples: int = 0
+    stacks: str | None = None
+    memory: dict | None = None
+
+    def to_dict(self) -> dict:
+        return {
+            "id": self.id,
+            "method": self.method,
+            "path": self.path,
+            "created_at": self.created_at,
+            "duration": round(self.duration, 6),
+            "status": self.status,
+            "samples": self.samples,
+            "stacks": self.stacks,
+            "memory": self.memory,
+        }
+
+
+class Profiler:
+    def __init__(self, keep: int = 32) -> None:
+        self.keep = keep
+        self._lock = threading.Lock()
+        self._profiles: collections.OrderedDict[str, RequestProfile] = collections.OrderedDict()
+
+    def _acquire(self) -> None:
+        if not self._lock.acquire(blocking=False):
+            raise ProfilerBusyError()
+
+    async def sample(self, seconds: float, interval: float = 0.01, include_idle: bool = False) -> str:
+        self._acquire()
+        try:
+            return await asyncio.to_thread(sample_stacks, seconds, interval, include_idle)
+        finally:
+            self._lock.release()
+
+    async def allocations(self, seconds: float, limit: int = 25) -> dict:
+        self._acquire()
+        tracker = AllocationTracker()
+        try:
+            await asyncio.to_thread(tracker.start)
+            await asyncio.sleep(seconds)
+            return await asyncio.to_thread(tracker.stop, limit)
+        finally:
+            self._lock.release()
+
+    def begin(self, method: str, path: str) -> RequestProfile | None:
+        if not self._lock.acquire(blocking=False):
+            return None
+        return RequestProfile(id=f"prof_{uuid.uuid4().hex[:24]}", method=method, path=path, created_at=int(time.time()))
+
+    def finish(self, profile: RequestProfile) -> None:
+        self._profiles[profile.id] = profile
+        while len(self._profiles) > self.keep:
+            self._profiles.popitem(last=False)
+        self._lock.release()
+
+    def get(self, profile_id: str) -> RequestProfile | None:
+        return self._profiles.get(profile_id)
+
+    def list_all(self) -> list[RequestProfile]:
+        return list(reversed(self._profiles.values()))
+
+
+def _profile_mode(scope: Scope) -> str | None:
+    for name, value in scope["headers"]:
+        if name == PROFILE_HEADER:
+            return value.decode("latin-1").strip().lower() or "all"
+    return None
+
+
+class ProfilingMiddleware:
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        profiler: Profiler | None = getattr(scope["app"].state, "profiler", None) if scope["type"] == "http" else None
+        mode = _MODES.get(_profile_mode(scope) or "") if profiler is not None else None
+        profile = profiler.begin(scope["method"], scope["path"]) if mode is not None else None
+        if profile is None:
+            await self.app(scope, receive, send)
+            return
+
+        cpu, memory = mode
+        sampler = StackSampler() if cpu else None
+        tracker = AllocationTracker() if memory else None
+
+        async def tagged_send(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                profile.status = message["status"]
+                MutableHeaders(scope=message).append(PROFILE_ID_HEADER, profile.id)
+            await send(message)
+
+        try:
+            if tracker is not None:
+                await asyncio.to_thread(tracker.start)
+            if sampler is not None:
+                sampler.start()
+            started = time.perf_counter()
+            try:
+                await self.app(scope, receive, tagged_send)
+            finally:
+                profile.duration = time.perf_counter() - started
+                if sampler is not None:
+                    profile.stacks = await asyncio.to_thread(sampler.stop)
+                    profile.samples = sampler.samples
+                if tracker is not None:
+                    profile.memory = await asyncio.to_thread(tracker.stop)
+        finally:
+            profiler.finish(profile)
@@ -1,9 +1,20 @@
 from __future__ import annotations
 
+import asyncio
+import logging
+import time
+from contextlib import asynccontextmanager
 from dataclasses import dataclass
+from typing import AsyncIterator
 
 from bragi.adapters.stt import STTAdapter
 from bragi.adapters.tts import TTSAdapter
+from bragi.batching import BatchScheduler
+from bragi.config import ModelConfig, parse_file_size
+from bragi.executor import ModelExecutor, record_inference
+from bragi.schemas.errors import ModelNotLoadedError
+
+logger = logging.getLogger("bragi.registry")
 
 
 @dataclass
@@ -13,23 +24,86 @@ class ModelInfo:
     repo: str | None
     device: str | None
     status: str
+    memory: int = 0
+    last_used: float = 0.0
+    load_started: float | None = None
+    load_time: float | None = None
+    error: str | None = None
 
 
 class ModelRegistry:
-    def __init__(self) -> None:
+    def __init__(
+        self,
+        model_ttl: int = 0,
+        memory_budget: int = 0,
+        max_loaded_models: int = 0,
+    ) -> None:
         self._stt_adapters: dict[str, STTAdapter] = {}
         self._tts_adapters: dict[str, TTSAdapter] = {}
         self._model_info: dict[str, ModelInfo] = {}
         self._voice_to_tts: dict[str, tuple[str, TTSAdapter]] = {}
+        self._custom_voices: set[str] = set()
+        self._executors: dict[str, ModelExecutor] = {}
+        self._realtime_executors: dict[str, ModelExecutor] = {}
+        self._schedulers: dict[str, BatchScheduler] = {}
+        self._model_configs: dict[str, ModelConfig] = {}
+        self._in_use: dict[str, int] = {}
+        self._locks: dict[str, asyncio.Lock] = {}
+        self._model_ttl = model_ttl
+        self._memory_budget = memory_budget
+        self._max_loaded_models = max_loaded_models
+        self._reaper: asyncio.Task | None = None
+        self._loader: asyncio.Task | None = None
+        self._pending: set[str] = set()
+        self._startup_complete = False
 
-    def register_stt(self, alias: str, adapter: STTAdapter, info: ModelInfo) -> None:
+    def register_stt(
+        self,
+        alias: str,
+        adapter: STTAdapter,
+        info: ModelInfo,
+        model_config: ModelConfig | None = None,
+    ) -> None:
+        model_config = self._register(alias, info, model_config)
         self._stt_adapters[alias] = adapter
-        self._model_info[alias] = info
+        executor = self._set_executor(alias, adapter.is_thread_safe(), model_config.concurrency)
+        self._schedulers[alias] = BatchScheduler(
+            adapter,
+            executor,
+            max_batch_size=model_config.batch_size,
+            max_wait_ms=model_config.batch_wait_ms,
+        )
+        previous = self._realtime_executors.pop(alias, None)
+        if previous is not None:
+            previous.shutdown(wait=False)
+        if adapter.supports_realtime():
+            sessions = model_config.realtime_sessions if adapter.is_thread_safe() else 1
+            self._realtime_executors[alias] = ModelExecutor(f"{alias}-realtime", sessions)
 
-    def register_tts(self, alias: str, adapter: TTSAdapter, info: ModelInfo) -> None:
+    def register_tts(
+        self,
+        alias: str,
+        adapter: TTSAdapter,
+        info: ModelInfo,
+        model_config: ModelConfig | None = None,
+    ) -> None:
+        model_config = self._register(alias, info, model_config)
         self._tts_adapters[alias] = adapter
+        self._set_executor(alias, adapter.is_thread_safe(), model_config.concurrency)
+        self._index_voices(alias, adapter)
+
+    def _register(self, alias: str, info: ModelInfo, model_config: ModelConfig | None) -> ModelConfig:
+        model_config = model_config or ModelConfig(repo=info.repo or alias)
+        if model_config.memory:
+            info.memory = parse_file_size(model_config.memory)
+        info.last_used = time.monotonic()
         self._model_info[alias] = info
+        self._model_configs[alias] = model_config
+        self._in_use.setdefault(alias, 0)
+        self._locks.setdefault(alias, asyncio.Lock())
+        return model_config
 
+    def _index_voices(self, alias: str, adapter: TTSAdapter) -> None:
         for voice in adapter.get_available_voices():
             if voice not in self._voice_to_tts:
                 self._voice_to_tts[voice] = (alias, adapter)
@@ -44,6 +118,195 @@ class ModelRegistry:
             raise KeyError(f"TTS model not found: {alias!r}")
         return self._tts_adapters[alias]
 
+    def get_executor(self, alias: str) -> ModelExecutor:
+        if alias not in self._executors:
+            raise KeyError(f"Model not found: {alias!r}")
+        return self._executors[alias]
+
+    def get_realtime_executor(self, alias: str) -> ModelExecutor:
+        if alias not in self._realtime_executors:
+            raise KeyError(f"Realtime model not found: {alias!r}")
+        return self._realtime_executors[alias]
+
+    def get_scheduler(self, alias: str) -> BatchScheduler:
+        if alias not in self._schedulers:
+            raise KeyError(f"STT model not found: {alias!r}")
+        return self._schedulers[alias]
+
+    def get_window_seconds(self, alias: str) -> float | None:
+        window = self._model_configs[alias].window_seconds
+        if window is None:
+            window = self._stt_adapters[alias].max_window_seconds()
+        return window or None
+
+    def _set_executor(self, alias: str, thread_safe: bool, concurrency: int) -> ModelExecutor:
+        previous = self._executors.pop(alias, None)
+        if previous is not None:
+            previous.shutdown(wait=False)
+        executor = ModelExecutor(alias, concurrency if thread_safe else 1)
+        self._executors[alias] = executor
+        return executor
+
+    def _adapter(self, alias: str) -> STTAdapter | TTSAdapter:
+        if alias in self._stt_adapters:
+            return self._stt_adapters[alias]
+        return self._tts_adapters[alias]
+
+    async def acquire(self, alias: str) -> None:
+        self._in_use[alias] += 1
+        try:
+            if self._model_info[alias].status != "loaded":
+                await self.ensure_loaded(alias)
+        except BaseException:
+            self.release(alias)
+            raise
+
+    def release(self, alias: str) -> None:
+        self._in_use[alias] -= 1
+        self._model_info[alias].last_used = time.monotonic()
+
+    @asynccontextmanager
+    async def use(self, alias: str) -> AsyncIterator[None]:
+        await self.acquire(alias)
+        try:
+            yield
+        finally:
+            self.release(alias)
+
+    async def ensure_loaded(self, alias: str) -> None:
+        if alias in self._pending:
+            raise ModelNotLoadedError(alias)
+        await self._ensure_loaded(alias)
+
+    async def _ensure_loaded(self, alias: str) -> None:
+        info = self._model_info[alias]
+        async with self._locks[alias]:
+            if info.status == "loaded":
+                return
+            await self._make_room(alias)
+            await self._load(alias)
+
+    def fits(self, alias: str) -> bool:
+        resident = [
+            i for i in self._model_info.values()
+            if i.alias != alias and i.status in ("loaded", "loading")
+        ]
+        if self._max_loaded_models and len(resident) + 1 > self._max_loaded_models:
+            return False
+        if self._memory_budget:
+            used = sum(i.memory for i in resident)
+            if used + self._model_info[alias].memory > self._memory_budget:
+                return False
+        return True
+
+    async def _make_room(self, alias: str) -> None:
+        while not self.fits(alias):
+            idle = [
+                a for a, i in self._model_info.items()
+                if a != alias and i.status == "loaded" and self._in_use[a] == 0
+            ]
+            if not idle:
+                logger.warning("Loading model '%s' exceeds the configured model budget", alias)
+                return
+            victim = min(idle, key=lambda a: self._model_info[a].last_used)
+            logger.info("Evicting model '%s' to make room for '%s'", victim, alias)
+            await self.unload(victim)
+
+    async def _load(self, alias: str) -> None:
+        adapter = self._adapter(alias)
+        info = self._model_info[alias]
+        model_config = self._model_configs[alias]
+
+        info.status = "loading"
+        info.error = None
+        info.load_started = started = time.monotonic()
+        try:
+            with record_inference(None):
+                await self._executors[alias].run(
+                    adapter.load,
+                    model_config.repo,
+                    info.device,
+                    compute_type=model_config.compute_type,
+                    concurrency=model_config.concurrency,
+                    realtime_sessions=model_config.realtime_sessions,
+                )
+        except Exception as e:
+            info.status = "failed"
+            info.error = str(e)
+            logger.exception("Failed to load model '%s' (%s)", alias, model_config.repo)
+            raise ModelNotLoadedError(alias)
+
+        info.status = "loaded"
+        info.last_used = time.monotonic()
+        info.load_time = info.last_used - started
+        if alias in self._tts_adapters:
+            self._index_voices(alias, self._tts_adapters[alias])
+
+        logger.info(
+            "Loaded model '%s' (%s) on %s in %.1fs",
+            alias, model_config.repo, info.device, info.load_time,
+        )
+
+    async def load_models(self, concurrency: int = 1) -> None:
+        slots = asyncio.Semaphore(max(1, concurrency))
+        self._pending = set(self._model_info)
+
+        async def load(alias: str) -> None:
+            async with slots:
+                try:
+                    if not self.fits(alias):
+                        logger.info("Deferring load of model '%s' until first request (model budget)", alias)
+                        return
+                    await self._ensure_loaded(alias)
+                except ModelNotLoadedError:
+                    pass
+                finally:
+                    self._pending.discard(alias)
+
+        await asyncio.gather(*(load(alias) for alias in list(self._model_info)))
+        self._startup_complete = True
+
+    def start_loading(self, concurrency: int = 1) -> None:
+        self._pending = set(self._model_info)
+        self._loader = asyncio.get_running_loop().create_task(self.load_models(concurrency))
+
+    def is_ready(self) -> bool:
+        return self._startup_complete and all(
+            info.status != "failed" for info in self._model_info.values()
+        )
+
+    async def unload(self, alias: str) -> bool:
+        info = self._model_info[alias]
+        async with self._locks[alias]:
+            if info.status != "loaded" or self._in_use[alias] > 0:
+                return False
+            info.status = "unloaded"
+            try:
+                with record_inference(None):
+                    await self._executors[alias].run(self._adapter(alias).unload)
+            except Exception:
+                logger.exception("Failed to unload model '%s'", alias)
+            logger.info("Unloaded model '%s'", alias)
+            return True
+
+    def start_reaper(self) -> None:
+        if self._model_ttl <= 0 or self._reaper is not None:
+            return
+        self._reaper = asyncio.get_running_loop().create_task(self._reap())
+
+    async def _reap(self) -> None:
+        interval = min(max(self._model_ttl / 2, 1.0), 60.0)
+        while True:
+            await asyncio.sleep(interval)
+            now = time.monotonic()
+            for alias, info in list(self._model_info.items()):
+                if (
+                    info.status == "loaded"
+                    and self._in_use[alias] == 0
+                    and now - info.last_used >= self._model_ttl
+                ):
+                    await self.unload(alias)
+
     def get_tts_by_voice(self, voice: str) -> tuple[str, TTSAdapter]:
         if voice not in self._voice_to_tts:
             raise KeyError(f"No adapter found for voice: {voice!r}")
@@ -56,9 +319,18 @@ class ModelRegistry:
         if alias not in self._tts_adapters:
             return
         self._voice_to_tts[voice_name] = (alias, self._tts_adapters[alias])
+        self._custom_voices.add(voice_name)
 
     def unregister_voice(self, voice_name: str) -> None:
         self._voice_to_tts.pop(voice_name, None)
+        self._custom_voices.discard(voice_name)
+
+    async def forget_voice(self, voice_id: str) -> None:
+        for adapter in self._tts_adapters.values():
+            adapter.forget_voice(voice_id)
+
+    def is_builtin_voice(self, voice_name: str) -> bool:
+        return voice_name in self._voice_to_tts and voice_name not in self._custom_voices
 
     def has_voice(self, voice_name: str) -> bool:
         return voice_name in self._voice_to_tts
@@ -69,12 +341,32 @@ class ModelRegistry:
     def list_models(self) -> list[ModelInfo]:
         return list(self._model_info.values())
 
+    def in_use(self, alias: str) -> int:
+        return self._in_use.get(alias, 0)
+
+    def queued(self, alias: str) -> int:
+        queued = self._executors[alias].queued() if alias in self._executors else 0
+        scheduler = self._schedulers.get(alias)
+        return queued + (scheduler.queued() if scheduler is not None else 0)
+
     def unload_all(self) -> None:
-        for adapter in self._stt_adapters.values():
-            adapter.unload()
-        for adapter in self._tts_adapters.values():
-            adapter.unload()
+        if self._loader is not None:
+            self._loader.cancel()
+            self._loader = None
+        if self._reaper is not None:
+            self._reaper.cancel()
+            self._reaper = None
+        for executor in [*self._executors.values(), *self._realtime_executors.values()]:
+            executor.shutdown()
+        for alias, adapter in [*self._stt_adapters.items(), *self._tts_adapters.items()]:
+            if self._model_info[alias].status == "loaded":
+                adapter.unload()
         self._stt_adapters.clear()
         self._tts_adapters.clear()
+        self._executors.clear()
+        self._realtime_executors.clear()
+        self._schedulers.clear()
+        self._model_configs.clear()
         self._model_info.clear()
         self._voice_to_tts.clear()
+        self._custom_voices.clear()
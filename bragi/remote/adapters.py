@@ -0,0 +1,228 @@
+from __future__ import annotations
+
+from multiprocessing.connection import Connection
+from typing import AsyncIterator, Iterator
+
+import numpy as np
+
+from bragi.adapters.stt import RealtimeSession, RealtimeUpdate, STTAdapter, Segment, TranscriptResult
+from bragi.adapters.tts import TTSAdapter
+from bragi.remote.client import ModelServerClient, exchange, unwrap
+from bragi.remote.protocol import AdapterSpec
+
+
+class _RemoteSession(RealtimeSession):
+
+    def __init__(self, conn: Connection, session_id: str) -> None:
+        self._conn = conn
+        self._session_id = session_id
+
+    def _call(self, method: str, *args) -> RealtimeUpdate | None:
+        return unwrap(exchange(self._conn, "session", self._session_id, method, args))
+
+    def accept(self, pcm: bytes) -> RealtimeUpdate | None:
+        return self._call("accept", pcm)
+
+    def finish(self) -> RealtimeUpdate:
+        return self._call("finish")
+
+    def close(self) -> None:
+        try:
+            self._call("close")
+        except (OSError, EOFError):
+            pass
+        finally:
+            self._conn.close()
+
+
+class RemoteSTTAdapter(STTAdapter):
+
+    def __init__(self, client: ModelServerClient, alias: str, spec: AdapterSpec) -> None:
+        self._client = client
+        self._alias = alias
+        self.spec = spec
+
+    @staticmethod
+    def detect(config: dict) -> bool:
+        return False
+
+    def load(self, model_path: str, device: str, **kwargs) -> None:
+        self._client.call("load", self._alias)
+
+    def unload(self) -> None:
+        pass
+
+    def _call(self, method: str, **kwargs):
+        return self._client.call("call", self._alias, method, kwargs)
+
+    def transcribe(
+        self,
+        audio: np.ndarray,
+        language: str | None,
+        temperature: float,
+        word_timestamps: bool,
+    ) -> TranscriptResult:
+        return self._call(
+            "transcribe",
+            audio=audio,
+            language=language,
+            temperature=temperature,
+            word_timestamps=word_timestamps,
+        )
+
+    def transcribe_request(
+        self,
+        audio: np.ndarray,
+        language: str | None,
+        temperature: float,
+        word_timestamps: bool,
+        timestamps: bool,
+    ) -> TranscriptResult:
+        return self._call(
+            "transcribe",
+            audio=audio,
+            language=language,
+            temperature=temperature,
+            word_timestamps=word_timestamps,
+            timestamps=timestamps,
+        )
+
+    def translate(self, audio: np.ndarray, temperature: float) -> TranscriptResult:
+        return self._call("translate", audio=audio, temperature=temperature)
+
+    def transcribe_stream(
+        self,
+        audio: np.ndarray,
+        language: str | None,
+        temperature: float,
+        word_timestamps: bool,
+    ) -> Iterator[Segment]:
+        return self._client.stream("transcribe_stream", self._alias, {
+            "audio": audio,
+            "language": language,
+            "temperature": temperature,
+            "word_timestamps": word_timestamps,
+        })
+
+    def translate_stream(self, audio: np.ndarray, temperature: float) -> Iterator[Segment]:
+        return self._client.stream(
+            "translate_stream", self._alias, {"audio": audio, "temperature": temperature}
+        )
+
+    def open_realtime(self, language: str | None, word_timestamps: bool) -> RealtimeSession:
+        conn = self._client.connect()
+        try:
+            session_id = unwrap(exchange(conn, "open_realtime", self._alias, language, word_timestamps))
+        except BaseException:
+            conn.close()
+            raise
+        return _RemoteSession(conn, session_id)
+
+    def get_supported_languages(self) -> list[str]:
+        return self.spec.languages
+
+    def get_sample_rate(self) -> int:
+        return self.spec.sample_rate
+
+    def supports_translation(self) -> bool:
+        return self.spec.translation
+
+    def supports_streaming(self) -> bool:
+        return self.spec.streaming
+
+    def supports_realtime(self) -> bool:
+        return self.spec.realtime
+
+    def max_window_seconds(self) -> float | None:
+        return self.spec.window_seconds
+
+    def is_thread_safe(self) -> bool:
+        return True
+
+
+class RemoteTTSAdapter(TTSAdapter):
+
+    def __init__(self, client: ModelServerClient, alias: str, spec: AdapterSpec) -> None:
+        self._client = client
+        self._alias = alias
+        self.spec = spec
+
+    @staticmethod
+    def detect(config: dict) -> bool:
+        return False
+
+    def load(self, model_path: str, device: str, **kwargs) -> None:
+        self._client.call("load", self._alias)
+
+    def unload(self) -> None:
+        pass
+
+    def _call(self, method: str, **kwargs):
+        return self._client.call("call", self._alias, method, kwargs)
+
+    def synthesize(self, text: str, voice: str, speed: float, response_format: str) -> bytes:
+        return self._call("synthesize", text=text, voice=voice, speed=speed, response_format=response_format)
+
+    async def synthesize_stream(
+        self, text: str, voice: str, speed: float, response_format: str
+    ) -> AsyncIterator[bytes]:
+        yield self.synthesize(text, voice, speed, response_format)
+
+    def synthesize_with_reference(
+        self, text: str, reference_audio: np.ndarray, transcript: str, speed: float, response_format: str
+    ) -> bytes:
+        return self._call(
+            "synthesize_with_reference",
+            text=text,
+            reference_audio=reference_audio,
+            transcript=transcript,
+            speed=speed,
+            response_format=response_format,
+        )
+
+    def synthesize_raw(self, text: str, voice: str, speed: float) -> tuple[np.ndarray, int]:
+        return self._call("synthesize_raw", text=text, voice=voice, speed=speed)
+
+    def synthesize_raw_stream(
+        self, text: str, voice: str, speed: float
+    ) -> Iterator[tuple[np.ndarray, int]]:
+        return self._client.stream(
+            "synthesize_raw_stream", self._alias, {"text": text, "voice": voice, "speed": speed}
+        )
+
+    def synthesize_raw_with_reference(
+        self,
+        text: str,
+        reference_audio: np.ndarray,
+        transcript: str,
+        speed: float,
+        voice_id: str | None = None,
+        reference_revision: str = "",
+    ) -> tuple[np.ndarray, int]:
+        return self._call(
+            "synthesize_raw_with_reference",
+            text=text,
+            reference_audio=reference_audio,
+            transcript=transcript,
+            speed=speed,
+            voice_id=voice_id,
+            reference_revision=reference_revision,
+        )
+
+    def forget_voice(self, voice_id: str) -> None:
+        pass
+
+    def get_available_voices(self) -> list[str]:
+        return self.spec.voices
+
+    def get_sample_rate(self) -> int:
+        return self.spec.sample_rate
+
+    def supports_streaming(self) -> bool:
+        return self.spec.streaming
+
+    def supports_voice_cloning(self) -> bool:
+        return self.spec.voice_cloning
+
+    def is_thread_safe(self) -> bool:
+        return True
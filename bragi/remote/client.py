@@ -0,0 +1,81 @@
+from __future__ import annotations
+
+import queue
+from multiprocessing.connection import Client, Connection
+from typing import Any, Iterator
+
+from bragi.remote.protocol import ModelServerError, raise_remote
+from bragi.remote.shm import receive, release, share
+
+
+class ModelServerClient:
+    def __init__(self, address: str, authkey: str | None = None) -> None:
+        self.address = address
+        self._authkey = authkey.encode() if authkey else None
+        self._idle: queue.SimpleQueue[Connection] = queue.SimpleQueue()
+
+    def connect(self) -> Connection:
+        return Client(self.address, family="AF_UNIX", authkey=self._authkey)
+
+    def _checkout(self) -> Connection:
+        try:
+            return self._idle.get_nowait()
+        except queue.Empty:
+            return self.connect()
+
+    def call(self, op: str, *args: Any) -> Any:
+        conn = self._checkout()
+        try:
+            reply = exchange(conn, op, *args)
+        except (OSError, EOFError):
+            conn.close()
+            raise ModelServerError("Lost connection to the model server")
+        self._idle.put(conn)
+        return unwrap(reply)
+
+    def stream(self, op: str, *args: Any) -> Iterator[Any]:
+        conn = self._checkout()
+        segments = []
+        finished = False
+        try:
+            conn.send((op, *(share(arg, segments) for arg in args)))
+            while True:
+                kind, value = conn.recv()
+                if kind == "item":
+                    yield receive(value)
+                    continue
+                finished = True
+                if kind == "error":
+                    raise_remote(value)
+                return
+        except (OSError, EOFError):
+            raise ModelServerError("Lost connection to the model server")
+        finally:
+            release(segments)
+            if finished:
+                self._idle.put(conn)
+            else:
+                conn.close()
+
+    def close(self) -> None:
+        while True:
+            try:
+                self._idle.get_nowait().close()
+            except queue.Empty:
+                return
+
+
+def exchange(conn: Connection, op: str, *args: Any) -> tuple[str, Any]:
+    segments = []
+    try:
+        conn.send((op, *(share(arg, segments) for arg in args)))
+        return conn.recv()
+    finally:
+        release(segments)
+
+
+def unwrap(reply: tuple[str, Any]) -> Any:
+    kind, value = reply
+    if kind == "error":
+        raise_remote(value)
+    return receive(value)
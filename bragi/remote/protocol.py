@@ -0,0 +1,47 @@
+from __future__ import annotations
+
+import builtins
+from dataclasses import dataclass
+from typing import Any
+
+from bragi.registry import ModelInfo
+from bragi.schemas.errors import BragiError
+
+
+@dataclass
+class AdapterSpec:
+    info: ModelInfo
+    sample_rate: int
+    streaming: bool
+    languages: list[str]
+    voices: list[str]
+    translation: bool = False
+    realtime: bool = False
+    window_seconds: float | None = None
+    voice_cloning: bool = False
+
+
+def error_info(e: Exception) -> tuple[str, Any]:
+    if isinstance(e, BragiError):
+        return "BragiError", {
+            "message": e.message,
+            "status_code": e.status_code,
+            "error_type": e.error_type,
+            "param": e.param,
+            "code": e.code,
+        }
+    return type(e).__name__, str(e)
+
+
+class ModelServerError(RuntimeError):
+    pass
+
+
+def raise_remote(error: tuple[str, Any]) -> None:
+    kind, detail = error
+    if kind == "BragiError":
+        raise BragiError(**detail)
+    exc_type = getattr(builtins, kind, None)
+    if isinstance(exc_type, type) and issubclass(exc_type, Exception):
+        raise exc_type(detail)
+    raise ModelServerError(f"{kind}: {detail}")
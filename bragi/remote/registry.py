@@ -0,0 +1,82 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+
+from bragi.config import BragiConfig, ModelConfig
+from bragi.registry import ModelRegistry
+from bragi.remote.adapters import RemoteSTTAdapter, RemoteTTSAdapter
+from bragi.remote.client import ModelServerClient
+from bragi.remote.protocol import AdapterSpec
+
+logger = logging.getLogger("bragi.remote")
+
+
+class RemoteRegistry(ModelRegistry):
+    def __init__(self, client: ModelServerClient, sync_interval: float = 2.0) -> None:
+        super().__init__()
+        self._client = client
+        self._sync_interval = sync_interval
+        self._sync: asyncio.Task | None = None
+        self._remote: dict[str, RemoteSTTAdapter | RemoteTTSAdapter] = {}
+
+    async def attach(self, config: BragiConfig) -> None:
+        catalog: dict[str, AdapterSpec] = await asyncio.to_thread(self._client.call, "catalog")
+        for alias, spec in catalog.items():
+            model_config = config.models.get(alias) or ModelConfig(repo=spec.info.repo or alias)
+            local_config = model_config.model_copy(update={
+                "concurrency": max(1, model_config.concurrency) * max(1, model_config.batch_size),
+                "batch_size": 1,
+                "memory": None,
+                "window_seconds": None,
+            })
+            if spec.info.model_type == "stt":
+                adapter = RemoteSTTAdapter(self._client, alias, spec)
+                self.register_stt(alias, adapter, spec.info, local_config)
+            else:
+                adapter = RemoteTTSAdapter(self._client, alias, spec)
+                self.register_tts(alias, adapter, spec.info, local_config)
+            self._remote[alias] = adapter
+
+        self._startup_complete = await asyncio.to_thread(self._client.call, "ready")
+        self._sync = asyncio.get_running_loop().create_task(self._follow())
+        logger.info("Attached to model server at %s (%d models)", self._client.address, len(catalog))
+
+    async def refresh(self) -> None:
+        catalog: dict[str, AdapterSpec] = await asyncio.to_thread(self._client.call, "catalog")
+        for alias, spec in catalog.items():
+            adapter = self._remote.get(alias)
+            if adapter is None:
+                continue
+            adapter.spec = spec
+            info = self._model_info[alias]
+            info.status = spec.info.status
+            info.memory = spec.info.memory
+            info.load_started = spec.info.load_started
+            info.load_time = spec.info.load_time
+            info.error = spec.info.error
+            if isinstance(adapter, RemoteTTSAdapter):
+                self._index_voices(alias, adapter)
+        self._startup_complete = await asyncio.to_thread(self._client.call, "ready")
+
+    async def _follow(self) -> None:
+        while True:
+            await asyncio.sleep(self._sync_interval)
+            try:
+                await self.refresh()
+            except Exception:
+                logger.exception("Failed to refresh model state from the model server")
+
+    async def forget_voice(self, voice_id: str) -> None:
+        await asyncio.to_thread(self._client.call, "forget_voice", voice_id)
+
+    async def profile_model_server(self, seconds: float, interval: float, include_idle: bool) -> str:
+        return await asyncio.to_thread(self._client.call, "profile", seconds, interval, include_idle)
+
+    def unload_all(self) -> None:
+        if self._sync is not None:
+            self._sync.cancel()
+            self._sync = None
+        super().unload_all()
+        self._remote.clear()
+        self._client.close()
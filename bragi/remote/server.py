@@ -0,0 +1,301 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+import multiprocessing
+import os
+import queue
+import secrets
+import signal
+import tempfile
+import threading
+import time
+import uuid
+from multiprocessing.connection import Client, Connection, Listener
+from typing import Any
+
+from bragi.adapters.stt import RealtimeSession, STTAdapter
+from bragi.adapters.tts import TTSAdapter
+from bragi.bootstrap import build_registry, start_registry
+from bragi.config import load_config
+from bragi.profiling import sample_stacks
+from bragi.registry import ModelRegistry
+from bragi.remote.protocol import AdapterSpec, error_info
+from bragi.remote.shm import receive, release, share
+from bragi.schemas.errors import UnsupportedFeatureError
+
+logger = logging.getLogger("bragi.remote")
+
+_CALLS = {
+    "transcribe",
+    "transcribe_batch",
+    "translate",
+    "synthesize",
+    "synthesize_raw",
+    "synthesize_with_reference",
+    "synthesize_raw_with_reference",
+}
+_STREAMS = {"transcribe_stream", "translate_stream", "synthesize_raw_stream"}
+_SESSION_CALLS = {"accept", "finish"}
+
+
+def _send(conn: Connection, kind: str, value: Any, segments: list[str]) -> None:
+    sent: list[str] = []
+    try:
+        conn.send((kind, share(value, sent)))
+    except BaseException:
+        release(sent)
+        raise
+    segments.extend(sent)
+
+
+class ModelServer:
+    def __init__(self, registry: ModelRegistry, address: str, authkey: str | None = None) -> None:
+        self._registry = registry
+        self._address = address
+        self._authkey = authkey.encode() if authkey else None
+        self._listener: Listener | None = None
+        self._loop: asyncio.AbstractEventLoop | None = None
+
+    def start(self) -> None:
+        self._loop = asyncio.get_running_loop()
+        if os.path.exists(self._address):
+            os.unlink(self._address)
+        self._listener = Listener(self._address, family="AF_UNIX", authkey=self._authkey)
+        os.chmod(self._address, 0o600)
+        threading.Thread(target=self._accept, name="bragi-model-server", daemon=True).start()
+        logger.info("Model server listening on %s", self._address)
+
+    def close(self) -> None:
+        if self._listener is not None:
+            self._listener.close()
+            self._listener = None
+
+    def _accept(self) -> None:
+        while self._listener is not None:
+            try:
+                conn = self._listener.accept()
+            except multiprocessing.AuthenticationError:
+                logger.warning("Rejected model server connection with a bad key")
+                continue
+            except OSError:
+                return
+            threading.Thread(target=self._serve, args=(conn,), daemon=True).start()
+
+    def _serve(self, conn: Connection) -> None:
+        sessions: dict[str, tuple[str, RealtimeSession]] = {}
+        segments: list[str] = []
+        try:
+            while True:
+                op, *args = conn.recv()
+                release(segments)
+                segments.clear()
+                if op in _STREAMS:
+                    self._stream(conn, segments, op, *args)
+                    continue
+                try:
+                    result = self._execute(op, args, sessions)
+                except Exception as e:
+                    conn.send(("error", error_info(e)))
+                    continue
+                _send(conn, "ok", result, segments)
+        except (EOFError, OSError):
+            pass
+        finally:
+            release(segments)
+            for alias, session in sessions.values():
+                self._run(self._close_realtime(alias, session))
+            conn.close()
+
+    def _run(self, coro) -> Any:
+        return asyncio.run_coroutine_threadsafe(coro, self._loop).result()
+
+    def _adapter(self, alias: str) -> STTAdapter | TTSAdapter:
+        try:
+            return self._registry.get_stt(alias)
+        except KeyError:
+            return self._registry.get_tts(alias)
+
+    def _execute(self, op: str, args: list, sessions: dict[str, tuple[str, RealtimeSession]]) -> Any:
+        if op == "ping":
+            return "pong"
+        if op == "catalog":
+            return self._run(self._catalog())
+        if op == "ready":
+            return self._registry.is_ready()
+        if op == "load":
+            (alias,) = args
+            return self._run(self._registry.ensure_loaded(alias))
+        if op == "forget_voice":
+            (voice_id,) = args
+            return self._run(self._forget_voice(voice_id))
+        if op == "profile":
+            seconds, interval, include_idle = args
+            return sample_stacks(seconds, interval, include_idle)
+        if op == "call":
+            alias, method, kwargs = args
+            if method not in _CALLS:
+                raise ValueError(f"Unsupported model server call: {method}")
+            return self._run(self._call(alias, method, receive(kwargs)))
+        if op == "open_realtime":
+            alias, language, word_timestamps = args
+            session = self._run(self._open_realtime(alias, language, word_timestamps))
+            session_id = uuid.uuid4().hex
+            sessions[session_id] = (alias, session)
+            return session_id
+        if op == "session":
+            session_id, method, session_args = args
+            alias, session = sessions[session_id]
+            if method == "close":
+                sessions.pop(session_id)
+                return self._run(self._close_realtime(alias, session))
+            if method not in _SESSION_CALLS:
+                raise ValueError(f"Unsupported session call: {method}")
+            executor = self._registry.get_realtime_executor(alias)
+            return self._run(executor.run(getattr(session, method), *session_args))
+        raise ValueError(f"Unknown model server operation: {op}")
+
+    async def _catalog(self) -> dict[str, AdapterSpec]:
+        catalog = {}
+        for info in self._registry.list_models():
+            adapter = self._adapter(info.alias)
+            if isinstance(adapter, STTAdapter):
+                spec = AdapterSpec(
+                    info=info,
+                    sample_rate=adapter.get_sample_rate(),
+                    streaming=adapter.supports_streaming(),
+                    languages=adapter.get_supported_languages(),
+                    voices=[],
+                    translation=adapter.supports_translation(),
+                    realtime=adapter.supports_realtime(),
+                    window_seconds=self._registry.get_window_seconds(info.alias),
+                )
+            else:
+                spec = AdapterSpec(
+                    info=info,
+                    sample_rate=adapter.get_sample_rate(),
+                    streaming=adapter.supports_streaming(),
+                    languages=[],
+                    voices=adapter.get_available_voices(),
+                    voice_cloning=adapter.supports_voice_cloning(),
+                )
+            catalog[info.alias] = spec
+        return catalog
+
+    async def _forget_voice(self, voice_id: str) -> None:
+        await self._registry.forget_voice(voice_id)
+
+    async def _open_realtime(self, alias: str, language: str | None, word_timestamps: bool) -> RealtimeSession:
+        adapter = self._registry.get_stt(alias)
+        if not adapter.supports_realtime():
+            raise UnsupportedFeatureError("realtime transcription", alias)
+        await self._registry.acquire(alias)
+        try:
+            return await self._registry.get_realtime_executor(alias).run(
+                adapter.open_realtime, language, word_timestamps
+            )
+        except BaseException:
+            self._registry.release(alias)
+            raise
+
+    async def _close_realtime(self, alias: str, session: RealtimeSession) -> None:
+        try:
+            await self._registry.get_realtime_executor(alias).run(session.close)
+        finally:
+            self._registry.release(alias)
+
+    async def _call(self, alias: str, method: str, kwargs: dict) -> Any:
+        async with self._registry.use(alias):
+            if method == "transcribe":
+                return await self._registry.get_scheduler(alias).transcribe(**kwargs)
+            adapter = self._adapter(alias)
+            return await self._registry.get_executor(alias).run(getattr(adapter, method), **kwargs)
+
+    def _stream(self, conn: Connection, segments: list[str], method: str, alias: str, kwargs: dict) -> None:
+        items: queue.SimpleQueue = queue.SimpleQueue()
+        kwargs = receive(kwargs)
+
+        async def produce() -> None:
+            async with self._registry.use(alias):
+                adapter = self._adapter(alias)
+                async for item in self._registry.get_executor(alias).iterate(
+                    getattr(adapter, method), **kwargs
+                ):
+                    items.put(("item", item))
+
+        future = asyncio.run_coroutine_threadsafe(produce(), self._loop)
+        future.add_done_callback(lambda _: items.put(("done", None)))
+        try:
+            while True:
+                kind, item = items.get()
+                if kind == "done":
+                    break
+                _send(conn, "item", item, segments)
+        except (OSError, EOFError):
+            future.cancel()
+            raise
+
+        error = future.exception() if not future.cancelled() else None
+        conn.send(("error", error_info(error)) if error else ("end", None))
+
+
+async def serve(address: str, authkey: str | None = None) -> None:
+    config = load_config()
+    logging.basicConfig(
+        level=getattr(logging, config.server.log_level.upper(), logging.INFO),
+        format="%(asctime)s %(levelname)s %(name)s: %(message)s",
+    )
+
+    registry = build_registry(config)
+    await start_registry(registry, config)
+
+    server = ModelServer(registry, address, authkey)
+    server.start()
+
+    stop = asyncio.Event()
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        loop.add_signal_handler(sig, stop.set)
+
+    try:
+        await stop.wait()
+    finally:
+        server.close()
+        registry.unload_all()
+        logger.info("Model server stopped")
+
+
+def run() -> None:
+    config = load_config()
+    if not config.server.model_server:
+        raise SystemExit("Set server.model_server (BRAGI_MODEL_SERVER) to the socket path to listen on")
+    asyncio.run(serve(config.server.model_server, config.server.model_server_key))
+
+
+def spawn_model_server(timeout: float = 3600.0) -> multiprocessing.Process:
+    address = os.path.join(tempfile.mkdtemp(prefix="bragi-"), "models.sock")
+    authkey = secrets.token_hex(16)
+    os.environ["BRAGI_MODEL_SERVER"] = address
+    os.environ["BRAGI_MODEL_SERVER_KEY"] = authkey
+
+    process = multiprocessing.get_context("spawn").Process(target=run, name="bragi-models")
+    process.start()
+
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if not process.is_alive():
+            raise SystemExit("Model server exited during startup")
+        try:
+            conn = Client(address, family="AF_UNIX", authkey=authkey.encode())
+        except (FileNotFoundError, ConnectionRefusedError):
+            time.sleep(0.5)
+            continue
+        conn.close()
+        return process
+
+    process.terminate()
+    raise SystemExit("Timed out waiting for the model server to start")
+
+
+if __name__ == "__main__":
+    run()
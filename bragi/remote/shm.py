@@ -0,0 +1,62 @@
+from __future__ import annotations
+
+import os
+import tempfile
+import uuid
+from dataclasses import dataclass
+from typing import Any
+
+import numpy as np
+
+INLINE_BYTES = 64 * 1024
+
+SHM_DIR = "/dev/shm" if os.path.isdir("/dev/shm") else tempfile.gettempdir()
+
+
+@dataclass(frozen=True)
+class SharedArray:
+    path: str
+    shape: tuple[int, ...]
+    dtype: str
+
+
+def share(obj: Any, segments: list[str]) -> Any:
+    if isinstance(obj, np.ndarray):
+        if obj.nbytes < INLINE_BYTES:
+            return obj
+        path = os.path.join(SHM_DIR, f"bragi-{uuid.uuid4().hex}")
+        segments.append(path)
+        mapped = np.memmap(path, dtype=obj.dtype, mode="w+", shape=obj.shape)
+        mapped[...] = obj
+        del mapped
+        return SharedArray(path, obj.shape, obj.dtype.str)
+    if isinstance(obj, tuple):
+        return tuple(share(item, segments) for item in obj)
+    if isinstance(obj, list):
+        return [share(item, segments) for item in obj]
+    if isinstance(obj, dict):
+        return {key: share(value, segments) for key, value in obj.items()}
+    return obj
+
+
+def receive(obj: Any) -> Any:
+    if isinstance(obj, SharedArray):
+        try:
+            return np.memmap(obj.path, dtype=np.dtype(obj.dtype), mode="c", shape=obj.shape).view(np.ndarray)
+        finally:
+            os.unlink(obj.path)
+    if isinstance(obj, tuple):
+        return tuple(receive(item) for item in obj)
+    if isinstance(obj, list):
+        return [receive(item) for item in obj]
+    if isinstance(obj, dict):
+        return {key: receive(value) for key, value in obj.items()}
+    return obj
+
+
+def release(segments: list[str]) -> None:
+    for path in segments:
+        try:
+            os.unlink(path)
+        except FileNotFoundError:
+            pass
@@ -0,0 +1,78 @@
+from fastapi import APIRouter, Request
+from fastapi.responses import PlainTextResponse
+
+from bragi.remote.registry import RemoteRegistry
+from bragi.schemas.errors import InvalidRequestError, ProfileNotFoundError
+
+router = APIRouter()
+
+MAX_PROFILE_SECONDS = 300.0
+
+
+def _check_seconds(seconds: float) -> None:
+    if not 0 < seconds <= MAX_PROFILE_SECONDS:
+        raise InvalidRequestError(
+            f"'seconds' must be greater than 0 and at most {MAX_PROFILE_SECONDS:g}.", param="seconds"
+        )
+
+
+@router.get("/admin/profile/cpu")
+async def profile_cpu(
+    request: Request,
+    seconds: float = 10.0,
+    interval: float = 0.01,
+    idle: bool = False,
+    process: str = "worker",
+):
+    _check_seconds(seconds)
+    if not 0.001 <= interval <= 1.0:
+        raise InvalidRequestError("'interval' must be between 0.001 and 1.", param="interval")
+
+    if process == "worker":
+        stacks = await request.app.state.profiler.sample(seconds, interval, idle)
+    elif process == "model_server":
+        registry = request.app.state.registry
+        if not isinstance(registry, RemoteRegistry):
+            raise InvalidRequestError("This worker is not attached to a model server.", param="process")
+        stacks = await registry.profile_model_server(seconds, interval, idle)
+    else:
+        raise InvalidRequestError("'process' must be 'worker' or 'model_server'.", param="process")
+
+    return PlainTextResponse(stacks)
+
+
+@router.get("/admin/profile/memory")
+async def profile_memory(request: Request, seconds: float = 10.0, limit: int = 25):
+    _check_seconds(seconds)
+    if limit < 1:
+        raise InvalidRequestError("'limit' must be at least 1.", param="limit")
+    return await request.app.state.profiler.allocations(seconds, limit)
+
+
+@router.get("/admin/profiles")
+async def list_profiles(request: Request):
+    return {
+        "data": [
+            {
+                "id": profile.id,
+                "method": profile.method,
+                "path": profile.path,
+                "created_at": profile.created_at,
+                "duration": round(profile.duration, 6),
+                "status": profile.status,
+            }
+            for profile in request.app.state.profiler.list_all()
+        ]
+    }
+
+
+@router.get("/admin/profiles/{profile_id}")
+async def get_profile(request: Request, profile_id: str, format: str = "json"):
+    profile = request.app.state.profiler.get(profile_id)
+    if profile is None:
+        raise ProfileNotFoundError(profile_id)
+    if format == "collapsed":
+        return PlainTextResponse(profile.stacks or "")
+    if format != "json":
+        raise InvalidRequestError("'format' must be 'json' or 'collapsed'.", param="format")
+    return profile.to_dict()
@@ -1,72 +1,228 @@
-import numpy as np
-from fastapi import APIRouter, Request
-from fastapi.responses import Response
+import base64
+import json
 
-from bragi.audio.chunking import chunk_text
-from bragi.audio.encoding import CONTENT_TYPES, encode_audio
-from bragi.schemas.errors import InvalidModelError, InvalidVoiceError, ModelNotLoadedError
-from bragi.schemas.requests import SpeechRequest
+from fastapi import APIRouter, Request, WebSocket, WebSocketDisconnect
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import Response, StreamingResponse
+from pydantic import ValidationError
+
+from bragi.adapters.tts import TTSAdapter
+from bragi.audio.chunking import SentenceSegmenter, chunk_text
+from bragi.audio.encoding import ChunkEncoder, StreamEncoder
+from bragi.metrics import request_timings
+from bragi.schemas.errors import (
+    BragiError,
+    InvalidModelError,
+    InvalidRequestError,
+    InvalidVoiceError,
+    ModelNotLoadedError,
+    UnsupportedFeatureError,
+)
+from bragi.schemas.requests import SpeechRequest, SpeechSessionRequest
+from bragi.schemas.responses import format_sse
+from bragi.synthesis import synthesize_chunks
+from bragi.voices.store import CustomVoice
 
 router = APIRouter()
 
 
-@router.post("/audio/speech")
-async def create_speech(request: Request, body: SpeechRequest):
-    registry = request.app.state.registry
-    voice_store = request.app.state.voice_store
+def _stream_encoder(response_format: str) -> StreamEncoder:
+    try:
+        return StreamEncoder(response_format)
+    except ValueError:
+        raise InvalidRequestError(
+            f"Unsupported streaming output format: {response_format}.", param="response_format"
+        )
+
 
-    custom_voice = await voice_store.get_by_name(body.voice)
+async def _resolve_voice(registry, voice_store, model: str | None, voice: str) -> tuple[str, TTSAdapter, CustomVoice | None]:
+    custom_voice = None
+    if not registry.is_builtin_voice(voice):
+        custom_voice = await voice_store.get_by_name(voice)
 
-    if body.model:
-        if not registry.has_model(body.model):
-            raise InvalidModelError(body.model)
+    if model:
+        if not registry.has_model(model):
+            raise InvalidModelError(model)
         try:
-            adapter = registry.get_tts(body.model)
+            adapter = registry.get_tts(model)
         except KeyError:
-            raise ModelNotLoadedError(body.model)
+            raise ModelNotLoadedError(model)
+        alias = model
     elif custom_voice and custom_voice.adapter_alias:
         try:
             adapter = registry.get_tts(custom_voice.adapter_alias)
         except KeyError:
             raise ModelNotLoadedError(custom_voice.adapter_alias)
+        alias = custom_voice.adapter_alias
     else:
         try:
-            _, adapter = registry.get_tts_by_voice(body.voice)
+            alias, adapter = registry.get_tts_by_voice(voice)
         except KeyError:
-            raise InvalidVoiceError(body.voice)
+            raise InvalidVoiceError(voice)
 
-    chunks = chunk_text(body.input)
+    if not custom_voice:
+        available_voices = adapter.get_available_voices()
+        if available_voices and voice not in available_voices:
+            raise InvalidVoiceError(voice)
 
-    if custom_voice:
-        reference_audio = voice_store.get_reference_audio(custom_voice.id)
-        audio_arrays = []
-        sample_rate = None
-        for chunk in chunks:
-            audio, sr = adapter.synthesize_raw_with_reference(
-                text=chunk,
-                reference_audio=reference_audio,
-                transcript=custom_voice.transcript,
-                speed=body.speed,
-            )
-            audio_arrays.append(audio)
-            sample_rate = sr
+    return alias, adapter, custom_voice
+
+
+@router.post("/audio/speech")
+async def create_speech(request: Request, body: SpeechRequest):
+    registry = request.app.state.registry
+    voice_store = request.app.state.voice_store
+
+    alias, adapter, custom_voice = await _resolve_voice(registry, voice_store, body.model, body.voice)
+    timings = request_timings(request)
+    timings.model = alias
+
+    if body.stream or body.stream_format == "sse":
+        encoder = _stream_encoder(body.response_format)
     else:
-        available_voices = adapter.get_available_voices()
-        if available_voices and body.voice not in available_voices:
-            raise InvalidVoiceError(body.voice)
-
-        audio_arrays = []
-        sample_rate = None
-        for chunk in chunks:
-            audio, sr = adapter.synthesize_raw(
-                text=chunk,
+        encoder = ChunkEncoder(body.response_format)
+
+    reference_audio = None
+    reference_revision = ""
+    transcript = ""
+    if custom_voice:
+        reference_audio = await voice_store.get_reference_audio(custom_voice.id, adapter.get_sample_rate())
+        reference_revision = voice_store.reference_revision(custom_voice.id)
+        transcript = custom_voice.transcript
+
+    await registry.ensure_loaded(alias)
+
+    async def synthesize():
+        async with registry.use(alias):
+            async for item in synthesize_chunks(
+                adapter,
+                registry.get_executor(alias),
+                chunk_text(body.input),
                 voice=body.voice,
                 speed=body.speed,
-            )
-            audio_arrays.append(audio)
-            sample_rate = sr
+                reference_audio=reference_audio,
+                transcript=transcript,
+                voice_id=custom_voice.id if custom_voice else None,
+                reference_revision=reference_revision,
+                cache=request.app.state.speech_cache,
+            ):
+                timings.audio_seconds += len(item[0]) / item[1]
+                yield item
+
+    audio_chunks = synthesize()
+
+    async def encode(fn, *args):
+        with timings.measure("encode"):
+            return await run_in_threadpool(fn, *args)
+
+    async def encoded_stream(encoder: StreamEncoder):
+        async for audio, sr in audio_chunks:
+            encoded = await encode(encoder.encode, audio, sr)
+            if encoded:
+                yield encoded
+        tail = await encode(encoder.flush)
+        if tail:
+            yield tail
+
+    if body.stream_format == "sse":
+        async def sse_stream():
+            async for encoded in encoded_stream(encoder):
+                yield format_sse({"type": "audio.delta", "delta": base64.b64encode(encoded).decode()})
+            yield format_sse({"type": "audio.done"})
+
+        return StreamingResponse(sse_stream(), media_type="text/event-stream")
+
+    if body.stream:
+        return StreamingResponse(encoded_stream(encoder), media_type=encoder.content_type)
+
+    async for audio, sr in audio_chunks:
+        await encode(encoder.add, audio, sr)
+    audio_bytes = await encode(encoder.finish)
 
-    combined_audio = np.concatenate(audio_arrays)
-    audio_bytes, content_type = encode_audio(combined_audio, sample_rate, body.response_format)
+    return Response(content=audio_bytes, media_type=encoder.content_type)
 
-    return Response(content=audio_bytes, media_type=content_type)
+
+def _session_params(websocket: WebSocket) -> SpeechSessionRequest:
+    try:
+        params = SpeechSessionRequest.model_validate(dict(websocket.query_params))
+    except ValidationError as e:
+        error = e.errors()[0]
+        param = str(error["loc"][0]) if error["loc"] else None
+        raise InvalidRequestError(f"Invalid parameter '{param}': {error['msg']}.", param=param)
+    return params
+
+
+def _text_event(text: str) -> dict:
+    try:
+        event = json.loads(text)
+    except json.JSONDecodeError:
+        return {}
+    return event if isinstance(event, dict) else {}
+
+
+@router.websocket("/audio/speech/realtime")
+async def realtime_speech(websocket: WebSocket):
+    registry = websocket.app.state.registry
+    voice_store = websocket.app.state.voice_store
+    await websocket.accept()
+
+    async def send_error(error: BragiError) -> None:
+        await websocket.send_json({"type": "error", **error.to_response().model_dump()})
+        await websocket.close(code=1008)
+
+    try:
+        params = _session_params(websocket)
+        encoder = _stream_encoder(params.response_format)
+        alias, adapter, custom_voice = await _resolve_voice(registry, voice_store, params.model, params.voice)
+        reference_audio = None
+        reference_revision = ""
+        transcript = ""
+        if custom_voice:
+            reference_audio = await voice_store.get_reference_audio(custom_voice.id, adapter.get_sample_rate())
+            reference_revision = voice_store.reference_revision(custom_voice.id)
+            transcript = custom_voice.transcript
+        await registry.ensure_loaded(alias)
+    except BragiError as e:
+        await send_error(e)
+        return
+
+    async def committed_chunks():
+        segmenter = SentenceSegmenter()
+        while True:
+            event = _text_event(await websocket.receive_text())
+            if event.get("type") == "input_text.delta":
+                for chunk in segmenter.push(str(event.get("delta", ""))):
+                    yield chunk
+            elif event.get("type") == "input_text.done":
+                for chunk in segmenter.flush():
+                    yield chunk
+                return
+
+    try:
+        async with registry.use(alias):
+            async for audio, sr in synthesize_chunks(
+                adapter,
+                registry.get_executor(alias),
+                committed_chunks(),
+                voice=params.voice,
+                speed=params.speed,
+                reference_audio=reference_audio,
+                transcript=transcript,
+                voice_id=custom_voice.id if custom_voice else None,
+                reference_revision=reference_revision,
+                cache=websocket.app.state.speech_cache,
+            ):
+                encoded = await run_in_threadpool(encoder.encode, audio, sr)
+                if encoded:
+                    await websocket.send_bytes(encoded)
+        tail = await run_in_threadpool(encoder.flush)
+        if tail:
+            await websocket.send_bytes(tail)
+        await websocket.send_json({"type": "audio.done"})
+        await websocket.close()
+    except WebSocketDisconnect:
+        return
+    except BragiError as e:
+        await send_error(e)
+    except NotImplementedError:
+        await send_error(UnsupportedFeatureError("voice cloning" if custom_voice else "speech synthesis", alias))
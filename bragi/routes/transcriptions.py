@@ -1,14 +1,22 @@
-from fastapi import APIRouter, File, Form, Request, UploadFile
-from fastapi.responses import PlainTextResponse
+import json
+from typing import AsyncIterator
 
-from bragi.adapters.stt import TranscriptResult
-from bragi.audio.decoding import decode_audio
-from bragi.config import parse_file_size
+import numpy as np
+import soxr
+from fastapi import APIRouter, Request, WebSocket, WebSocketDisconnect
+from fastapi.responses import PlainTextResponse, StreamingResponse
+
+from bragi.adapters.stt import RealtimeUpdate, Segment, TranscriptResult
+from bragi.audio.decoding import TARGET_SAMPLE_RATE
+from bragi.audio.upload import AudioUpload, multipart_openapi, receive_audio_upload
+from bragi.longform import stream_long, transcribe_long
+from bragi.metrics import request_timings
 from bragi.schemas.errors import (
-    FileTooLargeError,
-    InvalidFileFormatError,
+    BragiError,
     InvalidModelError,
+    InvalidRequestError,
     ModelNotLoadedError,
+    UnsupportedFeatureError,
 )
 from bragi.schemas.responses import (
     SegmentResponse,
@@ -16,6 +24,7 @@ from bragi.schemas.responses import (
     TranscriptionVerboseResponse,
     WordResponse,
     format_srt,
+    format_sse,
     format_vtt,
 )
 
@@ -50,50 +59,122 @@ def _result_to_words(result: TranscriptResult) -> list[WordResponse]:
     ]
 
 
-@router.post("/audio/transcriptions")
-async def create_transcription(
-    request: Request,
-    file: UploadFile = File(...),
-    model: str = Form(...),
-    language: str | None = Form(None),
-    prompt: str | None = Form(None),
-    response_format: str = Form("json"),
-    temperature: float = Form(0.0),
-    stream: bool = Form(False),
-    timestamp_granularities: list[str] | None = Form(None, alias="timestamp_granularities[]"),
-):
+async def _stream_events(segments: AsyncIterator[Segment], word_timestamps: bool) -> AsyncIterator[str]:
+    parts: list[str] = []
+    async for seg in segments:
+        text = seg.text.strip()
+        if not text:
+            continue
+        delta = f" {text}" if parts else text
+        parts.append(text)
+
+        event = {"type": "transcript.text.delta", "delta": delta}
+        if word_timestamps:
+            event["words"] = [
+                {"word": w.word, "start": w.start, "end": w.end}
+                for w in seg.words or []
+            ]
+        yield format_sse(event)
+
+    yield format_sse({"type": "transcript.text.done", "text": " ".join(parts)})
+
+
+_OPENAPI = multipart_openapi(
+    {
+        "file": {"type": "string", "format": "binary"},
+        "model": {"type": "string"},
+        "language": {"type": "string"},
+        "prompt": {"type": "string"},
+        "response_format": {"type": "string", "default": "json"},
+        "temperature": {"type": "number", "default": 0.0},
+        "stream": {"type": "boolean", "default": False},
+        "timestamp_granularities[]": {"type": "array", "items": {"type": "string"}},
+    },
+    required=["file", "model"],
+)
+
+
+@router.post("/audio/transcriptions", openapi_extra=_OPENAPI)
+async def create_transcription(request: Request):
     registry = request.app.state.registry
     config = request.app.state.config
 
-    if not registry.has_model(model):
-        raise InvalidModelError(model)
+    def validate(form: AudioUpload) -> None:
+        model = form.require("model")
+        if not registry.has_model(model):
+            raise InvalidModelError(model)
 
-    try:
-        adapter = registry.get_stt(model)
-    except KeyError:
-        raise ModelNotLoadedError(model)
+    upload = await receive_audio_upload(
+        request, config.server.max_file_size, request.app.state.decoder_pool, validate=validate
+    )
+    audio = upload.audio
 
-    data = await file.read()
+    model = upload.require("model")
+    language = upload.get("language")
+    response_format = upload.get("response_format", "json")
+    temperature = upload.get_float("temperature", 0.0)
+    stream = upload.get_bool("stream", False)
+    timestamp_granularities = upload.get_list("timestamp_granularities[]")
 
-    max_size = parse_file_size(config.server.max_file_size)
-    if len(data) > max_size:
-        raise FileTooLargeError(config.server.max_file_size)
+    timings = request_timings(request)
+    timings.model = model
 
     try:
-        audio = decode_audio(data, file.filename)
-    except ValueError:
-        raise InvalidFileFormatError()
+        adapter = registry.get_stt(model)
+    except KeyError:
+        raise ModelNotLoadedError(model)
 
     word_timestamps = bool(
         timestamp_granularities and "word" in timestamp_granularities
     )
 
-    result = adapter.transcribe(
-        audio=audio,
-        language=language,
-        temperature=temperature,
-        word_timestamps=word_timestamps,
-    )
+    window = registry.get_window_seconds(model)
+    long_audio = window is not None and len(audio) > window * TARGET_SAMPLE_RATE
+    scheduler = registry.get_scheduler(model)
+    concurrency = registry.get_executor(model).max_workers * scheduler.max_batch_size
+    timestamps = long_audio or response_format not in ("json", "text")
+
+    async def run_window(chunk):
+        return await scheduler.transcribe(
+            audio=chunk,
+            language=language,
+            temperature=temperature,
+            word_timestamps=word_timestamps,
+            timestamps=timestamps,
+        )
+
+    if stream:
+        await registry.ensure_loaded(model)
+
+        async def segments():
+            async with registry.use(model):
+                if long_audio:
+                    async for seg in stream_long(
+                        audio, TARGET_SAMPLE_RATE, window, run_window, concurrency
+                    ):
+                        yield seg
+                    return
+                async for seg in registry.get_executor(model).iterate(
+                    adapter.transcribe_stream,
+                    audio=audio,
+                    language=language,
+                    temperature=temperature,
+                    word_timestamps=word_timestamps,
+                ):
+                    yield seg
+
+        return StreamingResponse(
+            _stream_events(segments(), word_timestamps),
+            media_type="text/event-stream",
+        )
+
+    async with registry.use(model):
+        if long_audio:
+            result = await transcribe_long(
+                audio, TARGET_SAMPLE_RATE, window, run_window, concurrency
+            )
+        else:
+            result = await run_window(audio)
 
     if response_format == "text":
         return PlainTextResponse(result.text)
@@ -117,3 +198,107 @@ async def create_transcription(
         )
 
     return TranscriptionResponse(text=result.text)
+
+
+def _realtime_event(update: RealtimeUpdate, word_timestamps: bool) -> dict:
+    if not update.final:
+        return {"type": "transcript.text.partial", "text": update.text}
+    event = {"type": "transcript.text.final", "text": update.text}
+    if word_timestamps:
+        event["words"] = [
+            {"word": w.word, "start": w.start, "end": w.end}
+            for w in update.words or []
+        ]
+    return event
+
+
+def _is_commit(text: str) -> bool:
+    try:
+        event = json.loads(text)
+    except json.JSONDecodeError:
+        return False
+    return isinstance(event, dict) and event.get("type") == "input_audio_buffer.commit"
+
+
+def _realtime_params(websocket: WebSocket) -> tuple[str, str | None, int, bool]:
+    params = websocket.query_params
+    model = params.get("model")
+    if not model:
+        raise InvalidRequestError("Missing required parameter: 'model'.", param="model")
+    try:
+        sample_rate = int(params.get("sample_rate", TARGET_SAMPLE_RATE))
+    except ValueError:
+        sample_rate = 0
+    if not 8000 <= sample_rate <= 192000:
+        raise InvalidRequestError("'sample_rate' must be between 8000 and 192000.", param="sample_rate")
+    word_timestamps = "word" in params.getlist("timestamp_granularities[]")
+    return model, params.get("language"), sample_rate, word_timestamps
+
+
+@router.websocket("/audio/transcriptions/realtime")
+async def realtime_transcription(websocket: WebSocket):
+    registry = websocket.app.state.registry
+    await websocket.accept()
+
+    try:
+        model, language, sample_rate, word_timestamps = _realtime_params(websocket)
+        if not registry.has_model(model):
+            raise InvalidModelError(model)
+        try:
+            adapter = registry.get_stt(model)
+        except KeyError:
+            raise ModelNotLoadedError(model)
+        if not adapter.supports_realtime():
+            raise UnsupportedFeatureError("realtime transcription", model)
+        await registry.ensure_loaded(model)
+    except BragiError as e:
+        await websocket.send_json({"type": "error", **e.to_response().model_dump()})
+        await websocket.close(code=1008)
+        return
+
+    executor = registry.get_realtime_executor(model)
+    resampler = None
+    if sample_rate != TARGET_SAMPLE_RATE:
+        resampler = soxr.ResampleStream(sample_rate, TARGET_SAMPLE_RATE, 1, dtype="int16")
+
+    async with registry.use(model):
+        session = await executor.run(adapter.open_realtime, language, word_timestamps)
+        finals: list[str] = []
+
+        async def send(update: RealtimeUpdate | None) -> None:
+            if update is None:
+                return
+            if update.final and update.text:
+                finals.append(update.text)
+            await websocket.send_json(_realtime_event(update, word_timestamps))
+
+        try:
+            remainder = b""
+            while True:
+                message = await websocket.receive()
+                if message["type"] == "websocket.disconnect":
+                    return
+                if message.get("text") is not None:
+                    if _is_commit(message["text"]):
+                        break
+                    continue
+
+                data = remainder + message["bytes"]
+                usable = len(data) - len(data) % 2
+                data, remainder = data[:usable], data[usable:]
+                if resampler is not None:
+                    data = resampler.resample_chunk(np.frombuffer(data, dtype=np.int16)).tobytes()
+                if data:
+                    await send(await executor.run(session.accept, data))
+
+            if resampler is not None:
+                tail = resampler.resample_chunk(np.zeros(0, dtype=np.int16), last=True).tobytes()
+                if tail:
+                    await send(await executor.run(session.accept, tail))
+            await send(await executor.run(session.finish))
+            await websocket.send_json({"type": "transcript.text.done", "text": " ".join(finals)})
+            await websocket.close()
+        except WebSocketDisconnect:
+            return
+        finally:
+            await executor.run(session.close)
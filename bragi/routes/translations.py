@@ -1,12 +1,14 @@
-from fastapi import APIRouter, File, Form, Request, UploadFile
-from fastapi.responses import PlainTextResponse
+from typing import AsyncIterator
 
-from bragi.adapters.stt import TranscriptResult
-from bragi.audio.decoding import decode_audio
-from bragi.config import parse_file_size
+from fastapi import APIRouter, Request
+from fastapi.responses import PlainTextResponse, StreamingResponse
+
+from bragi.adapters.stt import Segment, TranscriptResult
+from bragi.audio.decoding import TARGET_SAMPLE_RATE
+from bragi.audio.upload import AudioUpload, multipart_openapi, receive_audio_upload
+from bragi.longform import stream_long, transcribe_long
+from bragi.metrics import request_timings
 from bragi.schemas.errors import (
-    FileTooLargeError,
-    InvalidFileFormatError,
     InvalidModelError,
     ModelNotLoadedError,
     UnsupportedFeatureError,
@@ -17,6 +19,7 @@ from bragi.schemas.responses import (
     TranslationResponse,
     WordResponse,
     format_srt,
+    format_sse,
     format_vtt,
 )
 
@@ -42,20 +45,61 @@ def _result_to_segments(result: TranscriptResult) -> list[SegmentResponse]:
     ]
 
 
-@router.post("/audio/translations")
-async def create_translation(
-    request: Request,
-    file: UploadFile = File(...),
-    model: str = Form(...),
-    prompt: str | None = Form(None),
-    response_format: str = Form("json"),
-    temperature: float = Form(0.0),
-):
+async def _stream_events(segments: AsyncIterator[Segment], word_timestamps: bool) -> AsyncIterator[str]:
+    parts: list[str] = []
+    async for seg in segments:
+        text = seg.text.strip()
+        if not text:
+            continue
+        delta = f" {text}" if parts else text
+        parts.append(text)
+
+        event = {"type": "transcript.text.delta", "delta": delta}
+        if word_timestamps:
+            event["words"] = [
+                {"word": w.word, "start": w.start, "end": w.end}
+                for w in seg.words or []
+            ]
+        yield format_sse(event)
+
+    yield format_sse({"type": "transcript.text.done", "text": " ".join(parts)})
+
+
+_OPENAPI = multipart_openapi(
+    {
+        "file": {"type": "string", "format": "binary"},
+        "model": {"type": "string"},
+        "prompt": {"type": "string"},
+        "response_format": {"type": "string", "default": "json"},
+        "temperature": {"type": "number", "default": 0.0},
+        "stream": {"type": "boolean", "default": False},
+    },
+    required=["file", "model"],
+)
+
+
+@router.post("/audio/translations", openapi_extra=_OPENAPI)
+async def create_translation(request: Request):
     registry = request.app.state.registry
     config = request.app.state.config
 
-    if not registry.has_model(model):
-        raise InvalidModelError(model)
+    def validate(form: AudioUpload) -> None:
+        model = form.require("model")
+        if not registry.has_model(model):
+            raise InvalidModelError(model)
+
+    upload = await receive_audio_upload(
+        request, config.server.max_file_size, request.app.state.decoder_pool, validate=validate
+    )
+    audio = upload.audio
+
+    model = upload.require("model")
+    response_format = upload.get("response_format", "json")
+    temperature = upload.get_float("temperature", 0.0)
+    stream = upload.get_bool("stream", False)
+
+    timings = request_timings(request)
+    timings.model = model
 
     try:
         adapter = registry.get_stt(model)
@@ -65,18 +109,43 @@ async def create_translation(
     if not adapter.supports_translation():
         raise UnsupportedFeatureError("translation", model)
 
-    data = await file.read()
+    window = registry.get_window_seconds(model)
+    long_audio = window is not None and len(audio) > window * TARGET_SAMPLE_RATE
+    concurrency = registry.get_executor(model).max_workers
 
-    max_size = parse_file_size(config.server.max_file_size)
-    if len(data) > max_size:
-        raise FileTooLargeError(config.server.max_file_size)
+    async def run_window(chunk):
+        return await registry.get_executor(model).run(
+            adapter.translate, audio=chunk, temperature=temperature
+        )
 
-    try:
-        audio = decode_audio(data, file.filename)
-    except ValueError:
-        raise InvalidFileFormatError()
+    if stream:
+        await registry.ensure_loaded(model)
+
+        async def segments():
+            async with registry.use(model):
+                if long_audio:
+                    async for seg in stream_long(
+                        audio, TARGET_SAMPLE_RATE, window, run_window, concurrency
+                    ):
+                        yield seg
+                    return
+                async for seg in registry.get_executor(model).iterate(
+                    adapter.translate_stream, audio=audio, temperature=temperature
+                ):
+                    yield seg
+
+        return StreamingResponse(
+            _stream_events(segments(), False),
+            media_type="text/event-stream",
+        )
 
-    result = adapter.translate(audio=audio, temperature=temperature)
+    async with registry.use(model):
+        if long_audio:
+            result = await transcribe_long(
+                audio, TARGET_SAMPLE_RATE, window, run_window, concurrency
+            )
+        else:
+            result = await run_window(audio)
 
     if response_format == "text":
         return PlainTextResponse(result.text)
@@ -1,6 +1,8 @@
 from fastapi import APIRouter, Form, Request, UploadFile
 
+from bragi.audio.reference import DEFAULT_REFERENCE_SAMPLE_RATE, prepare_reference
 from bragi.schemas.errors import (
+    InvalidFileFormatError,
     InvalidModelError,
     InvalidVoiceError,
     VoiceCloningNotSupportedError,
@@ -58,6 +60,7 @@ async def create_voice(
         raise VoiceConflictError(name)
 
     adapter_alias = model or ""
+    sample_rate = DEFAULT_REFERENCE_SAMPLE_RATE
 
     if model:
         if not registry.has_model(model):
@@ -65,16 +68,26 @@ async def create_voice(
         adapter = registry.get_tts(model)
         if not adapter.supports_voice_cloning():
             raise VoiceCloningNotSupportedError(model)
+        sample_rate = adapter.get_sample_rate()
 
     audio_data = await file.read()
     original_filename = file.filename or "reference.wav"
 
+    try:
+        reference = await request.app.state.decoder_pool.run(
+            prepare_reference, audio_data, original_filename, sample_rate
+        )
+    except ValueError:
+        raise InvalidFileFormatError()
+
     cv = await voice_store.create(
         name=name,
         transcript=transcript,
         audio_data=audio_data,
         original_filename=original_filename,
         adapter_alias=adapter_alias,
+        reference=reference,
+        sample_rate=sample_rate,
     )
 
     if adapter_alias:
@@ -98,6 +111,11 @@ async def delete_voice(request: Request, voice_id: str):
         raise InvalidVoiceError(voice_id)
 
     registry.unregister_voice(cv.name)
+    await registry.forget_voice(voice_id)
     await voice_store.delete(voice_id)
 
+    speech_cache = request.app.state.speech_cache
+    if speech_cache is not None:
+        await speech_cache.invalidate_voice(voice_id)
+
     return {"deleted": True, "id": voice_id}
@@ -87,6 +87,17 @@ class FileTooLargeError(BragiError):
         )
 
 
+class UploadStalledError(BragiError):
+    def __init__(self, timeout: float):
+        super().__init__(
+            message=f"Upload stalled: no data received for {timeout:g} seconds.",
+            status_code=408,
+            error_type="invalid_request_error",
+            param="file",
+            code="upload_stalled",
+        )
+
+
 class ModelNotLoadedError(BragiError):
     def __init__(self, model: str):
         super().__init__(
@@ -150,3 +161,35 @@ class AuthenticationError(BragiError):
             error_type="authentication_error",
             code="authentication_error",
         )
+
+
+class InvalidRequestError(BragiError):
+    def __init__(self, message: str, param: str | None = None):
+        super().__init__(
+            message=message,
+            status_code=400,
+            error_type="invalid_request_error",
+            param=param,
+            code="invalid_request",
+        )
+
+
+class ProfilerBusyError(BragiError):
+    def __init__(self):
+        super().__init__(
+            message="Another profile is already running on this worker.",
+            status_code=409,
+            error_type="invalid_request_error",
+            code="profiler_busy",
+        )
+
+
+class ProfileNotFoundError(BragiError):
+    def __init__(self, profile_id: str):
+        super().__init__(
+            message=f"Profile '{profile_id}' not found.",
+            status_code=404,
+            error_type="invalid_request_error",
+            param="profile_id",
+            code="profile_not_found",
+        )
@@ -1,3 +1,5 @@
+from typing import Literal
+
 from pydantic import BaseModel, Field
 
 
@@ -8,3 +10,12 @@ class SpeechRequest(BaseModel):
     instructions: str | None = Field(None, max_length=4096)
     response_format: str = "mp3"
     speed: float = Field(1.0, ge=0.25, le=4.0)
+    stream: bool = False
+    stream_format: Literal["audio", "sse"] = "audio"
+
+
+class SpeechSessionRequest(BaseModel):
+    model: str | None = None
+    voice: str
+    response_format: str = "pcm"
+    speed: float = Field(1.0, ge=0.25, le=4.0)
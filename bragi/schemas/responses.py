@@ -1,3 +1,5 @@
+import json
+
 from pydantic import BaseModel
 
 
@@ -82,3 +84,7 @@ def format_vtt(segments: list[SegmentResponse]) -> str:
         lines.append(seg.text.strip())
         lines.append("")
     return "\n".join(lines)
+
+
+def format_sse(payload: dict) -> str:
+    return f"data: {json.dumps(payload)}\n\n"
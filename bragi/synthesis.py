@@ -0,0 +1,139 @@
+from __future__ import annotations
+
+import asyncio
+from typing import AsyncIterable, AsyncIterator, Iterable
+
+import numpy as np
+
+from bragi.adapters.tts import TTSAdapter
+from bragi.audio.cache import SpeechCache, pack_audio, unpack_audio
+from bragi.executor import ModelExecutor
+
+_END = object()
+
+
+async def _synthesize_chunk(
+    adapter: TTSAdapter,
+    executor: ModelExecutor,
+    chunk: str,
+    voice: str,
+    speed: float,
+    reference_audio: np.ndarray | None,
+    transcript: str,
+    voice_id: str | None,
+    reference_revision: str,
+) -> AsyncIterator[tuple[np.ndarray, int]]:
+    if reference_audio is not None:
+        yield await executor.run(
+            adapter.synthesize_raw_with_reference,
+            text=chunk,
+            reference_audio=reference_audio,
+            transcript=transcript,
+            speed=speed,
+            voice_id=voice_id,
+            reference_revision=reference_revision,
+        )
+    elif adapter.supports_streaming():
+        async for item in executor.iterate(
+            adapter.synthesize_raw_stream, text=chunk, voice=voice, speed=speed
+        ):
+            yield item
+    else:
+        yield await executor.run(
+            adapter.synthesize_raw, text=chunk, voice=voice, speed=speed
+        )
+
+
+async def _iterate(chunks: Iterable[str] | AsyncIterable[str]) -> AsyncIterator[str]:
+    if isinstance(chunks, AsyncIterable):
+        async for chunk in chunks:
+            yield chunk
+    else:
+        for chunk in chunks:
+            yield chunk
+
+
+async def synthesize_chunks(
+    adapter: TTSAdapter,
+    executor: ModelExecutor,
+    chunks: Iterable[str] | AsyncIterable[str],
+    voice: str,
+    speed: float,
+    reference_audio: np.ndarray | None = None,
+    transcript: str = "",
+    voice_id: str | None = None,
+    reference_revision: str = "",
+    cache: SpeechCache | None = None,
+) -> AsyncIterator[tuple[np.ndarray, int]]:
+    voice_key = voice_id or voice
+    slots = asyncio.Semaphore(executor.max_workers)
+    window = asyncio.Semaphore(executor.max_workers + 1)
+    order: asyncio.Queue = asyncio.Queue()
+    tasks: list[asyncio.Task] = []
+
+    async def produce(chunk: str, queue: asyncio.Queue) -> None:
+        key = None
+        if cache is not None:
+            key = cache.make_key(executor.alias, voice_key, chunk, speed)
+            cached = await cache.get(key, voice_key)
+            if cached is not None:
+                queue.put_nowait(unpack_audio(cached))
+                queue.put_nowait(_END)
+                return
+        items: list[tuple[np.ndarray, int]] = []
+        async with slots:
+            try:
+                async for item in _synthesize_chunk(
+                    adapter,
+                    executor,
+                    chunk,
+                    voice,
+                    speed,
+                    reference_audio,
+                    transcript,
+                    voice_id,
+                    reference_revision,
+                ):
+                    queue.put_nowait(item)
+                    if key is not None:
+                        items.append(item)
+            except Exception as e:
+                queue.put_nowait(e)
+                return
+        if key is not None and items:
+            audio = np.concatenate([audio for audio, _ in items])
+            await cache.put(key, voice_key, pack_audio(audio, items[0][1]))
+        queue.put_nowait(_END)
+
+    async def feed() -> None:
+        try:
+            async for chunk in _iterate(chunks):
+                await window.acquire()
+                queue: asyncio.Queue = asyncio.Queue()
+                tasks.append(asyncio.create_task(produce(chunk, queue)))
+                order.put_nowait(queue)
+        except Exception as e:
+            order.put_nowait(e)
+            return
+        order.put_nowait(_END)
+
+    feeder = asyncio.create_task(feed())
+    try:
+        while True:
+            queue = await order.get()
+            if queue is _END:
+                break
+            if isinstance(queue, Exception):
+                raise queue
+            while True:
+                item = await queue.get()
+                if item is _END:
+                    break
+                if isinstance(item, Exception):
+                    raise item
+                yield item
+            window.release()
+    finally:
+        feeder.cancel()
+        for task in tasks:
+            task.cancel()
@@ -1,11 +1,26 @@
 from __future__ import annotations
 
+import asyncio
+import logging
+import shutil
+import threading
 import uuid
+from collections import OrderedDict
 from dataclasses import dataclass
 from datetime import datetime, timezone
 from pathlib import Path
 
 import aiosqlite
+import numpy as np
+import soxr
+
+from bragi.audio.reference import prepare_reference
+from bragi.schemas.errors import InvalidRequestError, InvalidVoiceError
+
+logger = logging.getLogger("bragi.voices")
+
+_LEGACY_REFERENCE = "reference.wav"
+_REFERENCE = "reference.npy"
 
 
 @dataclass
@@ -16,13 +31,25 @@ class CustomVoice:
     original_filename: str
     adapter_alias: str
     created_at: str
+    sample_rate: int | None = None
 
 
 class VoiceStore:
-    def __init__(self, db_path: Path, audio_dir: Path) -> None:
+    def __init__(
+        self,
+        db_path: Path,
+        audio_dir: Path,
+        reference_cache_bytes: int = 64 * 1024 * 1024,
+    ) -> None:
         self._db_path = db_path
         self._audio_dir = audio_dir
         self._db: aiosqlite.Connection | None = None
+        self._by_id: dict[str, CustomVoice] = {}
+        self._by_name: dict[str, CustomVoice] = {}
+        self._references: OrderedDict[tuple[str, int], np.ndarray] = OrderedDict()
+        self._references_bytes = 0
+        self._reference_cache_bytes = reference_cache_bytes
+        self._lock = threading.Lock()
 
     async def initialize(self) -> None:
         self._db_path.parent.mkdir(parents=True, exist_ok=True)
@@ -36,11 +63,43 @@ class VoiceStore:
                 transcript TEXT NOT NULL,
                 original_filename TEXT NOT NULL,
                 adapter_alias TEXT NOT NULL,
-                created_at TEXT NOT NULL
+                created_at TEXT NOT NULL,
+                sample_rate INTEGER
             )"""
         )
+        async with self._db.execute("PRAGMA table_info(voices)") as cursor:
+            columns = {row["name"] for row in await cursor.fetchall()}
+        if "sample_rate" not in columns:
+            await self._db.execute("ALTER TABLE voices ADD COLUMN sample_rate INTEGER")
         await self._db.commit()
 
+        await self.list_all()
+
+    def _index(self, voice: CustomVoice) -> None:
+        self._by_id[voice.id] = voice
+        self._by_name[voice.name] = voice
+
+    def _forget(self, voice_id: str) -> None:
+        voice = self._by_id.pop(voice_id, None)
+        if voice is not None and self._by_name.get(voice.name) is voice:
+            del self._by_name[voice.name]
+        with self._lock:
+            for key in [k for k in self._references if k[0] == voice_id]:
+                self._references_bytes -= self._references.pop(key).nbytes
+
+    async def _fetch(self, column: str, value: str) -> CustomVoice | None:
+        assert self._db is not None
+        async with self._db.execute(f"SELECT * FROM voices WHERE {column} = ?", (value,)) as cursor:
+            row = await cursor.fetchone()
+        if row is None:
+            return None
+        voice = CustomVoice(**dict(row))
+        stale = self._by_name.get(voice.name)
+        if stale is not None and stale.id != voice.id:
+            self._forget(stale.id)
+        self._index(voice)
+        return voice
+
     async def close(self) -> None:
         if self._db:
             await self._db.close()
@@ -53,52 +112,64 @@ class VoiceStore:
         audio_data: bytes,
         original_filename: str,
         adapter_alias: str,
+        reference: np.ndarray,
+        sample_rate: int,
     ) -> CustomVoice:
         voice_id = uuid.uuid4().hex
         created_at = datetime.now(timezone.utc).isoformat()
 
         voice_dir = self._audio_dir / voice_id
-        voice_dir.mkdir(parents=True, exist_ok=True)
-        (voice_dir / "reference.wav").write_bytes(audio_data)
+        await asyncio.to_thread(self._write_files, voice_dir, audio_data, original_filename, reference)
 
         assert self._db is not None
         await self._db.execute(
-            "INSERT INTO voices (id, name, transcript, original_filename, adapter_alias, created_at) "
-            "VALUES (?, ?, ?, ?, ?, ?)",
-            (voice_id, name, transcript, original_filename, adapter_alias, created_at),
+            "INSERT INTO voices (id, name, transcript, original_filename, adapter_alias, created_at, sample_rate) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?)",
+            (voice_id, name, transcript, original_filename, adapter_alias, created_at, sample_rate),
         )
         await self._db.commit()
 
-        return CustomVoice(
+        voice = CustomVoice(
             id=voice_id,
             name=name,
             transcript=transcript,
             original_filename=original_filename,
             adapter_alias=adapter_alias,
             created_at=created_at,
+            sample_rate=sample_rate,
         )
+        self._index(voice)
+        self._cache_reference((voice_id, sample_rate), reference)
+        return voice
+
+    @staticmethod
+    def _write_files(voice_dir: Path, audio_data: bytes, original_filename: str, reference: np.ndarray) -> None:
+        voice_dir.mkdir(parents=True, exist_ok=True)
+        (voice_dir / f"original{Path(original_filename).suffix.lower()}").write_bytes(audio_data)
+        np.save(voice_dir / _REFERENCE, reference)
 
     async def get_by_name(self, name: str) -> CustomVoice | None:
-        assert self._db is not None
-        async with self._db.execute("SELECT * FROM voices WHERE name = ?", (name,)) as cursor:
-            row = await cursor.fetchone()
-            if row is None:
-                return None
-            return CustomVoice(**dict(row))
+        voice = self._by_name.get(name)
+        if voice is None:
+            voice = await self._fetch("name", name)
+        return voice
 
     async def get_by_id(self, voice_id: str) -> CustomVoice | None:
-        assert self._db is not None
-        async with self._db.execute("SELECT * FROM voices WHERE id = ?", (voice_id,)) as cursor:
-            row = await cursor.fetchone()
-            if row is None:
-                return None
-            return CustomVoice(**dict(row))
+        voice = self._by_id.get(voice_id)
+        if voice is None:
+            voice = await self._fetch("id", voice_id)
+        return voice
 
     async def list_all(self) -> list[CustomVoice]:
         assert self._db is not None
         async with self._db.execute("SELECT * FROM voices ORDER BY created_at") as cursor:
-            rows = await cursor.fetchall()
-            return [CustomVoice(**dict(row)) for row in rows]
+            voices = [CustomVoice(**dict(row)) for row in await cursor.fetchall()]
+        current = {voice.id for voice in voices}
+        for voice_id in [v for v in self._by_id if v not in current]:
+            self._forget(voice_id)
+        for voice in voices:
+            self._index(voice)
+        return voices
 
     async def delete(self, voice_id: str) -> bool:
         voice = await self.get_by_id(voice_id)
@@ -109,15 +180,78 @@ class VoiceStore:
         await self._db.execute("DELETE FROM voices WHERE id = ?", (voice_id,))
         await self._db.commit()
 
-        voice_dir = self._audio_dir / voice_id
-        ref = voice_dir / "reference.wav"
-        if ref.exists():
-            ref.unlink()
-        if voice_dir.exists():
-            voice_dir.rmdir()
-
+        self._forget(voice_id)
+        await asyncio.to_thread(shutil.rmtree, self._audio_dir / voice_id, True)
         return True
 
-    def get_reference_audio(self, voice_id: str) -> bytes:
-        ref = self._audio_dir / voice_id / "reference.wav"
-        return ref.read_bytes()
+    async def get_reference_audio(self, voice_id: str, sample_rate: int) -> np.ndarray:
+        if not (self._audio_dir / voice_id).is_dir():
+            stale = self._by_id.get(voice_id)
+            self._forget(voice_id)
+            raise InvalidVoiceError(stale.name if stale else voice_id)
+
+        key = (voice_id, sample_rate)
+        with self._lock:
+            reference = self._references.get(key)
+            if reference is not None:
+                self._references.move_to_end(key)
+                return reference
+
+        voice = await self.get_by_id(voice_id)
+        if voice is None:
+            raise InvalidVoiceError(voice_id)
+        stored_rate = voice.sample_rate
+        try:
+            reference = await asyncio.to_thread(self._load_reference, voice, sample_rate)
+        except FileNotFoundError:
+            self._forget(voice_id)
+            raise InvalidVoiceError(voice.name)
+        except ValueError:
+            logger.exception("Failed to migrate reference audio for voice '%s'", voice.name)
+            raise InvalidRequestError(
+                f"Reference audio for voice '{voice.name}' could not be decoded. Re-create the voice.",
+                param="voice",
+            )
+        if stored_rate is None:
+            voice.sample_rate = sample_rate
+            assert self._db is not None
+            await self._db.execute(
+                "UPDATE voices SET sample_rate = ? WHERE id = ?", (sample_rate, voice_id)
+            )
+            await self._db.commit()
+
+        self._cache_reference(key, reference)
+        return reference
+
+    def reference_revision(self, voice_id: str) -> str:
+        try:
+            stat = (self._audio_dir / voice_id / _REFERENCE).stat()
+        except FileNotFoundError:
+            return ""
+        return f"{stat.st_mtime_ns}:{stat.st_size}"
+
+    def _load_reference(self, voice: CustomVoice, sample_rate: int) -> np.ndarray:
+        voice_dir = self._audio_dir / voice.id
+        if voice.sample_rate is None:
+            data = (voice_dir / _LEGACY_REFERENCE).read_bytes()
+            reference = prepare_reference(data, voice.original_filename, sample_rate)
+            np.save(voice_dir / _REFERENCE, reference)
+            return reference
+
+        reference = np.load(voice_dir / _REFERENCE, mmap_mode="r")
+        if voice.sample_rate != sample_rate:
+            reference = soxr.resample(reference, voice.sample_rate, sample_rate).astype(np.float32)
+        return reference
+
+    def _cache_reference(self, key: tuple[str, int], reference: np.ndarray) -> None:
+        if reference.nbytes > self._reference_cache_bytes:
+            return
+        with self._lock:
+            previous = self._references.pop(key, None)
+            if previous is not None:
+                self._references_bytes -= previous.nbytes
+            self._references[key] = reference
+            self._references_bytes += reference.nbytes
+            while self._references_bytes > self._reference_cache_bytes:
+                _, evicted = self._references.popitem(last=False)
+                self._references_bytes -= evicted.nbytes
@@ -0,0 +1,152 @@
+import asyncio
+
+import numpy as np
+import pytest
+
+from bragi.adapters.stt import STTAdapter, TranscriptResult
+from bragi.batching import BatchScheduler
+from bragi.executor import ModelExecutor
+
+
+class _FakeSTT(STTAdapter):
+    def __init__(self, batching: bool = True, fail: bool = False) -> None:
+        self.batching = batching
+        self.fail = fail
+        self.batches: list[int] = []
+        self.single = 0
+
+    def load(self, model_path, device, **kwargs):
+        pass
+
+    def unload(self):
+        pass
+
+    def transcribe(self, audio, language, temperature, word_timestamps):
+        self.single += 1
+        return TranscriptResult(text=f"{len(audio)}", language=language)
+
+    def translate(self, audio, temperature):
+        raise NotImplementedError
+
+    def transcribe_batch(self, audios, language, temperature, word_timestamps):
+        if self.fail:
+            raise RuntimeError("boom")
+        self.batches.append(len(audios))
+        return [TranscriptResult(text=f"{len(audio)}", language=language) for audio in audios]
+
+    def get_supported_languages(self):
+        return ["en"]
+
+    def get_sample_rate(self):
+        return 16000
+
+    def supports_translation(self):
+        return False
+
+    def supports_streaming(self):
+        return False
+
+    def supports_batching(self):
+        return self.batching
+
+    def can_batch(self, audio, word_timestamps, timestamps):
+        return not word_timestamps
+
+    @staticmethod
+    def detect(config):
+        return False
+
+
+def _transcribe_all(scheduler, sizes, **kwargs):
+    async def scenario():
+        calls = [
+            scheduler.transcribe(
+                np.zeros(size, dtype=np.float32),
+                language=kwargs.get("language", "en"),
+                temperature=0.0,
+                word_timestamps=kwargs.get("word_timestamps", False),
+            )
+            for size in sizes
+        ]
+        return await asyncio.gather(*calls, return_exceptions=True)
+
+    return asyncio.run(scenario())
+
+
+def test_concurrent_requests_share_a_batch():
+    adapter = _FakeSTT()
+    scheduler = BatchScheduler(adapter, ModelExecutor("stt"), max_batch_size=4, max_wait_ms=50)
+
+    results = _transcribe_all(scheduler, [10, 20, 30])
+
+    assert [r.text for r in results] == ["10", "20", "30"]
+    assert adapter.batches == [3]
+
+
+def test_full_batch_dispatches_and_overflow_follows():
+    adapter = _FakeSTT()
+    scheduler = BatchScheduler(adapter, ModelExecutor("stt"), max_batch_size=2, max_wait_ms=1000)
+
+    results = _transcribe_all(scheduler, [1, 2, 3, 4, 5])
+
+    assert [r.text for r in results] == ["1", "2", "3", "4", "5"]
+    assert sorted(adapter.batches) == [1, 2, 2]
+    assert scheduler.queued() == 0
+
+
+def test_unbatchable_requests_run_alone():
+    adapter = _FakeSTT()
+    scheduler = BatchScheduler(adapter, ModelExecutor("stt"), max_batch_size=4, max_wait_ms=50)
+
+    results = _transcribe_all(scheduler, [10, 20], word_timestamps=True)
+
+    assert [r.text for r in results] == ["10", "20"]
+    assert adapter.batches == []
+    assert adapter.single == 2
+
+
+def test_batching_disabled_without_adapter_support():
+    adapter = _FakeSTT(batching=False)
+    scheduler = BatchScheduler(adapter, ModelExecutor("stt"), max_batch_size=4, max_wait_ms=50)
+
+    _transcribe_all(scheduler, [10, 20])
+
+    assert not scheduler.batching
+    assert adapter.batches == []
+    assert adapter.single == 2
+
+
+def test_batch_failure_reaches_every_caller():
+    adapter = _FakeSTT(fail=True)
+    scheduler = BatchScheduler(adapter, ModelExecutor("stt"), max_batch_size=4, max_wait_ms=10)
+
+    results = _transcribe_all(scheduler, [10, 20])
+
+    assert all(isinstance(r, RuntimeError) for r in results)
+
+
+def test_requests_with_different_options_do_not_mix():
+    adapter = _FakeSTT()
+    scheduler = BatchScheduler(adapter, ModelExecutor("stt"), max_batch_size=4, max_wait_ms=20)
+
+    async def scenario():
+        audio = np.zeros(5, dtype=np.float32)
+        return await asyncio.gather(
+            scheduler.transcribe(audio, language="en", temperature=0.0, word_timestamps=False),
+            scheduler.transcribe(audio, language="de", temperature=0.0, word_timestamps=False),
+        )
+
+    en, de = asyncio.run(scenario())
+
+    assert (en.language, de.language) == ("en", "de")
+    assert adapter.batches == [1, 1]
+
+
+@pytest.mark.parametrize("max_batch_size", [1, 0])
+def test_batch_size_of_one_runs_directly(max_batch_size):
+    adapter = _FakeSTT()
+    scheduler = BatchScheduler(adapter, ModelExecutor("stt"), max_batch_size=max_batch_size)
+
+    _transcribe_all(scheduler, [10])
+
+    assert adapter.single == 1
@@ -0,0 +1,34 @@
+import pytest
+
+from bragi.audio.decoding import resolve_format, sniff_format
+
+
+@pytest.mark.parametrize(
+    ("head", "expected"),
+    [
+        (b"RIFF\x24\x00\x00\x00WAVEfmt ", "wav"),
+        (b"fLaC\x00\x00\x00\x22", "flac"),
+        (b"OggS\x00\x02\x00\x00", "ogg"),
+        (b"ID3\x04\x00\x00\x00\x00", "mp3"),
+        (b"\xff\xfb\x90\x64\x00\x00", "mp3"),
+        (b"\xff\xf1\x50\x80\x00\x1f", "aac"),
+        (b"\x00\x00\x00\x20ftypM4A ", "mp4"),
+        (b"\x1a\x45\xdf\xa3\x01\x00", "webm"),
+    ],
+)
+def test_sniffs_container_magic(head, expected):
+    assert sniff_format(head) == expected
+
+
+@pytest.mark.parametrize("head", [b"", b"\xff", b"RIFF\x24\x00\x00\x00AVI ", b"hello world"])
+def test_unknown_head_is_not_sniffed(head):
+    assert sniff_format(head) is None
+
+
+def test_sniffed_format_wins_over_extension():
+    assert resolve_format(b"fLaC\x00\x00\x00\x22", "clip.mp3") == "flac"
+
+
+def test_falls_back_to_extension():
+    assert resolve_format(b"hello world", "clip.webm") == "webm"
+    assert resolve_format(b"hello world", None) is None
@@ -0,0 +1,83 @@
+import io
+
+import numpy as np
+import pytest
+import soundfile as sf
+
+from bragi.audio.encoding import ChunkEncoder, StreamEncoder, encode_audio
+
+
+def _tone(samples: int) -> np.ndarray:
+    return (np.sin(np.arange(samples) / 10) * 0.5).astype(np.float32)
+
+
+def test_chunk_encoder_wav_has_exact_sizes():
+    encoder = ChunkEncoder("wav")
+    for _ in range(3):
+        encoder.add(_tone(2400), 24000)
+
+    data = encoder.finish()
+
+    assert int.from_bytes(data[4:8], "little") == len(data) - 8
+    assert int.from_bytes(data[40:44], "little") == len(data) - 44
+    info = sf.info(io.BytesIO(data))
+    assert (info.samplerate, info.frames) == (24000, 7200)
+
+
+@pytest.mark.parametrize("fmt", ["mp3", "pcm", "flac"])
+def test_chunk_encoder_matches_one_shot_encoding(fmt):
+    chunks = [_tone(2400), _tone(1200), _tone(3600)]
+    encoder = ChunkEncoder(fmt)
+    for chunk in chunks:
+        encoder.add(chunk, 24000)
+
+    expected, _ = encode_audio(np.concatenate(chunks), 24000, fmt)
+    assert encoder.finish() == expected
+
+
+def test_chunk_encoder_rejects_unknown_format():
+    with pytest.raises(ValueError):
+        ChunkEncoder("ogg")
+
+
+def test_stream_encoder_wav_sends_one_streaming_header():
+    encoder = StreamEncoder("wav")
+    first = encoder.encode(_tone(2400), 24000)
+    second = encoder.encode(_tone(1200), 24000)
+    tail = encoder.flush()
+
+    assert first[:4] == b"RIFF" and first[8:16] == b"WAVEfmt "
+    assert first[4:8] == b"\xff\xff\xff\xff"
+    assert first[36:44] == b"data\xff\xff\xff\xff"
+    assert int.from_bytes(first[24:28], "little") == 24000
+    assert len(first) == 44 + 2400 * 2
+    assert len(second) == 1200 * 2 and b"RIFF" not in second
+    assert tail == b""
+
+
+def test_stream_encoder_wav_flush_without_audio_is_empty():
+    assert StreamEncoder("wav").flush() == b""
+
+
+def test_stream_encoder_pcm_is_headerless_int16():
+    chunks = [_tone(2400), _tone(1200)]
+    encoder = StreamEncoder("pcm")
+    data = b"".join(encoder.encode(chunk, 24000) for chunk in chunks) + encoder.flush()
+
+    expected, _ = encode_audio(np.concatenate(chunks), 24000, "pcm")
+    assert data == expected
+    assert len(data) == 3600 * 2
+
+
+def test_stream_encoder_rejects_sample_rate_change():
+    encoder = StreamEncoder("pcm")
+    encoder.encode(_tone(100), 24000)
+
+    with pytest.raises(ValueError, match="Sample rate changed"):
+        encoder.encode(_tone(100), 22050)
+
+
+@pytest.mark.parametrize("fmt", ["flac", "opus", "aac"])
+def test_stream_encoder_rejects_non_streamable_formats(fmt):
+    with pytest.raises(ValueError, match="Unsupported streaming output format"):
+        StreamEncoder(fmt)
@@ -0,0 +1,117 @@
+import hashlib
+import sys
+import types
+from types import SimpleNamespace
+
+import numpy as np
+import pytest
+
+from bragi.adapters.f5_tts import F5TTSAdapter
+
+
+class _Mel:
+    def permute(self, *dims):
+        return self
+
+
+class _Model:
+    def __init__(self) -> None:
+        self.mel_calls = 0
+        self.conds = []
+
+    def mel_spec(self, cond):
+        self.mel_calls += 1
+        return _Mel()
+
+    def sample(self, cond, **kwargs):
+        self.conds.append(cond)
+        return None, None
+
+
+@pytest.fixture
+def f5(monkeypatch, tmp_path):
+    processed: dict[str, str] = {}
+
+    def preprocess_ref_audio_text(path, text):
+        with open(path, "rb") as f:
+            digest = hashlib.md5(f.read()).hexdigest()
+        if digest not in processed:
+            out = tmp_path / f"{digest}.wav"
+            out.write_bytes(b"processed")
+            processed[digest] = str(out)
+        return processed[digest], text
+
+    def infer_process(ref_audio, ref_text, gen_text, model_obj, vocoder, **kwargs):
+        with open(ref_audio, "rb") as f:
+            f.read()
+        model_obj.sample(cond=np.zeros((1, 10)), text=[ref_text + gen_text], duration=20)
+        return np.zeros(240, dtype=np.float32), 24000, None
+
+    utils_infer = types.ModuleType("f5_tts.infer.utils_infer")
+    utils_infer.preprocess_ref_audio_text = preprocess_ref_audio_text
+    utils_infer.infer_process = infer_process
+    monkeypatch.setitem(sys.modules, "f5_tts", types.ModuleType("f5_tts"))
+    monkeypatch.setitem(sys.modules, "f5_tts.infer", types.ModuleType("f5_tts.infer"))
+    monkeypatch.setitem(sys.modules, "f5_tts.infer.utils_infer", utils_infer)
+
+    model = _Model()
+    adapter = F5TTSAdapter()
+    adapter._tts = SimpleNamespace(ema_model=model, vocoder=None, mel_spec_type="vocos", device="cpu")
+    return adapter, model
+
+
+def _reference(seed: int) -> np.ndarray:
+    return np.random.default_rng(seed).uniform(-0.5, 0.5, 24000).astype(np.float32)
+
+
+def _synthesize(adapter, reference, voice_id):
+    return adapter.synthesize_raw_with_reference(
+        "Hello.", reference, "Reference.", 1.0, voice_id=voice_id, reference_revision="r1"
+    )
+
+
+def test_reference_mel_is_computed_once_per_voice(f5):
+    adapter, model = f5
+    reference = _reference(0)
+
+    for _ in range(3):
+        audio, sr = _synthesize(adapter, reference, "voice-a")
+
+    assert sr == 24000
+    assert len(audio) == 240
+    assert model.mel_calls == 1
+    assert all(isinstance(cond, _Mel) for cond in model.conds)
+
+
+def test_forgotten_voice_synthesizes_again(f5):
+    adapter, model = f5
+    reference = _reference(0)
+
+    _synthesize(adapter, reference, "voice-a")
+    adapter.forget_voice("voice-a")
+    _synthesize(adapter, reference, "voice-a")
+
+    assert model.mel_calls == 2
+
+
+def test_evicted_voice_synthesizes_again(f5):
+    adapter, model = f5
+    adapter._conditioning.max_entries = 1
+    first, second = _reference(0), _reference(1)
+
+    _synthesize(adapter, first, "voice-a")
+    _synthesize(adapter, second, "voice-b")
+    _synthesize(adapter, first, "voice-a")
+
+    assert model.mel_calls == 3
+
+
+def test_unloaded_adapter_keeps_preprocessed_files(f5, tmp_path):
+    adapter, model = f5
+    _synthesize(adapter, _reference(0), "voice-a")
+    files = list(tmp_path.iterdir())
+
+    adapter._conditioning.clear()
+
+    assert files
+    assert all(path.exists() for path in files)
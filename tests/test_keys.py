@@ -0,0 +1,108 @@
+import asyncio
+
+from bragi.keys.store import KeyStore
+
+
+def _run(coro):
+    return asyncio.run(coro)
+
+
+async def _open(path, **kwargs) -> KeyStore:
+    store = KeyStore(path, **kwargs)
+    await store.initialize()
+    return store
+
+
+def test_validate_returns_active_key(tmp_path):
+    async def scenario():
+        store = await _open(tmp_path / "keys.db")
+        try:
+            stored, raw_key = await store.create("ci")
+            found = await store.validate(raw_key)
+            missing = await store.validate(raw_key + "x")
+            return stored, found, missing
+        finally:
+            await store.close()
+
+    stored, found, missing = _run(scenario())
+
+    assert found is not None and found.id == stored.id
+    assert missing is None
+
+
+def test_delete_from_another_process_invalidates_cache(tmp_path):
+    async def scenario():
+        server = await _open(tmp_path / "keys.db", revocation_interval=0.0)
+        admin = await _open(tmp_path / "keys.db")
+        try:
+            stored, raw_key = await admin.create("ci")
+            before = await server.validate(raw_key)
+            await server.validate(raw_key)
+            await admin.delete(stored.id)
+            after = await server.validate(raw_key)
+            return before, after
+        finally:
+            await admin.close()
+            await server.close()
+
+    before, after = _run(scenario())
+
+    assert before is not None
+    assert after is None
+
+
+def test_revocation_check_is_rate_limited(tmp_path):
+    async def scenario():
+        server = await _open(tmp_path / "keys.db", revocation_interval=3600.0)
+        admin = await _open(tmp_path / "keys.db")
+        try:
+            stored, raw_key = await admin.create("ci")
+            await server.validate(raw_key)
+            server._checked_at = float("-inf")
+            await server.validate(raw_key)
+            await admin.delete(stored.id)
+            cached = await server.validate(raw_key)
+            server._checked_at = float("-inf")
+            synced = await server.validate(raw_key)
+            return cached, synced
+        finally:
+            await admin.close()
+            await server.close()
+
+    cached, synced = _run(scenario())
+
+    assert cached is not None
+    assert synced is None
+
+
+def test_own_delete_evicts_cache(tmp_path):
+    async def scenario():
+        store = await _open(tmp_path / "keys.db", revocation_interval=3600.0)
+        try:
+            stored, raw_key = await store.create("ci")
+            await store.validate(raw_key)
+            await store.delete(stored.id)
+            return await store.validate(raw_key)
+        finally:
+            await store.close()
+
+    assert _run(scenario()) is None
+
+
+def test_touch_is_visible_before_and_after_flush(tmp_path):
+    async def scenario():
+        store = await _open(tmp_path / "keys.db", flush_interval=3600.0)
+        try:
+            stored, _ = await store.create("ci")
+            store.touch(stored.id)
+            pending = (await store.get_by_id(stored.id)).last_used_at
+            await store.flush()
+            flushed = (await store.get_by_id(stored.id)).last_used_at
+            return pending, flushed
+        finally:
+            await store.close()
+
+    pending, flushed = _run(scenario())
+
+    assert pending is not None
+    assert flushed == pending
@@ -0,0 +1,74 @@
+import numpy as np
+
+from bragi.longform import plan_windows
+
+RATE = 16000
+FRAME = 320
+
+
+def _noise(seconds: float, seed: int = 0) -> np.ndarray:
+    return np.random.default_rng(seed).normal(0, 0.1, int(seconds * RATE)).astype(np.float32)
+
+
+def _assert_contiguous(windows, length):
+    assert windows[0][0] == 0
+    assert windows[-1][1] == length
+    for (_, end), (start, _) in zip(windows, windows[1:]):
+        assert end == start
+
+
+def test_short_audio_is_one_window():
+    audio = _noise(5)
+
+    assert plan_windows(audio, RATE, 10) == [(0, len(audio))]
+
+
+def test_audio_exactly_at_the_limit_is_one_window():
+    audio = _noise(10)
+
+    assert plan_windows(audio, RATE, 10) == [(0, len(audio))]
+
+
+def test_partial_frame_past_the_limit_stays_in_the_last_window():
+    audio = _noise(10)
+    audio = np.concatenate([audio, audio[: FRAME - 1]])
+
+    assert plan_windows(audio, RATE, 10) == [(0, len(audio))]
+
+
+def test_silence_only_input_has_no_windows():
+    audio = np.zeros(RATE * 30, dtype=np.float32)
+
+    assert plan_windows(audio, RATE, 10) == []
+
+
+def test_cut_lands_in_the_quiet_gap():
+    audio = _noise(25)
+    gap = slice(7 * RATE, 8 * RATE)
+    audio[gap] = 0
+
+    windows = plan_windows(audio, RATE, 10)
+
+    _assert_contiguous(windows, len(audio))
+    assert gap.start <= windows[0][1] < gap.stop
+    assert all(end - start <= 10 * RATE for start, end in windows[:-1])
+
+
+def test_silent_windows_are_skipped():
+    audio = np.concatenate([_noise(8), np.zeros(12 * RATE, dtype=np.float32), _noise(8, seed=1)])
+
+    windows = plan_windows(audio, RATE, 10)
+
+    assert windows[0][0] == 0
+    assert windows[-1][1] == len(audio)
+    for start, end in windows:
+        assert np.abs(audio[start:end]).max() > 0
+
+
+def test_window_smaller_than_two_frames_still_advances():
+    audio = _noise(0.5)
+
+    windows = plan_windows(audio, RATE, 0.01)
+
+    _assert_contiguous(windows, len(audio))
+    assert all(end - start >= FRAME for start, end in windows[:-1])
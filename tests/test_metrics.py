@@ -0,0 +1,61 @@
+from bragi.metrics import Counter, Histogram, Metrics, RequestTimings
+
+
+def test_histogram_renders_cumulative_buckets():
+    histogram = Histogram("latency_seconds", "Latency.", ("route",), buckets=(0.1, 1.0))
+    for value in (0.05, 0.5, 0.5, 3.0):
+        histogram.observe(value, route="/v1/x")
+
+    assert histogram.render() == [
+        "# HELP latency_seconds Latency.",
+        "# TYPE latency_seconds histogram",
+        'latency_seconds_bucket{route="/v1/x",le="0.1"} 1',
+        'latency_seconds_bucket{route="/v1/x",le="1"} 3',
+        'latency_seconds_bucket{route="/v1/x",le="+Inf"} 4',
+        'latency_seconds_sum{route="/v1/x"} 4.05',
+        'latency_seconds_count{route="/v1/x"} 4',
+    ]
+
+
+def test_histogram_boundary_value_lands_in_its_bucket():
+    histogram = Histogram("h", "H.", buckets=(1.0, 2.0))
+    histogram.observe(1.0)
+
+    assert histogram.render()[2:5] == ['h_bucket{le="1"} 1', 'h_bucket{le="2"} 1', 'h_bucket{le="+Inf"} 1']
+
+
+def test_histogram_keeps_series_per_label_set():
+    histogram = Histogram("h", "H.", ("model",), buckets=(1.0,))
+    histogram.observe(0.5, model="a")
+    histogram.observe(2.0, model="b")
+
+    lines = histogram.render()
+
+    assert 'h_count{model="a"} 1' in lines
+    assert 'h_bucket{model="b",le="1"} 0' in lines
+    assert 'h_sum{model="b"} 2' in lines
+
+
+def test_label_values_are_escaped():
+    counter = Counter("c_total", "C.", ("route",))
+    counter.inc(route='a"b\\c\nd')
+
+    assert counter.render()[-1] == 'c_total{route="a\\"b\\\\c\\nd"} 1'
+
+
+def test_metrics_record_observes_stages_and_rtf():
+    metrics = Metrics()
+    timings = RequestTimings(model="whisper-1", audio_seconds=10.0)
+    timings.add("decode", 0.2)
+    timings.add("inference", 2.0)
+
+    metrics.record("/v1/audio/transcriptions", 200, 2.5, timings, 1000, 50)
+    text = metrics.render()
+
+    labels = 'route="/v1/audio/transcriptions",model="whisper-1"'
+    assert f"bragi_requests_total{{{labels},status=\"200\"}} 1" in text
+    assert f"bragi_decode_duration_seconds_sum{{{labels}}} 0.2" in text
+    assert f"bragi_real_time_factor_sum{{{labels}}} 0.2" in text
+    assert f"bragi_encode_duration_seconds_count{{{labels}}}" not in text
+    assert f"bragi_request_bytes_total{{{labels}}} 1000" in text
+    assert text.endswith("\n")
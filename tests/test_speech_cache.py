@@ -0,0 +1,129 @@
+import asyncio
+
+import numpy as np
+
+from bragi.audio.cache import SpeechCache, pack_audio, unpack_audio
+from bragi.executor import ModelExecutor
+from bragi.synthesis import synthesize_chunks
+
+
+def _run(coro):
+    return asyncio.run(coro)
+
+
+def test_pack_round_trip():
+    audio = np.linspace(-1, 1, 100, dtype=np.float32)
+
+    unpacked, sample_rate = unpack_audio(pack_audio(audio, 22050))
+
+    assert sample_rate == 22050
+    np.testing.assert_array_equal(unpacked, audio)
+
+
+def test_memory_tier_evicts_least_recently_used():
+    cache = SpeechCache(max_memory_bytes=250)
+
+    async def scenario():
+        await cache.put("a", "v", b"a" * 100)
+        await cache.put("b", "v", b"b" * 100)
+        assert await cache.get("a", "v") is not None
+        await cache.put("c", "v", b"c" * 100)
+        return [await cache.get(key, "v") for key in ("a", "b", "c")]
+
+    a, b, c = _run(scenario())
+
+    assert a == b"a" * 100
+    assert b is None
+    assert c == b"c" * 100
+    assert cache.stats()["memory_bytes"] == 200
+
+
+def test_disk_tier_evicts_oldest_entries(tmp_path):
+    cache = SpeechCache(max_memory_bytes=0, disk_dir=tmp_path, max_disk_bytes=250)
+
+    async def scenario():
+        await cache.initialize()
+        for key in ("a", "b", "c"):
+            await cache.put(key, "v", key.encode() * 100)
+        return [await cache.get(key, "v") for key in ("a", "b", "c")]
+
+    a, b, c = _run(scenario())
+
+    assert a is None
+    assert (b, c) == (b"b" * 100, b"c" * 100)
+    assert cache.stats()["disk_bytes"] <= 250
+    assert len(list(tmp_path.glob("*/*.bin"))) == 2
+
+
+def test_disk_tier_is_shared_between_instances(tmp_path):
+    writer = SpeechCache(max_memory_bytes=0, disk_dir=tmp_path, max_disk_bytes=1000)
+    reader = SpeechCache(max_memory_bytes=1000, disk_dir=tmp_path, max_disk_bytes=1000)
+
+    async def scenario():
+        await writer.initialize()
+        await reader.initialize()
+        await writer.put("a", "v", b"payload")
+        return await reader.get("a", "v")
+
+    assert _run(scenario()) == b"payload"
+    assert reader.disk_hits == 1
+
+
+def test_invalidate_voice_drops_memory_and_disk_entries(tmp_path):
+    cache = SpeechCache(max_memory_bytes=1000, disk_dir=tmp_path, max_disk_bytes=1000)
+
+    async def scenario():
+        await cache.initialize()
+        await cache.put("a", "voice-1", b"one")
+        await cache.put("b", "voice-2", b"two")
+        await cache.invalidate_voice("voice-1")
+        fresh = SpeechCache(max_memory_bytes=1000, disk_dir=tmp_path, max_disk_bytes=1000)
+        await fresh.initialize()
+        return (
+            await cache.get("a", "voice-1"),
+            await cache.get("b", "voice-2"),
+            await fresh.get("a", "voice-1"),
+        )
+
+    gone, kept, gone_on_disk = _run(scenario())
+
+    assert gone is None
+    assert kept == b"two"
+    assert gone_on_disk is None
+    assert cache.stats()["disk_entries"] == 1
+
+
+class _CountingAdapter:
+    def __init__(self) -> None:
+        self.calls: list[str] = []
+
+    def supports_streaming(self) -> bool:
+        return False
+
+    def synthesize_raw(self, text: str, voice: str, speed: float):
+        self.calls.append(text)
+        return np.full(10, len(text), dtype=np.float32), 24000
+
+
+def test_shared_chunks_skip_the_adapter():
+    adapter = _CountingAdapter()
+    cache = SpeechCache(max_memory_bytes=10_000)
+    executor = ModelExecutor("tts-1", 2)
+
+    async def synthesize(chunks):
+        return [
+            item async for item in synthesize_chunks(
+                adapter, executor, chunks, voice="af_heart", speed=1.0, cache=cache
+            )
+        ]
+
+    try:
+        first = _run(synthesize(["Hello there.", "Shared sentence."]))
+        second = _run(synthesize(["Something new.", "Shared sentence."]))
+    finally:
+        executor.shutdown()
+
+    assert adapter.calls == ["Hello there.", "Shared sentence.", "Something new."]
+    np.testing.assert_array_equal(second[1][0], first[1][0])
+    assert second[1][1] == 24000
+    assert cache.memory_hits == 1
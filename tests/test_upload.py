@@ -0,0 +1,120 @@
+import asyncio
+import io
+
+import numpy as np
+import pytest
+import soundfile as sf
+from starlette.requests import Request
+
+from bragi.audio.decoding import DecoderPool
+from bragi.audio.upload import receive_audio_upload
+from bragi.schemas.errors import FileTooLargeError, InvalidRequestError
+
+_BOUNDARY = "bragi-test-boundary"
+
+
+def _wav_bytes(seconds: float = 0.1, sample_rate: int = 16000) -> bytes:
+    buffer = io.BytesIO()
+    sf.write(buffer, np.zeros(int(seconds * sample_rate), dtype=np.float32), sample_rate, format="WAV")
+    return buffer.getvalue()
+
+
+def _multipart(fields: list[tuple[str, str]], files: list[tuple[str, str, bytes]]) -> bytes:
+    body = b""
+    for name, value in fields:
+        body += (
+            f"--{_BOUNDARY}\r\n"
+            f'Content-Disposition: form-data; name="{name}"\r\n\r\n'
+            f"{value}\r\n"
+        ).encode()
+    for name, filename, data in files:
+        body += (
+            f"--{_BOUNDARY}\r\n"
+            f'Content-Disposition: form-data; name="{name}"; filename="{filename}"\r\n'
+            f"Content-Type: application/octet-stream\r\n\r\n"
+        ).encode() + data + b"\r\n"
+    return body + f"--{_BOUNDARY}--\r\n".encode()
+
+
+def _request(body: bytes, content_type: str | None = None, content_length: bool = True) -> Request:
+    headers = [(b"content-type", (content_type or f"multipart/form-data; boundary={_BOUNDARY}").encode())]
+    if content_length:
+        headers.append((b"content-length", str(len(body)).encode()))
+    chunks = [body[i:i + 4096] for i in range(0, len(body), 4096)] or [b""]
+
+    async def receive():
+        chunk = chunks.pop(0) if chunks else b""
+        return {"type": "http.request", "body": chunk, "more_body": bool(chunks)}
+
+    return Request({"type": "http", "method": "POST", "headers": headers}, receive)
+
+
+def _upload(body: bytes, max_file_size: str = "1MB", **kwargs):
+    async def scenario():
+        return await receive_audio_upload(_request(body, **kwargs), max_file_size, DecoderPool(max_workers=1))
+
+    return asyncio.run(scenario())
+
+
+def test_decodes_file_and_collects_fields():
+    body = _multipart([("model", "whisper-1"), ("timestamp_granularities[]", "word"),
+                       ("timestamp_granularities[]", "segment")], [("file", "a.wav", _wav_bytes())])
+
+    upload = _upload(body)
+
+    assert upload.filename == "a.wav"
+    assert upload.get("model") == "whisper-1"
+    assert upload.get_list("timestamp_granularities[]") == ["word", "segment"]
+    assert len(upload.audio) == 1600
+
+
+def test_rejects_non_multipart_body():
+    with pytest.raises(InvalidRequestError):
+        _upload(b"{}", content_type="application/json")
+
+
+def test_rejects_declared_length_over_limit():
+    body = _multipart([], [("file", "a.wav", _wav_bytes(seconds=1.0))])
+
+    with pytest.raises(FileTooLargeError):
+        _upload(body, max_file_size="1KB")
+
+
+def test_rejects_streamed_file_over_limit():
+    body = _multipart([], [("file", "a.wav", _wav_bytes(seconds=1.0))])
+
+    with pytest.raises(FileTooLargeError):
+        _upload(body, max_file_size="1KB", content_length=False)
+
+
+def test_rejects_oversized_field():
+    body = _multipart([("prompt", "x" * (64 * 1024 + 1))], [("file", "a.wav", _wav_bytes())])
+
+    with pytest.raises(InvalidRequestError) as excinfo:
+        _upload(body)
+
+    assert excinfo.value.param == "prompt"
+
+
+def test_rejects_oversized_fields_total():
+    fields = [(f"f{i}", "x" * (60 * 1024)) for i in range(20)]
+    body = _multipart(fields, [("file", "a.wav", _wav_bytes())])
+
+    with pytest.raises(InvalidRequestError, match="too large"):
+        _upload(body, max_file_size="2MB")
+
+
+def test_rejects_second_file():
+    body = _multipart([], [("file", "a.wav", _wav_bytes()), ("file", "b.wav", _wav_bytes())])
+
+    with pytest.raises(InvalidRequestError, match="Only one"):
+        _upload(body)
+
+
+def test_requires_file():
+    body = _multipart([("model", "whisper-1")], [])
+
+    with pytest.raises(InvalidRequestError) as excinfo:
+        _upload(body)
+
+    assert excinfo.value.param == "file"
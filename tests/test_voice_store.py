@@ -0,0 +1,123 @@
+import asyncio
+
+import numpy as np
+import pytest
+
+from bragi.schemas.errors import InvalidVoiceError
+from bragi.voices.store import VoiceStore
+
+
+def _run(coro):
+    return asyncio.run(coro)
+
+
+async def _open(tmp_path, **kwargs) -> VoiceStore:
+    store = VoiceStore(tmp_path / "voices.db", tmp_path / "voices", **kwargs)
+    await store.initialize()
+    return store
+
+
+async def _create(store: VoiceStore, name: str, samples: int = 2400, sample_rate: int = 24000):
+    reference = np.linspace(-0.5, 0.5, samples, dtype=np.float32)
+    return await store.create(name, "hello", b"raw", "clip.wav", "xtts", reference, sample_rate)
+
+
+def test_lookups_hit_index_and_database(tmp_path):
+    async def scenario():
+        server = await _open(tmp_path)
+        admin = await _open(tmp_path)
+        try:
+            own = await _create(server, "alice")
+            other = await _create(admin, "bob")
+            return (
+                own,
+                other,
+                await server.get_by_name("alice"),
+                await server.get_by_name("bob"),
+                await server.get_by_id(other.id),
+                await server.get_by_name("carol"),
+            )
+        finally:
+            await admin.close()
+            await server.close()
+
+    own, other, by_name, fetched, by_id, missing = _run(scenario())
+
+    assert by_name is not None and by_name.id == own.id
+    assert fetched is not None and fetched.id == other.id
+    assert by_id is fetched
+    assert missing is None
+
+
+def test_list_all_forgets_voices_deleted_elsewhere(tmp_path):
+    async def scenario():
+        server = await _open(tmp_path)
+        admin = await _open(tmp_path)
+        try:
+            voice = await _create(admin, "alice")
+            assert await server.get_by_name("alice") is not None
+            await admin.delete(voice.id)
+            listed = await server.list_all()
+            return listed, server._by_id, await server.get_by_name("alice")
+        finally:
+            await admin.close()
+            await server.close()
+
+    listed, index, after = _run(scenario())
+
+    assert listed == []
+    assert index == {}
+    assert after is None
+
+
+def test_reference_is_cached_and_resampled(tmp_path):
+    async def scenario():
+        store = await _open(tmp_path)
+        try:
+            voice = await _create(store, "alice")
+            native = await store.get_reference_audio(voice.id, 24000)
+            again = await store.get_reference_audio(voice.id, 24000)
+            resampled = await store.get_reference_audio(voice.id, 16000)
+            return native, again, resampled
+        finally:
+            await store.close()
+
+    native, again, resampled = _run(scenario())
+
+    assert again is native
+    assert len(native) == 2400
+    assert resampled.dtype == np.float32
+    assert len(resampled) == 1600
+
+
+def test_reference_cache_is_bounded(tmp_path):
+    async def scenario():
+        store = await _open(tmp_path, reference_cache_bytes=2400 * 4 * 2)
+        try:
+            voices = [await _create(store, name) for name in ("a", "b", "c")]
+            return store, [voice.id for voice in voices]
+        finally:
+            await store.close()
+
+    store, ids = _run(scenario())
+
+    assert [key[0] for key in store._references] == ids[1:]
+    assert store._references_bytes == 2400 * 4 * 2
+
+
+def test_missing_reference_files_raise_invalid_voice(tmp_path):
+    async def scenario():
+        server = await _open(tmp_path)
+        admin = await _open(tmp_path)
+        try:
+            voice = await _create(admin, "alice")
+            await server.get_by_name("alice")
+            await admin.delete(voice.id)
+            with pytest.raises(InvalidVoiceError):
+                await server.get_reference_audio(voice.id, 24000)
+            return server._by_name
+        finally:
+            await admin.close()
+            await server.close()
+
+    assert _run(scenario()) == {}